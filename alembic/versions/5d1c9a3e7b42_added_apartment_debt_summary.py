@@ -0,0 +1,92 @@
+"""added apartment debt summary
+
+Revision ID: 5d1c9a3e7b42
+Revises: 8ffbae7b1c48
+Create Date: 2026-10-18 13:40:12.418306
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d1c9a3e7b42'
+down_revision: Union[str, None] = '8ffbae7b1c48'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('apartment_debt_summary',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False, comment='Идентификатор'),
+    sa.Column('id_apartment', sa.Integer(), nullable=False, comment='Идентификатор квартиры'),
+    sa.Column('unpaid_total', sa.Float(), nullable=False, comment='Сумма неоплаченных счетов'),
+    sa.Column('unpaid_count', sa.Integer(), nullable=False, comment='Кол-во неоплаченных счетов'),
+    sa.Column('oldest_unpaid_period', sa.String(length=100), nullable=True, comment='Самый ранний период неоплаченного начисления'),
+    sa.ForeignKeyConstraint(['id_apartment'], ['payment_management.apartment.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('id_apartment'),
+    schema='payment_management'
+    )
+    with op.batch_alter_table('apartment_debt_summary', schema='payment_management') as batch_op:
+        batch_op.create_index(batch_op.f('ix_payment_management_apartment_debt_summary_id'), ['id'], unique=True)
+        batch_op.create_index(batch_op.f('ix_payment_management_apartment_debt_summary_unpaid_count'), ['unpaid_count'], unique=False)
+
+    # приведение периодов существующих счетов к формату YYYY-MM до заполнения сводки: самый ранний период
+    # находится сравнением строк. Распознаются YYYY-M, YYYY-MM-DD, MM.YYYY и "январь 2024" (разделители - . /),
+    # нераспознанные значения не изменяются
+    op.execute(r"""
+        UPDATE payment_management.bill
+        SET bill_period = normalized.bill_period
+        FROM (
+            SELECT id, concat(year, '-', lpad(month::text, 2, '0')) AS bill_period
+            FROM (
+                SELECT
+                    id,
+                    coalesce(year_month[1], month_year[2], month_name[2]) AS year,
+                    coalesce(
+                        year_month[2]::integer,
+                        month_year[1]::integer,
+                        array_position(ARRAY[
+                            'январь', 'февраль', 'март', 'апрель', 'май', 'июнь',
+                            'июль', 'август', 'сентябрь', 'октябрь', 'ноябрь', 'декабрь'
+                        ], month_name[1]),
+                        array_position(ARRAY[
+                            'Январь', 'Февраль', 'Март', 'Апрель', 'Май', 'Июнь',
+                            'Июль', 'Август', 'Сентябрь', 'Октябрь', 'Ноябрь', 'Декабрь'
+                        ], month_name[1])
+                    ) AS month
+                FROM (
+                    SELECT
+                        id,
+                        regexp_match(trim(bill_period), '^(\d{4})[-./](\d{1,2})(?:[-./]\d{1,2})?$') AS year_month,
+                        regexp_match(trim(bill_period), '^(\d{1,2})[-./](\d{4})$') AS month_year,
+                        regexp_match(trim(bill_period), '^([А-Яа-яЁё]+)\s+(\d{4})$') AS month_name
+                    FROM payment_management.bill
+                ) AS matched
+            ) AS parsed
+            WHERE year IS NOT NULL AND month BETWEEN 1 AND 12
+        ) AS normalized
+        WHERE bill.id = normalized.id AND bill.bill_period <> normalized.bill_period
+    """)
+
+    # первичное заполнение сводки по уже существующим счетам
+    op.execute("""
+        INSERT INTO payment_management.apartment_debt_summary
+            (id_apartment, unpaid_total, unpaid_count, oldest_unpaid_period)
+        SELECT apartment.id, COALESCE(SUM(bill.bill_size), 0), COUNT(bill.id), MIN(bill.bill_period)
+        FROM payment_management.apartment
+        LEFT JOIN payment_management.bill ON bill.id_apartment = apartment.id AND NOT bill.is_paid
+        GROUP BY apartment.id
+    """)
+
+
+def downgrade() -> None:
+    # приведенные периоды счетов не возвращаются к исходному виду
+    with op.batch_alter_table('apartment_debt_summary', schema='payment_management') as batch_op:
+        batch_op.drop_index(batch_op.f('ix_payment_management_apartment_debt_summary_unpaid_count'))
+        batch_op.drop_index(batch_op.f('ix_payment_management_apartment_debt_summary_id'))
+
+    op.drop_table('apartment_debt_summary', schema='payment_management')
@@ -0,0 +1,61 @@
+"""debt query indexes
+
+Revision ID: a3f07b6e91d5
+Revises: 5d1c9a3e7b42
+Create Date: 2026-10-18 13:58:41.207915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3f07b6e91d5'
+down_revision: Union[str, None] = '5d1c9a3e7b42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# уникальные индексы по id дублируют индексы первичных ключей
+REDUNDANT_ID_INDEXES_TABLES = ('building', 'owner', 'apartment', 'bill', 'apartment_info', 'apartment_debt_summary')
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('bill', schema='payment_management') as batch_op:
+        batch_op.create_index(batch_op.f('ix_payment_management_bill_id_apartment'), ['id_apartment'], unique=False)
+        batch_op.create_index('ix_payment_management_bill_unpaid_id_apartment', ['id_apartment'], unique=False, postgresql_where=sa.text('NOT is_paid'))
+
+    with op.batch_alter_table('apartment', schema='payment_management') as batch_op:
+        batch_op.create_index(batch_op.f('ix_payment_management_apartment_id_owner'), ['id_owner'], unique=False)
+        batch_op.create_index('ix_payment_management_apartment_id_building_apartment_number', ['id_building', 'apartment_number'], unique=False)
+
+    with op.batch_alter_table('apartment_info', schema='payment_management') as batch_op:
+        batch_op.create_index(batch_op.f('ix_payment_management_apartment_info_id_apartment'), ['id_apartment'], unique=False)
+
+    with op.batch_alter_table('building', schema='payment_management') as batch_op:
+        batch_op.create_index(batch_op.f('ix_payment_management_building_project_name'), ['project_name'], unique=False)
+
+    for table_name in REDUNDANT_ID_INDEXES_TABLES:
+        with op.batch_alter_table(table_name, schema='payment_management') as batch_op:
+            batch_op.drop_index(f'ix_payment_management_{table_name}_id')
+
+
+def downgrade() -> None:
+    for table_name in REDUNDANT_ID_INDEXES_TABLES:
+        with op.batch_alter_table(table_name, schema='payment_management') as batch_op:
+            batch_op.create_index(f'ix_payment_management_{table_name}_id', ['id'], unique=True)
+
+    with op.batch_alter_table('building', schema='payment_management') as batch_op:
+        batch_op.drop_index(batch_op.f('ix_payment_management_building_project_name'))
+
+    with op.batch_alter_table('apartment_info', schema='payment_management') as batch_op:
+        batch_op.drop_index(batch_op.f('ix_payment_management_apartment_info_id_apartment'))
+
+    with op.batch_alter_table('apartment', schema='payment_management') as batch_op:
+        batch_op.drop_index('ix_payment_management_apartment_id_building_apartment_number')
+        batch_op.drop_index(batch_op.f('ix_payment_management_apartment_id_owner'))
+
+    with op.batch_alter_table('bill', schema='payment_management') as batch_op:
+        batch_op.drop_index('ix_payment_management_bill_unpaid_id_apartment', postgresql_where=sa.text('NOT is_paid'))
+        batch_op.drop_index(batch_op.f('ix_payment_management_bill_id_apartment'))
@@ -0,0 +1,59 @@
+"""added api keys
+
+Revision ID: e4b2d81c6f09
+Revises: a3f07b6e91d5
+Create Date: 2026-10-18 14:52:07.518402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b2d81c6f09'
+down_revision: Union[str, None] = 'a3f07b6e91d5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('api_keys',
+    sa.Column('name', sa.String(length=100), nullable=False, comment='Название сервиса-клиента'),
+    sa.Column('key_hash', sa.String(length=64), nullable=False, comment='SHA-256 хеш ключа'),
+    sa.Column('is_active', sa.Boolean(), nullable=False, comment='Флаг активности ключа'),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False, comment='Время последнего изменения'),
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False, comment='Идентификатор'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('key_hash'),
+    sa.UniqueConstraint('name'),
+    schema='payment_management'
+    )
+    with op.batch_alter_table('api_keys', schema='payment_management') as batch_op:
+        batch_op.create_index(batch_op.f('ix_payment_management_api_keys_updated_at'), ['updated_at'], unique=False)
+
+    # updated_at выставляется и при изменении ключа напрямую в БД, иначе опрос не увидит отзыв ключа
+    op.execute("""
+        CREATE FUNCTION payment_management.api_keys_set_updated_at() RETURNS trigger AS $$
+        BEGIN
+            NEW.updated_at = now();
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER api_keys_set_updated_at
+        BEFORE UPDATE ON payment_management.api_keys
+        FOR EACH ROW EXECUTE FUNCTION payment_management.api_keys_set_updated_at()
+    """)
+
+
+def downgrade() -> None:
+    op.execute('DROP TRIGGER api_keys_set_updated_at ON payment_management.api_keys')
+    op.execute('DROP FUNCTION payment_management.api_keys_set_updated_at()')
+
+    with op.batch_alter_table('api_keys', schema='payment_management') as batch_op:
+        batch_op.drop_index(batch_op.f('ix_payment_management_api_keys_updated_at'))
+
+    op.drop_table('api_keys', schema='payment_management')
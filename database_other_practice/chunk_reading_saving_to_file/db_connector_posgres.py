@@ -11,10 +11,19 @@ class DBConnectorPostgres:
         self.username = username
         self.password = password
         self.conn_str = f'{self.driver}://{self.username}:{self.password}@{self.host}:{self.port}/{self.database}'
+        self.__engine = None
+
+    def get_engine(self):
+        """
+        Возвращает движок подключения к БД, движок с пулом подключений создается один раз
+        :return: движок подключения к бд
+        """
+        if self.__engine is None:
+            self.__engine = create_engine(self.conn_str)
+        return self.__engine
 
     def connect(self):
-        engine = create_engine(self.conn_str)
-        return engine.connect()
+        return self.get_engine().connect()
 
 
 db_controller = DBConnectorPostgres(
@@ -2,29 +2,13 @@ import csv
 from sqlalchemy import text
 import pandas as pd
 from .db_connector_mssql import DBConnectorMSSQL
+from .table_exporter import PARQUET_FORMAT
+from .table_exporter import TableExporter
 from logger import logger
 from settings import MSSQL_DB_URL
 
-
-class GetTablesFromDWH(DBConnectorMSSQL):
-    """ класс извлечения таблиц из БД """
-
-    def __init__(self, db_path_some):
-        super().__init__(db_path_some)
-        self.connection = self.get_connection()
-        logger.info('Успешное подключение к БД DWH')
-
-    def fetch_client_full_data(self, chunksize=200000, output_file='default.csv'):
-        """
-        Метод почанкового чтения строк из таблицы с сохранением данных в файл .csv (запись первого чанка и дозаписи
-        последующих).
-
-        :param chunksize: кол-во строк для чтения в чанке.
-        :param output_file: название файла куда сохранять данные.
-        :return: файл с данными из БД, формирование которого потребляет меньше ОЗУ, чем если читать и писать целиком.
-        """
-        query = text(
-            '''
+# клиенты с полными данными, запрос без сортировки для выгрузки по диапазонам client_id
+CLIENT_FULL_DATA_QUERY = '''
             SELECT c.fullname,
                 c.id as client_id,
                 c.birthday,
@@ -40,13 +24,31 @@ class GetTablesFromDWH(DBConnectorMSSQL):
             FROM [Clients_database].dbo.[client] as c
             LEFT JOIN [Clients_database].dbo.[clients_info] as ci
                 ON ci.client_id=c.id
-            LEFT JOIN JOIN [Clients_database].dbo.[clients_passport] as pasp
+            LEFT JOIN [Clients_database].dbo.[clients_passport] as pasp
                 ON pasp.client_id=c.id
             WHERE c.fullname IS NOT NULL
                 AND LEN(LTRIM(RTRIM(c.fullname))) - LEN(REPLACE(RTRIM(LTRIM(c.fullname)), ' ', '')) >= 1
-            ORDER BY c.fullname
-            '''
-        )
+'''
+
+
+class GetTablesFromDWH(DBConnectorMSSQL):
+    """ класс извлечения таблиц из БД """
+
+    def __init__(self, db_path_some):
+        super().__init__(db_path_some)
+        self.connection = self.get_connection()
+        logger.info('Успешное подключение к БД DWH')
+
+    def fetch_client_full_data(self, chunksize=200000, output_file='default.csv'):
+        """
+        Метод почанкового чтения строк из таблицы с сохранением данных в файл .csv (запись первого чанка и дозаписи
+        последующих).
+
+        :param chunksize: кол-во строк для чтения в чанке.
+        :param output_file: название файла куда сохранять данные.
+        :return: файл с данными из БД, формирование которого потребляет меньше ОЗУ, чем если читать и писать целиком.
+        """
+        query = text(f'{CLIENT_FULL_DATA_QUERY} ORDER BY c.fullname')
         cursor = self.connection.execute(query)
         with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
             csv_writer = csv.writer(csvfile, delimiter=';')
@@ -61,6 +63,29 @@ class GetTablesFromDWH(DBConnectorMSSQL):
                 row_count += len(rows)
         logger.info(f'Saved {row_count} rows to {output_file}')
 
+    def export_client_full_data(self, output_dir, file_format=PARQUET_FORMAT, workers=4, chunksize=200000):
+        """
+        Метод параллельной выгрузки клиентов с полными данными в файлы Parquet или CSV.gz по диапазонам client_id.
+        Выгрузка возобновляется с невыгруженных диапазонов, если прошлый запуск прервался.
+
+        :param output_dir: папка для файлов выгрузки.
+        :param file_format: формат файлов: parquet или csv.
+        :param workers: кол-во параллельно читаемых диапазонов, не больше размера пула подключений движка.
+        :param chunksize: кол-во строк для чтения в чанке.
+        :return: кол-во выгруженных строк.
+        """
+        exporter = TableExporter(
+            engine=self.get_engine(),
+            query=CLIENT_FULL_DATA_QUERY,
+            key_column='client_id',
+            output_dir=output_dir,
+            name='client_full_data',
+            file_format=file_format,
+            workers=workers,
+            chunk_size=chunksize
+        )
+        return exporter.export()
+
     def fetch_clients_phone_calls(self, chunksize=200000, output_file='default.csv'):
         """
         Метод почанкового чтения строк из таблицы с сохранением данных в файл .csv (запись первого чанка и дозаписи
@@ -0,0 +1,480 @@
+import csv
+import datetime
+import decimal
+import gzip
+import json
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import sha256
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Type
+from typing import Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from logger import logger
+
+# файловые форматы выгрузки
+PARQUET_FORMAT = 'parquet'
+CSV_FORMAT = 'csv'
+
+# типы Arrow по type_code описания колонок курсора: типы Python (pyodbc) и OID типов PostgreSQL (psycopg2)
+ARROW_TYPES: Dict[Any, pa.DataType] = {
+    bool: pa.bool_(),
+    int: pa.int64(),
+    float: pa.float64(),
+    str: pa.string(),
+    bytes: pa.binary(),
+    bytearray: pa.binary(),
+    datetime.date: pa.date32(),
+    datetime.datetime: pa.timestamp('us'),
+    datetime.time: pa.time64('us'),
+    16: pa.bool_(),
+    17: pa.binary(),
+    20: pa.int64(),
+    21: pa.int64(),
+    23: pa.int64(),
+    25: pa.string(),
+    700: pa.float64(),
+    701: pa.float64(),
+    1042: pa.string(),
+    1043: pa.string(),
+    1082: pa.date32(),
+    1083: pa.time64('us'),
+    1114: pa.timestamp('us'),
+    1184: pa.timestamp('us', tz='UTC'),
+}
+# type_code десятичных чисел, тип Arrow зависит от точности и масштаба колонки
+DECIMAL_TYPE_CODES = (decimal.Decimal, 1700)
+# точность и масштаб десятичных чисел без ограничения точности в БД (numeric в PostgreSQL)
+DEFAULT_DECIMAL_PRECISION = 76
+DEFAULT_DECIMAL_SCALE = 38
+
+
+class KeyRangePartition:
+    """ Диапазон значений ключа [lower, upper), выгружаемый в отдельный файл """
+
+    def __init__(self, index: int, lower: int, upper: int):
+        self.__index = index
+        self.__lower = lower
+        self.__upper = upper
+
+    @property
+    def index(self) -> int:
+        return self.__index
+
+    @property
+    def lower(self) -> int:
+        return self.__lower
+
+    @property
+    def upper(self) -> int:
+        return self.__upper
+
+
+class ExportProgress:
+    """
+    Прогресс выгрузки, сохраняемый в JSON файл рядом с файлами партиций.
+    Хранит границы партиций и кол-во строк выгруженных партиций: при повторном запуске выгрузка продолжается
+    с невыгруженных партиций с теми же границами.
+    """
+
+    def __init__(self, path: str, fingerprint: str, partitions: List[KeyRangePartition], done: Dict[int, int]):
+        self.__path = path
+        self.__fingerprint = fingerprint
+        self.__partitions = partitions
+        self.__done = done
+
+    @classmethod
+    def load(cls, path: str) -> Optional['ExportProgress']:
+        """
+        Чтение прогресса из файла.
+
+        :param path: путь к файлу прогресса.
+        :return: прогресс или None, если выгрузка еще не начиналась.
+        """
+        if not os.path.exists(path):
+            return None
+
+        with open(path, encoding='utf-8') as progress_file:
+            data = json.load(progress_file)
+        partitions = [KeyRangePartition(index, lower, upper) for index, (lower, upper) in enumerate(data['partitions'])]
+        done = {int(index): rows for index, rows in data['done'].items()}
+        return cls(path, data['fingerprint'], partitions, done)
+
+    def save(self) -> None:
+        """ Атомарная запись прогресса в файл через временный файл """
+        data = {
+            'fingerprint': self.__fingerprint,
+            'partitions': [[partition.lower, partition.upper] for partition in self.__partitions],
+            'done': {str(index): rows for index, rows in sorted(self.__done.items())},
+        }
+        tmp_path = f'{self.__path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as progress_file:
+            json.dump(data, progress_file)
+        os.replace(tmp_path, self.__path)
+
+    @property
+    def fingerprint(self) -> str:
+        return self.__fingerprint
+
+    @property
+    def partitions(self) -> List[KeyRangePartition]:
+        return self.__partitions
+
+    @property
+    def rows_count(self) -> int:
+        return sum(self.__done.values())
+
+    def get_pending_partitions(self) -> List[KeyRangePartition]:
+        """ Партиции, которые еще не выгружены """
+        return [partition for partition in self.__partitions if partition.index not in self.__done]
+
+    def mark_done(self, partition: KeyRangePartition, rows_count: int) -> None:
+        """
+        Отметка партиции выгруженной с сохранением прогресса.
+
+        :param partition: партиция.
+        :param rows_count: кол-во выгруженных строк.
+        """
+        self.__done[partition.index] = rows_count
+        self.save()
+
+
+class CsvPartitionWriter:
+    """ Запись партиции в CSV, сжатый gzip, заголовок - названия колонок схемы выгрузки """
+
+    extension = 'csv.gz'
+
+    def __init__(self, path: str, schema: pa.Schema):
+        self.__file = gzip.open(path, 'wt', newline='', encoding='utf-8')
+        self.__csv_writer = csv.writer(self.__file, delimiter=';')
+        self.__csv_writer.writerow(schema.names)
+
+    def write(self, frame: pd.DataFrame) -> None:
+        self.__csv_writer.writerows(frame.itertuples(index=False, name=None))
+
+    def close(self) -> None:
+        self.__file.close()
+
+
+class ParquetPartitionWriter:
+    """
+    Запись партиции в Parquet, каждая порция строк - отдельная группа строк файла.
+    Порции приводятся к схеме выгрузки, поэтому у всех файлов партиций одна схема, в т.ч. для колонок,
+    в которых в первой порции только NULL.
+    """
+
+    extension = 'parquet'
+
+    def __init__(self, path: str, schema: pa.Schema):
+        self.__schema = schema
+        self.__parquet_writer = pq.ParquetWriter(path, schema, compression='snappy')
+
+    def write(self, frame: pd.DataFrame) -> None:
+        table = pa.Table.from_pandas(frame, schema=self.__schema, preserve_index=False)
+        self.__parquet_writer.write_table(table)
+
+    def close(self) -> None:
+        self.__parquet_writer.close()
+
+
+PartitionWriter = Union[CsvPartitionWriter, ParquetPartitionWriter]
+
+PARTITION_WRITERS: Dict[str, Type[PartitionWriter]] = {
+    PARQUET_FORMAT: ParquetPartitionWriter,
+    CSV_FORMAT: CsvPartitionWriter,
+}
+
+
+class TableExporter:
+    """
+    Параллельная выгрузка результата запроса в файлы по диапазонам целочисленного ключа.
+
+    Запрос разбивается на партиции по диапазонам ключа key_column, партиции читаются параллельно в workers потоках,
+    каждый поток берет свое подключение из пула движка (пул движка должен вмещать workers подключений).
+    Потоки-читатели передают порции строк по chunk_size в ограниченную очередь на queue_size порций, запись в файлы
+    выполняет один поток-писатель: в памяти одновременно не больше queue_size + workers порций, а при медленной
+    записи чтение приостанавливается.
+    Каждая партиция пишется в свой файл Parquet или CSV.gz через временный файл и переименовывается после
+    записи целиком, после чего партиция отмечается в файле прогресса. При повторном запуске уже выгруженные
+    партиции пропускаются, незаконченные выгружаются заново. Для пустых партиций файлы не создаются.
+    Схема файлов определяется один раз на выгрузку по типам колонок запроса, а не по значениям порций.
+
+    Запрос передается без ORDER BY, колонка ключа должна быть в списке выбираемых колонок.
+    """
+
+    def __init__(
+            self,
+            engine: Engine,
+            query: str,
+            key_column: str,
+            output_dir: str,
+            name: str,
+            file_format: str = PARQUET_FORMAT,
+            partition_size: int = 1000000,
+            workers: int = 4,
+            chunk_size: int = 200000,
+            queue_size: int = 8,
+            schema: Optional[pa.Schema] = None
+    ):
+        """
+        :param engine: движок подключения к БД (DBConnectorMSSQL.get_engine(), DBConnectorPostgres.get_engine()).
+        :param query: текст запроса SELECT.
+        :param key_column: целочисленная колонка результата запроса для разбиения на партиции.
+        :param output_dir: папка для файлов партиций и файла прогресса.
+        :param name: название выгрузки, префикс файлов.
+        :param file_format: формат файлов: parquet или csv (сжатый gzip).
+        :param partition_size: ширина диапазона значений ключа одной партиции.
+        :param workers: кол-во параллельно читаемых партиций.
+        :param chunk_size: кол-во строк в одной порции чтения.
+        :param queue_size: кол-во порций в очереди между чтением и записью.
+        :param schema: схема Arrow файлов выгрузки, по умолчанию определяется по описанию колонок курсора.
+        """
+        if file_format not in PARTITION_WRITERS:
+            raise ValueError(f'Unknown export file format: {file_format}')
+
+        self.engine = engine
+        self.query = query
+        self.key_column = key_column
+        self.output_dir = output_dir
+        self.name = name
+        self.file_format = file_format
+        self.partition_size = partition_size
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.queue_size = queue_size
+        self.schema = schema
+        self.progress_path = os.path.join(output_dir, f'{name}_progress.json')
+
+    def get_fingerprint(self) -> str:
+        """ Отпечаток параметров выгрузки, от которых зависят файлы партиций """
+        params = f'{self.query}|{self.key_column}|{self.file_format}|{self.partition_size}'
+        return sha256(params.encode('utf-8')).hexdigest()
+
+    def get_partition_path(self, partition: KeyRangePartition) -> str:
+        """ Путь к файлу партиции """
+        extension = PARTITION_WRITERS[self.file_format].extension
+        return os.path.join(self.output_dir, f'{self.name}_part_{partition.index:05d}.{extension}')
+
+    def get_key_bounds(self) -> Tuple[Optional[int], Optional[int]]:
+        """
+        Минимальное и максимальное значения ключа в результате запроса.
+
+        :return: пара значений, (None, None) для пустого результата.
+        """
+        bounds_query = text(
+            f'SELECT MIN({self.key_column}), MAX({self.key_column}) FROM ({self.query}) AS export_source'
+        )
+        with self.engine.connect() as connection:
+            lower, upper = connection.execute(bounds_query).one()
+        return lower, upper
+
+    def build_partitions(self) -> List[KeyRangePartition]:
+        """ Разбиение диапазона значений ключа на партиции по partition_size """
+        lower, upper = self.get_key_bounds()
+        if lower is None or upper is None:
+            return list()
+
+        return [
+            KeyRangePartition(index, partition_lower, min(partition_lower + self.partition_size, upper + 1))
+            for index, partition_lower in enumerate(range(lower, upper + 1, self.partition_size))
+        ]
+
+    def get_schema(self) -> pa.Schema:
+        """
+        Схема Arrow файлов выгрузки: колонки результата запроса и их типы по описанию колонок курсора.
+        Запрос выполняется без строк, схема не зависит от значений и общая для всех партиций.
+
+        :return: схема выгрузки.
+        """
+        if self.schema is not None:
+            return self.schema
+
+        schema_query = text(f'SELECT * FROM ({self.query}) AS export_source WHERE 1 = 0')
+        with self.engine.connect() as connection:
+            cursor = connection.execute(schema_query)
+            columns = list(cursor.keys())
+            description = cursor.cursor.description
+
+        fields = list()
+        for column, column_description in zip(columns, description):
+            arrow_type = self.get_arrow_type(column_description)
+            if arrow_type is None:
+                if self.file_format == PARQUET_FORMAT:
+                    raise ValueError(f'Unknown type of column {column}: {column_description[1]}, pass export schema')
+                # в CSV используется только название колонки
+                arrow_type = pa.string()
+            fields.append(pa.field(column, arrow_type))
+        return pa.schema(fields)
+
+    @staticmethod
+    def get_arrow_type(column_description: Tuple[Any, ...]) -> Optional[pa.DataType]:
+        """
+        Тип Arrow колонки по описанию колонки курсора DB-API (name, type_code, display_size, internal_size,
+        precision, scale, null_ok).
+
+        :param column_description: описание колонки.
+        :return: тип Arrow или None, если type_code неизвестен.
+        """
+        type_code, precision, scale = column_description[1], column_description[4], column_description[5]
+        if type_code in DECIMAL_TYPE_CODES:
+            if not precision or precision > DEFAULT_DECIMAL_PRECISION:
+                return pa.decimal256(DEFAULT_DECIMAL_PRECISION, DEFAULT_DECIMAL_SCALE)
+            if precision > 38:
+                return pa.decimal256(precision, scale or 0)
+            return pa.decimal128(precision, scale or 0)
+
+        return ARROW_TYPES.get(type_code)
+
+    def get_progress(self) -> ExportProgress:
+        """
+        Загрузка прогресса прошлого запуска или разбиение на партиции для новой выгрузки.
+
+        :return: прогресс выгрузки.
+        """
+        fingerprint = self.get_fingerprint()
+        progress = ExportProgress.load(self.progress_path)
+        if progress is not None:
+            if progress.fingerprint != fingerprint:
+                raise ValueError(
+                    f'Export {self.name} in {self.output_dir} was started with other parameters, '
+                    f'remove {self.progress_path} to start it again'
+                )
+            return progress
+
+        progress = ExportProgress(self.progress_path, fingerprint, self.build_partitions(), dict())
+        progress.save()
+        return progress
+
+    def read_partition(
+            self,
+            partition: KeyRangePartition,
+            chunks_queue: queue.Queue,  # type: ignore[type-arg]
+            stop_event: threading.Event
+    ) -> None:
+        """
+        Чтение партиции порциями через серверный курсор с передачей порций в очередь.
+        Окончание партиции передается порцией None, ошибка чтения - самим исключением.
+
+        :param partition: партиция.
+        :param chunks_queue: очередь порций.
+        :param stop_event: признак остановки выгрузки.
+        """
+        if stop_event.is_set():
+            return
+
+        partition_query = text(
+            f'SELECT * FROM ({self.query}) AS export_source '
+            f'WHERE {self.key_column} >= :lower AND {self.key_column} < :upper'
+        )
+        try:
+            with self.engine.connect() as connection:
+                cursor = connection.execution_options(stream_results=True).execute(
+                    partition_query,
+                    {'lower': partition.lower, 'upper': partition.upper}
+                )
+                columns = list(cursor.keys())
+                while not stop_event.is_set():
+                    rows = cursor.fetchmany(self.chunk_size)
+                    if not rows:
+                        break
+                    chunk = pd.DataFrame.from_records(rows, columns=columns)
+                    self.put_chunk(chunks_queue, (partition, chunk), stop_event)
+            self.put_chunk(chunks_queue, (partition, None), stop_event)
+        except Exception as exc:
+            self.put_chunk(chunks_queue, (partition, exc), stop_event)
+
+    @staticmethod
+    def put_chunk(
+            chunks_queue: queue.Queue,  # type: ignore[type-arg]
+            item: Tuple[KeyRangePartition, Any],
+            stop_event: threading.Event
+    ) -> None:
+        """ Передача порции в очередь с ожиданием места, пока выгрузка не остановлена """
+        while not stop_event.is_set():
+            try:
+                chunks_queue.put(item, timeout=1)
+                return
+            except queue.Full:
+                continue
+
+    def write_partitions(
+            self,
+            chunks_queue: queue.Queue,  # type: ignore[type-arg]
+            progress: ExportProgress,
+            partitions_count: int,
+            schema: pa.Schema
+    ) -> None:
+        """
+        Запись порций из очереди в файлы партиций до окончания всех партиций.
+
+        :param chunks_queue: очередь порций.
+        :param progress: прогресс выгрузки.
+        :param partitions_count: кол-во выгружаемых партиций.
+        :param schema: схема выгрузки.
+        """
+        writers: Dict[int, PartitionWriter] = dict()
+        rows_counts: Dict[int, int] = dict()
+        try:
+            while partitions_count:
+                partition, chunk = chunks_queue.get()
+                if isinstance(chunk, Exception):
+                    raise chunk
+
+                tmp_path = f'{self.get_partition_path(partition)}.tmp'
+                if chunk is None:
+                    writer = writers.pop(partition.index, None)
+                    if writer is not None:
+                        writer.close()
+                        os.replace(tmp_path, self.get_partition_path(partition))
+                    progress.mark_done(partition, rows_counts.pop(partition.index, 0))
+                    partitions_count -= 1
+                    logger.info(f'Export {self.name}: partition {partition.index} is saved')
+                    continue
+
+                writer = writers.get(partition.index)
+                if writer is None:
+                    writer = writers[partition.index] = PARTITION_WRITERS[self.file_format](tmp_path, schema)
+                writer.write(chunk)
+                rows_counts[partition.index] = rows_counts.get(partition.index, 0) + len(chunk)
+        finally:
+            for writer in writers.values():
+                writer.close()
+
+    def export(self) -> int:
+        """
+        Выгрузка невыгруженных партиций.
+
+        :return: общее кол-во выгруженных строк с учетом прошлых запусков.
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        progress = self.get_progress()
+        partitions = progress.get_pending_partitions()
+        logger.info(
+            f'Export {self.name}: {len(partitions)} of {len(progress.partitions)} partitions to export'
+        )
+
+        schema = self.get_schema()
+        chunks_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)  # type: ignore[type-arg]
+        stop_event = threading.Event()
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for partition in partitions:
+                executor.submit(self.read_partition, partition, chunks_queue, stop_event)
+            try:
+                self.write_partitions(chunks_queue, progress, len(partitions), schema)
+            finally:
+                stop_event.set()
+
+        logger.info(f'Export {self.name}: {progress.rows_count} rows saved to {self.output_dir}')
+        return progress.rows_count
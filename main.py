@@ -1,32 +1,66 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from aiogram.utils.token import TokenValidationError
 from fastapi import FastAPI
-from fastapi_cache import FastAPICache
-from fastapi_cache.backends.redis import RedisBackend
-from redis import Redis
 from starlette.requests import Request
-from starlette.responses import JSONResponse
 from uvicorn import run
 from pydantic import ValidationError as PydanticValidationError
 from settings import app_settings
-from src.dependencies.common import sqlalchemy_async_session_generator
+from src.cache import close_cache
+from src.cache import init_cache
 from src.exceptions import BaseResponseError
 from src.logger import AppLogger
 from src.middleware.auth import AuthMiddleware
-from src.middleware.auth import get_user_repository
+from src.middleware.auth.depends import api_key_store
+from src.middleware.auth.depends import credentials_verifier
+from src.middleware.auth.depends import password_hashing_service
 from src.routers import apartment_router
 from src.routers import assistant_router
 from src.routers import bill_router
 from src.routers import building_router
 from src.routers import owner_router
+from src.routers import service_router
+from src.telegram import close_telegram_bot
+from src.telegram import init_telegram_bot
+from src.telegram import telegram_notification_queue
 from src.utils.json_response_mapper import JsonResponseMapper
+from src.utils.orjson_response import ORJSONResponse
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    """
+    Инициализация ресурсов при старте приложения и их освобождение при остановке.
+
+    :param _: Приложение.
+    :return: None.
+    """
+    redis_client = await init_cache()
+    try:
+        await init_telegram_bot()
+    except TokenValidationError as exc:
+        AppLogger.error(f'Telegram bot is not created: {exc}')
+    telegram_notification_queue.start()
+    await api_key_store.start()
+    yield
+    await api_key_store.stop()
+    await telegram_notification_queue.stop(timeout=app_settings.TG_QUEUE_STOP_TIMEOUT)
+    await close_telegram_bot()
+    await close_cache(redis_client)
+    password_hashing_service.shutdown()
+
 
 app = FastAPI(
     title=app_settings.SWAGGER_TITLE,
-    version=app_settings.APP_VERSION
+    version=app_settings.APP_VERSION,
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 
 @app.exception_handler(BaseResponseError)
-async def handle_base_response_error(_: Request, exception: BaseResponseError) -> JSONResponse:
+async def handle_base_response_error(_: Request, exception: BaseResponseError) -> ORJSONResponse:
     """
     Обработка ошибок без данных.
 
@@ -39,7 +73,7 @@ async def handle_base_response_error(_: Request, exception: BaseResponseError) -
 
 
 @app.exception_handler(PydanticValidationError)
-async def handle_validation_error(_: Request, exception: PydanticValidationError) -> JSONResponse:
+async def handle_validation_error(_: Request, exception: PydanticValidationError) -> ORJSONResponse:
     """
     Обработка ошибок валидации Pydantic.
 
@@ -51,7 +85,7 @@ async def handle_validation_error(_: Request, exception: PydanticValidationError
 
 
 @app.exception_handler(Exception)
-async def handle_exception(_: Request, exception: Exception) -> JSONResponse:
+async def handle_exception(_: Request, exception: Exception) -> ORJSONResponse:
     """
     Обработка внештатных исключений.
 
@@ -61,12 +95,6 @@ async def handle_exception(_: Request, exception: Exception) -> JSONResponse:
     """
     return await JsonResponseMapper.get_from_exception(exception=exception)
 
-# Настройки Redis
-redis_client = Redis(host='localhost', port=6379, db=0)
-
-# Инициализация кеша
-FastAPICache.init(RedisBackend(redis_client), expire=60)
-
 app.include_router(
     apartment_router.api_router,
     tags=[apartment_router.name]
@@ -89,17 +117,16 @@ app.include_router(
     tags=[assistant_router.name]
     # dependencies=assistant_router.dependencies
 )
+app.include_router(
+    service_router.api_router,
+    tags=[service_router.name]
+)
 
 
 AppLogger.init(is_debug=app_settings.IS_DEBUG)
 
-@app.middleware("http")
-async def auth_middleware(request, call_next):
-    async for session in sqlalchemy_async_session_generator():
-        user_repository = await get_user_repository(session)
-        middleware = AuthMiddleware(app, user_repository=user_repository)
-        response = await middleware.dispatch(request, call_next)
-        return response
+# Сессия БД открывается только при промахе кеша учетных данных, api ключи проверяются без обращения к БД
+app.add_middleware(AuthMiddleware, credentials_verifier=credentials_verifier, api_key_store=api_key_store)
 
 
 def main() -> None:
@@ -0,0 +1,242 @@
+"""
+Воспроизводимый замер выборки квартир с задолженностью: ApartmentRepository.build_debt_statement против прежнего
+выражения (joinedload дома, владельца, доп. информации и неоплаченных счетов с фильтром EXISTS по неоплаченным
+счетам и .unique() по декартову результату).
+
+Запуск из корня репозитория на БД с примененными миграциями (alembic upgrade head), подключение и схема берутся
+из SQL_DSN и SQL_SCHEMA:
+    python -m scripts.benchmark_debt_statement --seed
+    python -m scripts.benchmark_debt_statement --repeat 20
+
+--seed очищает таблицы owner, building, apartment, apartment_info, bill и apartment_debt_summary и заполняет их
+детерминированным набором данных (generate_series, без случайных значений), после чего пересчитывает сводку
+задолженности и обновляет статистику планировщика. Без --seed замер выполняется на уже заполненной БД.
+В замер входит выполнение выражений и сборка объектов ORM, каждый прогон выполняется в новой сессии.
+"""
+import argparse
+import asyncio
+from statistics import median
+from time import perf_counter
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+
+from sqlalchemy import Select
+from sqlalchemy import select
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from settings import app_settings
+from src.dependencies.common import async_session_factory
+from src.dependencies.common import engine
+from src.models import Apartment
+from src.models import ApartmentDebtSummary
+from src.models import Building
+from src.models import Bill
+from src.repositories import ApartmentRepository
+from src.repositories.debt_summary_repository import DebtSummaryRepository
+
+StatementBuilder = Callable[..., Select]  # type: ignore[type-arg]
+
+SEED_STATEMENTS = (
+    """
+    TRUNCATE {schema}.bill, {schema}.apartment_info, {schema}.apartment, {schema}.building, {schema}.owner,
+        {schema}.apartment_debt_summary RESTART IDENTITY CASCADE
+    """,
+    """
+    INSERT INTO {schema}.building (address, floors_number, lift_number, project_name)
+    SELECT 'benchmark building ' || b, 25, 2, 'benchmark project ' || b % CAST(:projects AS integer)
+    FROM generate_series(1, CAST(:buildings AS integer)) AS b
+    """,
+    """
+    INSERT INTO {schema}.owner (fullname, passport_series, passport_values, phone)
+    SELECT 'Владелец ' || a, lpad((a % 10000)::text, 4, '0'), lpad(a::text, 6, '0'), '7' || lpad(a::text, 10, '0')
+    FROM generate_series(1, CAST(:buildings AS integer) * CAST(:apartments AS integer)) AS a
+    """,
+    """
+    INSERT INTO {schema}.apartment (id_building, id_owner, utility_account, apartment_number, floor)
+    SELECT
+        (a - 1) / CAST(:apartments AS integer) + 1,
+        a,
+        'benchmark-' || a,
+        (a - 1) % CAST(:apartments AS integer) + 1,
+        (a - 1) % CAST(:apartments AS integer) / 4 + 1
+    FROM generate_series(1, CAST(:buildings AS integer) * CAST(:apartments AS integer)) AS a
+    """,
+    """
+    INSERT INTO {schema}.apartment_info (id_apartment, room_number, common_square, kitchen_square, balcony)
+    SELECT a, a % 4 + 1, 30 + a % 70, 8, a % 2 = 0
+    FROM generate_series(1, CAST(:buildings AS integer) * CAST(:apartments AS integer)) AS a
+    """,
+    # 2 из 5 квартир без долга, у остальных не оплачены последние 0-3 месяца
+    """
+    INSERT INTO {schema}.bill (id_apartment, bill_period, bill_size, is_paid)
+    SELECT a, to_char(date '2023-01-01' + make_interval(months => m - 1), 'YYYY-MM'), 1000 + (a * 37 + m * 11) % 5000,
+        a % 5 < 2 OR m <= CAST(:months AS integer) - a % 4
+    FROM generate_series(1, CAST(:buildings AS integer) * CAST(:apartments AS integer)) AS a,
+        generate_series(1, CAST(:months AS integer)) AS m
+    """,
+)
+ANALYZED_TABLES = ('building', 'owner', 'apartment', 'apartment_info', 'bill', 'apartment_debt_summary')
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Замер выборки квартир с задолженностью')
+    parser.add_argument('--seed', action='store_true', help='очистить таблицы и заполнить их тестовыми данными')
+    parser.add_argument('--buildings', type=int, default=500, help='кол-во домов')
+    parser.add_argument('--apartments', type=int, default=40, help='кол-во квартир в доме')
+    parser.add_argument('--months', type=int, default=24, help='кол-во счетов (месяцев) на квартиру')
+    parser.add_argument('--projects', type=int, default=20, help='кол-во ЖК')
+    parser.add_argument('--repeat', type=int, default=10, help='кол-во замеров каждого выражения')
+
+    return parser.parse_args()
+
+
+def build_legacy_debt_statement(
+        building_id: Optional[int] = None,
+        building_project_name: Optional[str] = None,
+        apartment_number: Optional[int] = None
+) -> Select:  # type: ignore[type-arg]
+    """
+    Прежнее выражение выборки квартир с задолженностью. apartment_info загружается через joinedload, как при
+    прежнем lazy="joined" связей модели.
+
+    :param building_id: идентификатор дома.
+    :param building_project_name: название ЖК.
+    :param apartment_number: номер квартиры.
+    :return: выражение SELECT.
+    """
+    unpaid_bills = Apartment.bills.and_(Bill.is_paid == False)  # noqa: E712
+    statement = select(Apartment).options(
+        joinedload(Apartment.apartment_info),
+        joinedload(Apartment.owner),
+        joinedload(unpaid_bills),
+    ).where(unpaid_bills)
+
+    if building_project_name:
+        statement = statement.options(
+            joinedload(Apartment.building.and_(Building.project_name == building_project_name))
+        ).where(Apartment.building.has(Building.project_name == building_project_name))
+    else:
+        statement = statement.options(joinedload(Apartment.building))
+    if building_id:
+        statement = statement.where(Apartment.id_building == building_id)
+    if apartment_number is not None:
+        statement = statement.where(Apartment.apartment_number == apartment_number)
+
+    return statement
+
+
+def build_current_debt_statement(**kwargs: Any) -> Select:  # type: ignore[type-arg]
+    # выражение не зависит от сессии репозитория
+    return ApartmentRepository(async_db_session=None).build_debt_statement(**kwargs)  # type: ignore[arg-type]
+
+
+async def seed(args: argparse.Namespace) -> None:
+    """
+    Заполнение таблиц тестовыми данными, пересчет сводки задолженности и обновление статистики.
+
+    :param args: Аргументы запуска.
+    :return: None.
+    """
+    params = dict(buildings=args.buildings, apartments=args.apartments, months=args.months, projects=args.projects)
+    started = perf_counter()
+    async with async_session_factory() as session:
+        for statement in SEED_STATEMENTS:
+            await session.execute(text(statement.format(schema=app_settings.SQL_SCHEMA)), params)
+        await DebtSummaryRepository(async_db_session=session).refresh()
+        await session.commit()
+
+    async with engine.connect() as connection:
+        connection = await connection.execution_options(isolation_level='AUTOCOMMIT')
+        for table_name in ANALYZED_TABLES:
+            await connection.execute(text(f'ANALYZE {app_settings.SQL_SCHEMA}.{table_name}'))
+
+    print(f'seed: {args.buildings * args.apartments} apartments, {args.buildings * args.apartments * args.months} '
+          f'bills, {perf_counter() - started:.1f} s')
+
+
+async def get_scenarios() -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Фильтры замера: все должники, один ЖК, один дом и одна квартира-должник.
+
+    :return: Список пар (название, аргументы построителя выражения).
+    """
+    async with async_session_factory() as session:
+        apartment_row = (await session.execute(
+            select(Apartment.id_building, Apartment.apartment_number, Building.project_name).join(
+                ApartmentDebtSummary, ApartmentDebtSummary.id_apartment == Apartment.id
+            ).join(
+                Apartment.building
+            ).where(
+                ApartmentDebtSummary.unpaid_count > 0
+            ).order_by(Apartment.id).limit(1)
+        )).one()
+
+    return [
+        ('all debtors', dict()),
+        ('project', dict(building_project_name=apartment_row.project_name)),
+        ('building', dict(building_id=apartment_row.id_building)),
+        ('apartment', dict(building_id=apartment_row.id_building, apartment_number=apartment_row.apartment_number)),
+    ]
+
+
+async def run_statement(statement_builder: StatementBuilder, kwargs: Dict[str, Any]) -> Tuple[float, Set[int]]:
+    """
+    Выполнение выражения в новой сессии со сборкой объектов ORM.
+
+    :param statement_builder: Построитель выражения.
+    :param kwargs: Фильтры построителя.
+    :return: Время выполнения, сек, и ID найденных квартир.
+    """
+    session: AsyncSession
+    async with async_session_factory() as session:
+        started = perf_counter()
+        result = await session.execute(statement_builder(**kwargs))
+        apartments = result.scalars().unique().all()
+        elapsed = perf_counter() - started
+
+    return elapsed, {apartment.id for apartment in apartments}
+
+
+async def benchmark(repeat: int) -> None:
+    """
+    Поочередный замер прежнего и текущего выражения по каждому фильтру, после прогрева.
+
+    :param repeat: Кол-во замеров каждого выражения.
+    :return: None.
+    """
+    print(f'{"scenario":<12} {"rows":>6} {"legacy median":>14} {"legacy min":>11} {"current median":>15} '
+          f'{"current min":>12} {"speedup":>8}')
+    for name, kwargs in await get_scenarios():
+        _, legacy_ids = await run_statement(build_legacy_debt_statement, kwargs)
+        _, current_ids = await run_statement(build_current_debt_statement, kwargs)
+        assert legacy_ids == current_ids, f'{name}: выражения вернули разные квартиры'
+
+        legacy_timings, current_timings = list(), list()
+        for _ in range(repeat):
+            legacy_timings.append((await run_statement(build_legacy_debt_statement, kwargs))[0] * 1000)
+            current_timings.append((await run_statement(build_current_debt_statement, kwargs))[0] * 1000)
+
+        print(f'{name:<12} {len(current_ids):>6} {median(legacy_timings):>11.1f} ms {min(legacy_timings):>8.1f} ms '
+              f'{median(current_timings):>12.1f} ms {min(current_timings):>9.1f} ms '
+              f'{median(legacy_timings) / median(current_timings):>7.1f}x')
+
+
+async def main() -> None:
+    args = parse_args()
+    try:
+        if args.seed:
+            await seed(args)
+        await benchmark(repeat=args.repeat)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,140 @@
+"""
+Воспроизводимый замер сборки DTO из объектов ORM: TrustedDtoMapper против model_validate, которым репозитории
+собирали DTO раньше.
+
+Запуск из корня репозитория, БД не нужна - объекты ORM создаются в памяти по детерминированному набору данных:
+    python -m scripts.benchmark_trusted_dto_mapper
+    python -m scripts.benchmark_trusted_dto_mapper --rows 100000 --repeat 5
+
+Перед замером DTO, собранные обоими способами, сравниваются по model_dump(by_alias=True) для всех объектов.
+Каждый прогон собирает DTO для всех объектов набора, в отчет выводятся медиана и минимум по прогонам. Как и в timeit,
+сборщик мусора на время прогона отключается, а освобождение собранных DTO в замер не входит.
+"""
+import argparse
+import gc
+from statistics import median
+from time import perf_counter
+from typing import Any
+from typing import Callable
+from typing import List
+from typing import Tuple
+from typing import Type
+
+from pydantic import BaseModel
+
+from src.models import Apartment
+from src.models import ApartmentInfo
+from src.models import Bill
+from src.models import Owner
+from src.schemas.dtos import ApartmentFullDto
+from src.schemas.dtos import BillDto
+from src.schemas.dtos import OwnerDto
+from src.utils.trusted_dto_mapper import TrustedDtoMapper
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Замер сборки DTO из объектов ORM')
+    parser.add_argument('--rows', type=int, default=100000, help='кол-во объектов ORM в каждом наборе')
+    parser.add_argument('--repeat', type=int, default=5, help='кол-во замеров каждого способа')
+
+    return parser.parse_args()
+
+
+def build_datasets(rows: int) -> List[Tuple[str, Type[BaseModel], List[Any]]]:
+    """
+    Наборы объектов ORM: счета, владельцы и квартиры с доп. информацией. Значения уже в том виде, в котором их
+    сохраняют валидаторы DTO, как у строк своей БД.
+
+    :param rows: Кол-во объектов в каждом наборе.
+    :return: Список троек (название, класс DTO, объекты ORM).
+    """
+    bills = [
+        Bill(
+            id=i, id_apartment=i % 500 + 1, bill_period=f'2024-{i % 12 + 1:02d}', bill_size=100.0 + i,
+            is_paid=i % 2 == 0
+        )
+        for i in range(1, rows + 1)
+    ]
+    owners = [
+        Owner(
+            id=i, fullname='Иванов Иван Иванович', passport_series=f'{i % 10000:04d}', passport_values=f'{i:06d}',
+            phone=f'8{i:010d}'
+        )
+        for i in range(1, rows + 1)
+    ]
+    apartments = [
+        Apartment(
+            id=i, id_building=i % 50 + 1, id_owner=i, utility_account=f'benchmark-{i}', apartment_number=i % 200 + 1,
+            floor=i % 25 + 1,
+            apartment_info=ApartmentInfo(id=i, id_apartment=i, room_number=i % 4 + 1, common_square=50.0)
+        )
+        for i in range(1, rows + 1)
+    ]
+
+    return [
+        ('bills (BillDto)', BillDto, bills),
+        ('owners (OwnerDto)', OwnerDto, owners),
+        ('apartments (ApartmentFullDto)', ApartmentFullDto, apartments),
+    ]
+
+
+def measure(map_objects: Callable[[List[Any]], List[BaseModel]], objects: List[Any], repeat: int) -> List[float]:
+    """
+    Замер сборки DTO для всех объектов набора с отключенным сборщиком мусора.
+
+    :param map_objects: Функция сборки списка DTO.
+    :param objects: Объекты ORM.
+    :param repeat: Кол-во замеров.
+    :return: Время каждого замера, мс.
+    """
+    timings = list()
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            started = perf_counter()
+            dtos = map_objects(objects)
+            timings.append((perf_counter() - started) * 1000)
+        finally:
+            gc.enable()
+        del dtos
+
+    return timings
+
+
+def benchmark(rows: int, repeat: int) -> None:
+    """
+    Сравнение результатов и поочередный замер model_validate и TrustedDtoMapper по каждому набору.
+
+    :param rows: Кол-во объектов в каждом наборе.
+    :param repeat: Кол-во замеров каждого способа.
+    :return: None.
+    """
+    print(f'{"dataset":<30} {"rows":>7} {"validate median":>16} {"validate min":>13} {"trusted median":>15} '
+          f'{"trusted min":>12} {"speedup":>8}')
+    for name, dto_type, objects in build_datasets(rows):
+        mapper = TrustedDtoMapper.get(dto_type)
+
+        def validate_objects(objs: List[Any]) -> List[BaseModel]:
+            return [dto_type.model_validate(obj) for obj in objs]
+
+        validated_dtos, trusted_dtos = validate_objects(objects), mapper.map_many(objects)
+        assert [dto.model_dump(by_alias=True) for dto in validated_dtos] == [
+            dto.model_dump(by_alias=True) for dto in trusted_dtos
+        ], f'{name}: DTO отличаются'
+
+        validate_timings = measure(validate_objects, objects, repeat)
+        trusted_timings = measure(mapper.map_many, objects, repeat)  # type: ignore[arg-type]
+
+        print(f'{name:<30} {len(objects):>7} {median(validate_timings):>13.0f} ms {min(validate_timings):>10.0f} ms '
+              f'{median(trusted_timings):>12.0f} ms {min(trusted_timings):>9.0f} ms '
+              f'{median(validate_timings) / median(trusted_timings):>7.1f}x')
+
+
+def main() -> None:
+    args = parse_args()
+    benchmark(rows=args.rows, repeat=args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic_settings import BaseSettings
 from pydantic_settings import SettingsConfigDict
 
@@ -21,6 +23,15 @@ class AppSettings(BaseSettings):
     # DB
     SQL_DSN: str = 'postgresql+asyncpg://localhost/postgres'
     SQL_SCHEMA: str = 'public'
+    UPSERT_CHUNK_SIZE: int = 1000  # кол-во строк в одном INSERT ... ON CONFLICT при массовом создании/обновлении
+    STREAM_CHUNK_SIZE: int = 1000  # кол-во строк в одной порции при потоковой выгрузке таблицы
+    DB_POOL_SIZE: int = 10  # кол-во постоянно открытых соединений пула
+    DB_MAX_OVERFLOW: int = 10  # кол-во дополнительных соединений сверх DB_POOL_SIZE при пиковой нагрузке
+    DB_POOL_TIMEOUT: float = 30.0  # время ожидания свободного соединения, сек
+    DB_POOL_RECYCLE: int = 1800  # время жизни соединения до переоткрытия, сек (-1 - без ограничения)
+    DB_POOL_PRE_PING: bool = True  # проверка соединения перед выдачей из пула
+    DB_STATEMENT_CACHE_SIZE: int = 100  # размер кеша подготовленных выражений asyncpg (0 - для pgbouncer)
+    DB_QUERY_CACHE_SIZE: int = 500  # размер кеша скомпилированных SQL выражений SQLAlchemy на движок
     PATH_NOT_REQUIRE_AUTH: list = [
         '/',
         '/info',
@@ -29,9 +40,41 @@ class AppSettings(BaseSettings):
         '/redoc',
         '/metrics',
     ]
+    PATH_PREFIXES_NOT_REQUIRE_AUTH: list = [
+        '/docs/',
+    ]  # префиксы путей без авторизации (вложенные страницы документации)
+
+    # Cache
+    REDIS_HOST: str = 'localhost'
+    REDIS_PORT: int = 6379
+    REDIS_DB: int = 0
+    REDIS_PASSWORD: Optional[str] = None
+    REDIS_POOL_SIZE: int = 20  # максимальное кол-во соединений в пуле клиента Redis
+    REDIS_SOCKET_TIMEOUT: float = 1.0  # таймаут подключения и операций Redis, сек
+    CACHE_EXPIRE: int = 60  # время жизни записи кеша по умолчанию, сек
+    CACHE_PREFIX: str = 'payment-management'  # префикс ключей кеша ответов
+    CACHE_ENTITY_EXPIRE: int = 600  # время жизни закешированных ответов роутеров, сбрасываемых при записи, сек
+    CACHE_L1_MAX_BYTES: int = 64 * 1024 * 1024  # макс. размер кеша ответов в памяти процесса перед Redis, байт
+    CACHE_L1_TTL: int = 5  # макс. время жизни записи кеша в памяти процесса, сек
+    CACHE_INVALIDATION_MAX_IDS: int = 50  # при большем кол-ве измененных объектов сбрасывается все пространство имен
+    CACHE_INVALIDATION_BATCH_SIZE: int = 1000  # кол-во ключей в одном SCAN/UNLINK при сбросе кеша в Redis
 
     # Auth
     AUTH_URL: str = ''  # TODO добавить авторизацию
+    AUTH_CACHE_SIZE: int = 1024  # кол-во закешированных успешных проверок логина и пароля
+    AUTH_CACHE_TTL: int = 300  # время жизни успешной проверки логина и пароля в кеше, сек
+    API_KEY_HEADER: str = 'example_name_of_api_key'  # заголовок запроса с api ключом
+    API_KEYS_REFRESH_INTERVAL: float = 30.0  # период опроса БД на измененные api ключи, сек
+    API_KEYS_FULL_RELOAD_INTERVAL: float = 600.0  # период полной перезагрузки api ключей из БД, сек
+    AUTH_BCRYPT_ROUNDS: int = 12  # стоимость bcrypt при хешировании новых паролей
+    AUTH_HASHING_WORKERS: int = 4  # кол-во потоков для bcrypt
+    AUTH_HASHING_MAX_PENDING: int = 64  # кол-во одновременно принятых в пул задач bcrypt, остальные ждут очереди
+    AUTH_HASHING_QUEUE_TIMEOUT: float = 5.0  # сколько задача ждет места в пуле, после чего запрос отклоняется, сек
+
+    # Debt analytics
+    BILL_PERIOD_FORMAT: str = '%Y-%m'  # формат периода счета (год раньше месяца, строки сравниваются как даты)
+    DEBT_AGE_BUCKETS_MONTHS: list = [3, 6, 12]  # границы групп возраста долга, мес
+    DEBT_PERCENTILES: list = [50, 75, 90, 95, 99]  # перцентили задолженности по квартирам, %
 
     DEBTOR_MESSAGE_TEMPLATE: str = """
                                                                       кому: {}
@@ -57,6 +100,14 @@ class AppSettings(BaseSettings):
     """
     TG_CHAT_ID: str
     TG_BOT_TOKEN: str
+    TG_GLOBAL_RATE: float = 25.0  # макс. кол-во сообщений бота в секунду во все чаты (лимит Telegram ~30)
+    TG_PER_CHAT_RATE: float = 1.0  # макс. кол-во сообщений бота в секунду в один чат
+    TG_MAX_CONCURRENCY: int = 20  # макс. кол-во одновременных запросов к Telegram при массовой отправке
+    TG_MAX_RETRIES: int = 3  # кол-во повторов отправки сообщения после retry_after или сетевой ошибки
+    TG_QUEUE_SIZE: int = 1000  # макс. кол-во уведомлений в очереди фоновой отправки
+    TG_QUEUE_WORKERS: int = 2  # кол-во воркеров фоновой отправки уведомлений
+    TG_QUEUE_STOP_TIMEOUT: float = 10.0  # время на отправку оставшихся уведомлений при остановке приложения, сек
+    TG_DEDUP_WINDOW: int = 300  # окно, в котором одинаковые уведомления отправляются один раз, сек
 
 
 app_settings = AppSettings()
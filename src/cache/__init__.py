@@ -0,0 +1,8 @@
+from .cache_invalidation import invalidate_cache
+from .cache_key_builder import build_cache_key
+from .cache_lifecycle import close_cache
+from .cache_lifecycle import init_cache
+from .orjson_coder import ORJsonCoder
+from .single_flight import SingleFlight
+from .single_flight import single_flight
+from .two_tier_backend import TwoTierBackend
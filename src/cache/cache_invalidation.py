@@ -0,0 +1,57 @@
+from typing import Iterable
+
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.inmemory import InMemoryBackend
+
+from settings import app_settings
+from src.enums import CacheNamespaceEnum
+from src.logger import AppLogger
+from .cache_key_builder import get_entity_cache_key_prefix
+from .cache_key_builder import get_list_cache_key_prefix
+from .two_tier_backend import TwoTierBackend
+
+
+async def invalidate_cache(
+        namespace: CacheNamespaceEnum,
+        objects_ids: Iterable[int],
+        dependent_namespaces: Iterable[CacheNamespaceEnum] = ()
+) -> None:
+    """
+    Удаление из кеша ответов, устаревших после записи объектов.
+    В своем пространстве имен удаляются ключи измененных объектов и все выборки, в зависимых пространствах имен
+    (где измененные объекты входят во вложенные данные) - все ключи. Если объектов больше
+    CACHE_INVALIDATION_MAX_IDS, свое пространство имен тоже сбрасывается целиком.
+    Для двухуровневого бэкенда все префиксы удаляются за один проход, см. TwoTierBackend.clear_namespaces.
+    Ошибка кеша не должна ломать запись в БД, поэтому она только логируется, ключи в этом случае истекут по TTL.
+
+    :param namespace: Пространство имен роутера измененных объектов.
+    :param objects_ids: ID измененных объектов.
+    :param dependent_namespaces: Пространства имен, ответы которых включают измененные объекты.
+    :return: None.
+    """
+    objects_ids = list(objects_ids)
+    if len(objects_ids) > app_settings.CACHE_INVALIDATION_MAX_IDS:
+        key_prefixes = [f'{FastAPICache.get_prefix()}:{namespace.value}']
+    else:
+        key_prefixes = [get_entity_cache_key_prefix(namespace.value, object_id) for object_id in objects_ids]
+        key_prefixes.append(get_list_cache_key_prefix(namespace.value))
+    key_prefixes.extend(
+        f'{FastAPICache.get_prefix()}:{dependent_namespace.value}' for dependent_namespace in dependent_namespaces
+    )
+    AppLogger.debug(f'Invalidate cache keys: {key_prefixes}')
+
+    backend = FastAPICache.get_backend()
+    if isinstance(backend, TwoTierBackend):
+        try:
+            await backend.clear_namespaces(key_prefixes)
+        except Exception as exc:
+            AppLogger.error(f'Cache invalidation error {key_prefixes[0]}: {exc}')
+        return
+
+    # RedisBackend сам добавляет к префиксу разделитель ':*', InMemoryBackend сравнивает только начало строки
+    separator = ':' if isinstance(backend, InMemoryBackend) else ''
+    for key_prefix in key_prefixes:
+        try:
+            await backend.clear(namespace=f'{key_prefix}{separator}')
+        except Exception as exc:
+            AppLogger.error(f'Cache invalidation error {key_prefix}: {exc}')
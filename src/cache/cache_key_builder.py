@@ -0,0 +1,76 @@
+from hashlib import md5
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from fastapi_cache import FastAPICache
+from starlette.requests import Request
+from starlette.responses import Response
+
+ENTITY_KEY_KIND = 'id'
+LIST_KEY_KIND = 'list'
+
+
+def get_entity_cache_key_prefix(namespace: str, object_id: Any) -> str:
+    """
+    Префикс ключей кеша, относящихся к одному объекту.
+
+    :param namespace: Пространство имен роутера.
+    :param object_id: ID объекта.
+    :return: Префикс ключей.
+    """
+    return f'{FastAPICache.get_prefix()}:{namespace}:{ENTITY_KEY_KIND}:{object_id}'
+
+
+def get_list_cache_key_prefix(namespace: str) -> str:
+    """
+    Префикс ключей кеша списков и прочих выборок, не привязанных к одному объекту.
+
+    :param namespace: Пространство имен роутера.
+    :return: Префикс ключей.
+    """
+    return f'{FastAPICache.get_prefix()}:{namespace}:{LIST_KEY_KIND}'
+
+
+def build_cache_key(
+        func: Callable[..., Any],
+        namespace: str = '',
+        request: Optional[Request] = None,
+        response: Optional[Response] = None,
+        args: Optional[Tuple[Any, ...]] = None,
+        kwargs: Optional[Dict[str, Any]] = None
+) -> str:
+    """
+    Построение ключа кеша ответа с пространством имен роутера и ID объекта.
+    Ключи вида {prefix}:{namespace}:id:{id}:{func} относятся к одному объекту и удаляются при его изменении,
+    ключи вида {prefix}:{namespace}:list:{func}:{hash} относятся к выборкам и удаляются при любом изменении в
+    пространстве имен. В ключ попадают только параметры запроса, объекты зависимостей (контроллеры, сессии) - нет.
+
+    :param func: Функция эндпойнта.
+    :param namespace: Пространство имен роутера.
+    :param request: Запрос.
+    :param response: Ответ.
+    :param args: Позиционные аргументы эндпойнта.
+    :param kwargs: Именованные аргументы эндпойнта.
+    :return: Ключ кеша.
+    """
+    params: List[Tuple[str, Any]]
+    if request is None:
+        # эндпойнты роутеров принимают запрос под своим именем параметра, fastapi_cache передает его в kwargs
+        request = next((value for value in (kwargs or dict()).values() if isinstance(value, Request)), None)
+    if request is not None:
+        object_id = request.path_params.get('id')
+        if object_id is not None:
+            return f'{get_entity_cache_key_prefix(namespace, object_id)}:{func.__name__}'
+        params = sorted(request.query_params.multi_items())
+    else:
+        params = sorted(
+            (key, value) for key, value in (kwargs or dict()).items()
+            if value is None or isinstance(value, (str, int, float, bool))
+        )
+    params_hash = md5(f'{params}'.encode('utf-8')).hexdigest()  # nosec: B303
+
+    return f'{get_list_cache_key_prefix(namespace)}:{func.__name__}:{params_hash}'
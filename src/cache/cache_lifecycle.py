@@ -0,0 +1,77 @@
+from typing import Optional
+
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.inmemory import InMemoryBackend
+from fastapi_cache.backends.redis import RedisBackend
+from redis.asyncio import ConnectionPool
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from settings import app_settings
+from src.logger import AppLogger
+from .cache_key_builder import build_cache_key
+from .orjson_coder import ORJsonCoder
+from .two_tier_backend import TwoTierBackend
+
+
+async def init_cache() -> Optional[Redis]:
+    """
+    Инициализация кеша fastapi_cache при старте приложения.
+    Используется асинхронный клиент Redis с пулом соединений, перед ним LRU кеш в памяти процесса.
+    В кеше хранятся готовые тела JSON ответов.
+    Если Redis недоступен, кеш работает только в памяти процесса, чтобы приложение можно было
+    запустить локально и в тестах без Redis.
+
+    :return: Клиент Redis или None, если используется кеш в памяти процесса.
+    """
+    pool = ConnectionPool(
+        host=app_settings.REDIS_HOST,
+        port=app_settings.REDIS_PORT,
+        db=app_settings.REDIS_DB,
+        password=app_settings.REDIS_PASSWORD,
+        max_connections=app_settings.REDIS_POOL_SIZE,
+        socket_timeout=app_settings.REDIS_SOCKET_TIMEOUT,
+        socket_connect_timeout=app_settings.REDIS_SOCKET_TIMEOUT,
+    )
+    redis_client = Redis.from_pool(pool)
+    try:
+        await redis_client.ping()
+    except (RedisError, OSError) as exc:
+        AppLogger.warning(f'Redis is unavailable, in-memory cache backend is used: {exc}')
+
+        await redis_client.aclose()
+        FastAPICache.init(
+            InMemoryBackend(),
+            prefix=app_settings.CACHE_PREFIX,
+            expire=app_settings.CACHE_EXPIRE,
+            key_builder=build_cache_key,
+            coder=ORJsonCoder
+        )
+        return None
+
+    AppLogger.info(f'Redis cache backend is used: {app_settings.REDIS_HOST}:{app_settings.REDIS_PORT}')
+
+    FastAPICache.init(
+        TwoTierBackend(
+            l2_backend=RedisBackend(redis_client),
+            l1_max_bytes=app_settings.CACHE_L1_MAX_BYTES,
+            l1_ttl=app_settings.CACHE_L1_TTL,
+            batch_size=app_settings.CACHE_INVALIDATION_BATCH_SIZE
+        ),
+        prefix=app_settings.CACHE_PREFIX,
+        expire=app_settings.CACHE_EXPIRE,
+        key_builder=build_cache_key,
+        coder=ORJsonCoder
+    )
+    return redis_client
+
+
+async def close_cache(redis_client: Optional[Redis]) -> None:
+    """
+    Закрытие клиента Redis и его пула соединений при остановке приложения.
+
+    :param redis_client: Клиент Redis или None, если использовался кеш в памяти процесса.
+    :return: None.
+    """
+    if redis_client is not None:
+        await redis_client.aclose()
@@ -0,0 +1,25 @@
+from typing import Any
+from typing import Union
+
+from fastapi_cache.coder import Coder
+from starlette.responses import Response
+
+from src.utils.orjson_response import ORJSONResponse
+
+
+class ORJsonCoder(Coder):
+    """
+    Кодировщик кеша ответов: в кеше хранится готовое тело JSON ответа.
+    При попадании в кеш тело отдается как есть, без разбора JSON и повторной сериализации ответа.
+    """
+
+    @classmethod
+    def encode(cls, value: Any) -> bytes:  # type: ignore[override]
+        if isinstance(value, Response):
+            return bytes(value.body)
+
+        return ORJSONResponse(content=value).body
+
+    @classmethod
+    def decode(cls, value: Union[str, bytes]) -> ORJSONResponse:
+        return ORJSONResponse(content=value.encode('utf-8') if isinstance(value, str) else value)
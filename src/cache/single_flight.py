@@ -0,0 +1,92 @@
+import asyncio
+from functools import wraps
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+from typing import Dict
+from typing import TypeVar
+
+from src.logger import AppLogger
+from .cache_key_builder import build_cache_key
+
+ResultType = TypeVar('ResultType')
+
+
+class SingleFlight:
+    """
+    Объединение одновременных одинаковых вызовов: пока выполняется вызов по ключу, остальные вызовы
+    с тем же ключом ждут его результата, а не выполняют запрос к БД повторно.
+    """
+
+    def __init__(self) -> None:
+        self._in_flight: Dict[str, asyncio.Task[Any]] = dict()
+
+    def __len__(self) -> int:
+        return len(self._in_flight)
+
+    async def run(self, key: str, func: Callable[[], Awaitable[ResultType]]) -> ResultType:
+        """
+        Выполнение вызова или ожидание уже выполняющегося вызова с тем же ключом.
+        Вызов защищен от отмены ожидающих, чтобы отключение одного клиента не прерывало ответ остальным.
+        Вызов работает с зависимостями (сессией БД, контроллерами) запроса, который его начал, поэтому при отмене
+        этого запроса отмена передается дальше только после завершения вызова: иначе FastAPI закроет сессию,
+        которую вызов еще использует для остальных ожидающих.
+
+        :param key: Ключ вызова.
+        :param func: Асинхронная функция без аргументов.
+        :return: Результат вызова.
+        """
+        task = self._in_flight.get(key)
+        if task is not None:
+            AppLogger.debug(f'Join in-flight call: {key}')
+
+            return await asyncio.shield(task)
+
+        task = asyncio.ensure_future(func())
+        self._in_flight[key] = task
+        task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            await self.wait_done(task=task)
+            raise
+
+    @staticmethod
+    async def wait_done(task: asyncio.Task[Any]) -> None:
+        """
+        Ожидание завершения вызова, устойчивое к повторной отмене ожидающего.
+
+        :param task: Задача вызова.
+        :return: None.
+        """
+        while not task.done():
+            try:
+                await asyncio.wait([task])
+            except asyncio.CancelledError:
+                continue
+
+
+single_flight_calls = SingleFlight()
+
+
+def single_flight(
+        namespace: str = ''
+) -> Callable[[Callable[..., Awaitable[ResultType]]], Callable[..., Awaitable[ResultType]]]:
+    """
+    Декоратор эндпойнта для объединения одновременных промахов кеша.
+    Применяется под декоратором cache, ключ строится тем же построителем ключей, что и ключ кеша,
+    поэтому объединяются только запросы, которые получили бы один и тот же закешированный ответ.
+
+    :param namespace: Пространство имен роутера.
+    :return: Декоратор.
+    """
+    def wrapper(func: Callable[..., Awaitable[ResultType]]) -> Callable[..., Awaitable[ResultType]]:
+        @wraps(func)
+        async def inner(*args: Any, **kwargs: Any) -> ResultType:
+            key = build_cache_key(func, namespace, args=args, kwargs=kwargs)
+
+            return await single_flight_calls.run(key=key, func=lambda: func(*args, **kwargs))
+
+        return inner
+
+    return wrapper
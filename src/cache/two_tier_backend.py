@@ -0,0 +1,124 @@
+from math import ceil
+from os.path import commonprefix
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import Union
+from typing import cast
+
+from fastapi_cache.backends import Backend
+from fastapi_cache.backends.redis import RedisBackend
+from redis.asyncio import Redis
+
+from src.utils.sized_lru_cache import SizedLruCache
+
+
+class TwoTierBackend(Backend):
+    """
+    Бэкенд fastapi_cache из двух уровней: LRU кеш в памяти процесса (L1) перед общим бэкендом (L2, Redis).
+    L1 хранит уже закодированные JSON байты и отвечает на повторные запросы без обращения к Redis.
+    Время жизни записи в L1 ограничено, так как сброс кеша при записи очищает L1 только текущего процесса,
+    в остальных процессах устаревшие записи L1 живут не дольше l1_ttl.
+    Пространство имен в clear трактуется как у RedisBackend: удаляются ключи вида {namespace}:*.
+    """
+
+    def __init__(self, l2_backend: Backend, l1_max_bytes: int, l1_ttl: int, batch_size: int = 1000):
+        """
+        :param l2_backend: Общий бэкенд кеша.
+        :param l1_max_bytes: Максимальный суммарный размер записей L1 в байтах.
+        :param l1_ttl: Максимальное время жизни записи L1 в секундах.
+        :param batch_size: Кол-во ключей в одном SCAN/UNLINK при сбросе пространств имен в Redis.
+        """
+        self._l2_backend = l2_backend
+        self._l1_cache = SizedLruCache(max_bytes=l1_max_bytes)
+        self._l1_ttl = l1_ttl
+        self._batch_size = batch_size
+
+    @property
+    def l2_backend(self) -> Backend:
+        return self._l2_backend
+
+    @property
+    def l1_cache(self) -> SizedLruCache:
+        return self._l1_cache
+
+    @staticmethod
+    def to_bytes(value: Union[str, bytes]) -> bytes:
+        return value.encode('utf-8') if isinstance(value, str) else value
+
+    def set_l1(self, key: str, value: Union[str, bytes], expire: Optional[int]) -> None:
+        """
+        Сохранение значения в L1 на время не дольше времени жизни в L2.
+
+        :param key: Ключ.
+        :param value: Закодированное значение.
+        :param expire: Время жизни записи в L2 в секундах, None или -1 - без ограничения.
+        :return: None.
+        """
+        ttl = self._l1_ttl if expire is None or expire < 0 else min(expire, self._l1_ttl)
+        self._l1_cache.set(key=key, value=self.to_bytes(value), ttl=ttl)
+
+    async def get_with_ttl(self, key: str) -> Tuple[int, Optional[bytes]]:  # type: ignore[override]
+        l1_ttl, value = self._l1_cache.get_with_ttl(key)
+        if value is not None:
+            return ceil(l1_ttl), value
+
+        ttl, l2_value = await self._l2_backend.get_with_ttl(key)
+        if l2_value is None:
+            return ttl, None
+
+        self.set_l1(key=key, value=l2_value, expire=ttl)
+        return ttl, self.to_bytes(l2_value)
+
+    async def get(self, key: str) -> Optional[bytes]:  # type: ignore[override]
+        _, value = await self.get_with_ttl(key)
+        return value
+
+    async def set(self, key: str, value: str, expire: Optional[int] = None) -> None:
+        await self._l2_backend.set(key, value, expire)
+        self.set_l1(key=key, value=value, expire=expire)
+
+    async def clear(self, namespace: Optional[str] = None, key: Optional[str] = None) -> int:
+        if namespace:
+            self._l1_cache.delete_by_prefix(f'{namespace}:')
+        elif key:
+            self._l1_cache.delete(key)
+
+        return await self._l2_backend.clear(namespace=namespace, key=key)
+
+    async def clear_namespaces(self, namespaces: Sequence[str]) -> int:
+        """
+        Удаление ключей нескольких пространств имен за один проход вместо вызова clear на каждое.
+        В L1 префиксы проверяются одним проходом по записям. В Redis ключи перебираются одним курсором SCAN по
+        общему началу префиксов (без блокирующего KEYS), подходящие ключи удаляются пачками через UNLINK.
+
+        :param namespaces: Пространства имен, удаляются ключи вида {namespace}:*.
+        :return: Кол-во удаленных ключей L2.
+        """
+        if not namespaces:
+            return 0
+
+        prefixes = tuple(f'{namespace}:' for namespace in namespaces)
+        self._l1_cache.delete_by_prefix(prefixes)
+
+        if not isinstance(self._l2_backend, RedisBackend):
+            removed = 0
+            for namespace in namespaces:
+                removed += await self._l2_backend.clear(namespace=namespace)
+            return removed
+
+        redis = cast(Redis, self._l2_backend.redis)
+        bytes_prefixes = tuple(prefix.encode('utf-8') for prefix in prefixes)
+        keys: List[bytes] = list()
+        removed = 0
+        async for key in redis.scan_iter(match=f'{commonprefix(prefixes)}*', count=self._batch_size):
+            if self.to_bytes(key).startswith(bytes_prefixes):
+                keys.append(key)
+            if len(keys) >= self._batch_size:
+                removed += await redis.unlink(*keys)
+                keys.clear()
+        if keys:
+            removed += await redis.unlink(*keys)
+
+        return removed
@@ -1,5 +1,7 @@
+from typing import AsyncGenerator
 from typing import List, Optional
 
+from src.enums import CacheNamespaceEnum
 from src.repositories import ApartmentRepository
 from src.schemas.dtos import ApartmentDto
 from src.schemas.dtos import ApartmentFullDto
@@ -22,6 +24,12 @@ class ApartmentController(
             short_schema_type=ApartmentDto,
             full_schema_type=ApartmentFullDto,
             external_schema_type=ApartmentFullDto,
+            cache_namespace=CacheNamespaceEnum.APARTMENTS,
+            dependent_cache_namespaces=(
+                CacheNamespaceEnum.BUILDING,
+                CacheNamespaceEnum.OWNER,
+                CacheNamespaceEnum.ASSISTANT,
+            ),
         )
 
     async def get_apartments_full_data_with_debt(
@@ -67,3 +75,21 @@ class ApartmentController(
         if not res:
             raise ObjectNotFoundError()
         return res
+
+    async def stream_apartments_full_data_with_debt_by_project_name(
+            self,
+            chunk_size: int,
+            building_project_name: Optional[str] = None
+    ) -> AsyncGenerator[List[ApartmentFullResponse], None]:
+        """
+        Потоковое получение расширенных данных о квартирах с задолженностью по названию ЖК порциями.
+
+        :param chunk_size: кол-во квартир в одной порции.
+        :param building_project_name: название жилого комплекса. Его может не быть, тогда поиск среди всех ЖК.
+        :return: асинхронный генератор списков дто ApartmentFullResponse
+        """
+        async for apartments_list in self.main_repository.stream_apartments_full_data_with_debt_by_project_name(
+                chunk_size=chunk_size,
+                building_project_name=building_project_name
+        ):
+            yield apartments_list
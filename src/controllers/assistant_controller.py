@@ -1,12 +1,27 @@
-from typing import List
+from datetime import date
+from typing import Any
+from typing import AsyncGenerator
+from typing import AsyncIterable
+from typing import Dict
+from typing import List, Optional
+from typing import Tuple
 
+import numpy as np
+import pandas as pd
+from starlette.concurrency import run_in_threadpool
+
+from src.exceptions import ObjectNotFoundError
 from src.repositories import AssistantRepository
-from src.schemas.dtos import BillSchema
 from src.schemas.responses import ApartmentFullResponse, DebtorInfoResponse
 from settings import app_settings
+from src.schemas.responses import DebtAnalyticsResponse
+from src.schemas.responses import DebtGroupSchema
+from src.schemas.responses import DebtPercentileSchema
 from src.schemas.responses import DebtorMessageResponse
-from src.schemas.responses.apartments_debt_schema import ApartmentsDebtSchema
-from src.telegram import get_telegram_bot
+from src.telegram import telegram_notification_queue
+from src.utils.compiled_template import CompiledTemplate
+
+DEBTOR_MESSAGE_TEMPLATE = CompiledTemplate(app_settings.DEBTOR_MESSAGE_TEMPLATE)
 
 
 class AssistantController:
@@ -14,8 +29,187 @@ class AssistantController:
     def __init__(self, main_repository: AssistantRepository):
         self.main_repository = main_repository
 
-    # TODO после реализации специфичных селектов в AssistantRepository, контроллер получит свои методы, а пока
-    # нужны только мапперы
+    async def get_debtors_info(self, building_project_name: Optional[str] = None) -> List[DebtorInfoResponse]:
+        """
+        Получение списка должников с квартирами и данными о долге, отсортированного по убыванию общей задолженности.
+        Группировка и суммирование выполняются в БД.
+
+        :param building_project_name: название жилого комплекса. Его может не быть, тогда поиск среди всех ЖК.
+        :return: список DebtorInfoResponse.
+        """
+        res = await self.main_repository.get_debtors_info(building_project_name)
+        if not res:
+            raise ObjectNotFoundError()
+        return res
+
+    async def get_debt_analytics(self, building_project_name: Optional[str] = None) -> DebtAnalyticsResponse:
+        """
+        Аналитика задолженности по неоплаченным счетам: разрезы по ЖК, домам, этажам, периодам и возрасту долга,
+        перцентили задолженности по квартирам.
+        Счета выбираются одним потоковым запросом по колонкам, агрегация выполняется pandas в пуле потоков, чтобы
+        не блокировать цикл событий.
+
+        :param building_project_name: название ЖК. Его может не быть, тогда аналитика по всем ЖК.
+        :return: дто с аналитикой задолженности.
+        """
+        columns = await self.main_repository.get_unpaid_bills_columns(
+            chunk_size=app_settings.STREAM_CHUNK_SIZE,
+            building_project_name=building_project_name
+        )
+        return await run_in_threadpool(self.aggregate_debt_analytics, columns, date.today())
+
+    @staticmethod
+    def build_bills_frame(columns: Dict[str, List[Any]]) -> pd.DataFrame:
+        """
+        Сборка таблицы неоплаченных счетов из колонок с явными типами: числа сразу в массивы NumPy без вывода
+        типов, строки - в категории, чтобы группировка шла по целочисленным кодам.
+
+        :param columns: колонки неоплаченных счетов с данными квартиры и дома.
+        :return: таблица счетов.
+        """
+        return pd.DataFrame({
+            'id_apartment': np.array(columns['id_apartment'], dtype=np.int64),
+            'bill_size': np.array(columns['bill_size'], dtype=np.float64),
+            'floor': np.array(columns['floor'], dtype=np.int64),
+            'id_building': np.array(columns['id_building'], dtype=np.int64),
+            'bill_period': pd.Categorical(columns['bill_period']),
+            'address': pd.Categorical(columns['address']),
+            'project_name': pd.Categorical(columns['project_name']),
+        })
+
+    @staticmethod
+    def get_debt_age_buckets(bill_periods: pd.Series, today: date) -> pd.Series:
+        """
+        Распределение счетов по группам возраста долга в месяцах от периода начисления до текущего месяца.
+        Разбираются только уникальные периоды (категории колонки), счета получают группу своего периода по коду
+        категории. Периоды в будущем относятся к первой группе, периоды в неизвестном формате - к группе unknown.
+
+        :param bill_periods: категориальная колонка периодов начисления счетов.
+        :param today: текущая дата.
+        :return: упорядоченные категории возраста долга.
+        """
+        periods = pd.to_datetime(
+            bill_periods.cat.categories.astype(str),
+            format=app_settings.BILL_PERIOD_FORMAT,
+            errors='coerce'
+        )
+        age_months = np.maximum((today.year - periods.year) * 12 + (today.month - periods.month), 0)
+
+        edges = sorted(app_settings.DEBT_AGE_BUCKETS_MONTHS)
+        labels = [f'{lower}-{upper}' for lower, upper in zip([0] + edges, edges)] + [f'{edges[-1]}+']
+        periods_buckets = pd.cut(age_months, bins=[0] + edges + [np.inf], labels=labels, right=False)
+        periods_buckets = periods_buckets.add_categories('unknown').fillna('unknown')
+
+        return pd.Series(periods_buckets.take(bill_periods.cat.codes.to_numpy()), index=bill_periods.index)
+
+    @staticmethod
+    def map_debt_groups(groups: pd.DataFrame, sort_by_debt: bool) -> List[DebtGroupSchema]:
+        """
+        Сборка дто групп из таблицы с колонками debt, bills_count и apartments_count.
+
+        :param groups: таблица групп, значение группы - индекс.
+        :param sort_by_debt: сортировать группы по убыванию задолженности, иначе по значению группы.
+        :return: список дто групп.
+        """
+        if sort_by_debt:
+            groups = groups.sort_values('debt', ascending=False, kind='stable')
+
+        return [
+            DebtGroupSchema(key=str(key), debt=debt, bills_count=bills_count, apartments_count=apartments_count)
+            for key, debt, bills_count, apartments_count in zip(
+                groups.index.tolist(),
+                groups['debt'].tolist(),
+                groups['bills_count'].tolist(),
+                groups['apartments_count'].tolist()
+            )
+        ]
+
+    @classmethod
+    def group_apartments_debt(
+            cls,
+            apartments: pd.DataFrame,
+            by: str,
+            sort_by_debt: bool,
+            label: Optional[str] = None
+    ) -> List[DebtGroupSchema]:
+        """
+        Суммирование задолженности по признаку квартиры (ЖК, дом, этаж) из свернутой по квартирам таблицы:
+        кол-во квартир в группе - кол-во строк, без подсчета уникальных значений.
+
+        :param apartments: таблица задолженности по квартирам.
+        :param by: колонка группировки.
+        :param sort_by_debt: сортировать группы по убыванию задолженности, иначе по значению группы.
+        :param label: колонка с названием группы, если группировка идет по идентификатору.
+        :return: список дто групп.
+        """
+        aggregations = dict(
+            debt=('debt', 'sum'),
+            bills_count=('bills_count', 'sum'),
+            apartments_count=('debt', 'size')
+        )
+        if label:
+            aggregations['label'] = (label, 'first')
+
+        groups = apartments.groupby(by, observed=True).agg(**aggregations)
+        if label:
+            groups = groups.set_index('label')
+        return cls.map_debt_groups(groups, sort_by_debt=sort_by_debt)
+
+    @classmethod
+    def group_bills_debt(cls, bills: pd.DataFrame, by: str) -> List[DebtGroupSchema]:
+        """
+        Суммирование задолженности по признаку счета (период, возраст долга), группы упорядочены по значению.
+
+        :param bills: таблица неоплаченных счетов.
+        :param by: колонка группировки.
+        :return: список дто групп.
+        """
+        groups = bills.groupby(by, observed=True).agg(
+            debt=('bill_size', 'sum'),
+            bills_count=('bill_size', 'size'),
+            apartments_count=('id_apartment', 'nunique')
+        )
+        return cls.map_debt_groups(groups, sort_by_debt=False)
+
+    @classmethod
+    def aggregate_debt_analytics(cls, columns: Dict[str, List[Any]], today: date) -> DebtAnalyticsResponse:
+        """
+        Векторная агрегация неоплаченных счетов.
+        Счета один раз сворачиваются по квартирам: из этой таблицы считаются перцентили и разрезы по признакам
+        квартиры, разрезы по периоду и возрасту долга считаются по счетам.
+
+        :param columns: колонки неоплаченных счетов с данными квартиры и дома.
+        :param today: текущая дата для расчета возраста долга.
+        :return: дто с аналитикой задолженности.
+        """
+        bills = cls.build_bills_frame(columns)
+        bills['age_bucket'] = cls.get_debt_age_buckets(bills['bill_period'], today=today)
+        apartments = bills.groupby('id_apartment').agg(
+            debt=('bill_size', 'sum'),
+            bills_count=('bill_size', 'size'),
+            floor=('floor', 'first'),
+            id_building=('id_building', 'first'),
+            address=('address', 'first'),
+            project_name=('project_name', 'first')
+        )
+
+        percentiles = [float(percentile) for percentile in app_settings.DEBT_PERCENTILES]
+        percentiles_debt = np.percentile(apartments['debt'].to_numpy(), percentiles).tolist() if len(apartments) else []
+
+        return DebtAnalyticsResponse(
+            total_debt=float(bills['bill_size'].sum()),
+            bills_count=len(bills),
+            apartments_count=len(apartments),
+            apartment_debt_percentiles=[
+                DebtPercentileSchema(percentile=percentile, debt=debt)
+                for percentile, debt in zip(percentiles, percentiles_debt)
+            ],
+            by_project=cls.group_apartments_debt(apartments, by='project_name', sort_by_debt=True),
+            by_building=cls.group_apartments_debt(apartments, by='id_building', sort_by_debt=True, label='address'),
+            by_floor=cls.group_apartments_debt(apartments, by='floor', sort_by_debt=False),
+            by_period=cls.group_bills_debt(bills, by='bill_period'),
+            by_age_bucket=cls.group_bills_debt(bills, by='age_bucket')
+        )
 
     @staticmethod
     def map_data_to_debtor_message(dto: ApartmentFullResponse) -> DebtorMessageResponse:
@@ -28,14 +222,9 @@ class AssistantController:
         debtor = dto.owner.fullname
         debtor_address = f'{dto.building.address}, кв {dto.apartment_number}'
         common_debt = sum([dto_.bill_size for dto_ in dto.bills])
-        all_periods_data = ''
-        for dto_ in dto.bills:
-            debt_data = f'- {dto_.bill_period}: {dto_.bill_size} \n'
-            if debt_data.startswith('    '):
-                debt_data = f'    {debt_data}'
-            all_periods_data += debt_data
-
-        message = app_settings.DEBTOR_MESSAGE_TEMPLATE.format(
+        all_periods_data = ''.join(f'- {dto_.bill_period}: {dto_.bill_size} \n' for dto_ in dto.bills)
+
+        message = DEBTOR_MESSAGE_TEMPLATE.render(
             debtor,
             debtor_address,
             debtor,
@@ -44,14 +233,59 @@ class AssistantController:
         )
         return DebtorMessageResponse(data=message)
 
+    async def stream_debtor_messages(
+            self,
+            apartments_chunks: AsyncIterable[List[ApartmentFullResponse]]
+    ) -> AsyncGenerator[List[DebtorMessageResponse], None]:
+        """
+        Потоковое формирование уведомлений должникам по порциям квартир с задолженностью.
+
+        :param apartments_chunks: асинхронный итератор порций дто с полными данными о квартирах.
+        :return: асинхронный генератор порций дто с текстами уведомлений.
+        """
+        async for apartments_list in apartments_chunks:
+            yield [self.map_data_to_debtor_message(dto) for dto in apartments_list]
+
+    @staticmethod
+    def get_debtor_letter_file_name(dto: ApartmentFullResponse) -> str:
+        """
+        Имя файла уведомления: лицевой счет уникален только в пределах дома, поэтому перед ним ставится id дома.
+
+        :param dto: дто с полными данными о квартире.
+        :return: имя файла.
+        """
+        building_id = dto.building.id if dto.building is not None else None
+        return f'{building_id}_{dto.utility_account}.txt'
+
+    async def stream_debtor_letter_files(
+            self,
+            apartments_chunks: AsyncIterable[List[ApartmentFullResponse]]
+    ) -> AsyncGenerator[List[Tuple[str, str]], None]:
+        """
+        Потоковое формирование текстовых файлов уведомлений должникам по порциям квартир с задолженностью.
+        Файл называется по id дома и лицевому счету квартиры.
+
+        :param apartments_chunks: асинхронный итератор порций дто с полными данными о квартирах.
+        :return: асинхронный генератор порций пар (имя файла, текст уведомления).
+        """
+        async for apartments_list in apartments_chunks:
+            yield [
+                (self.get_debtor_letter_file_name(dto), self.map_data_to_debtor_message(dto).data)
+                for dto in apartments_list
+            ]
+
     @staticmethod
-    async def send_tg_message_common_debt(dtos: List[DebtorInfoResponse]) -> None:
+    def send_tg_message_common_debt(
+            dtos: List[DebtorInfoResponse],
+            building_project_name: Optional[str] = None
+    ) -> bool:
         """
-        Метод отправки телеграм ботом сообщения в чат руководства о текущем общем состоянии задолженности.
+        Метод постановки в очередь фоновой отправки телеграм ботом сообщения в чат руководства о текущем общем
+        состоянии задолженности. Повторные сводки по тому же ЖК в пределах окна дедупликации не отправляются.
         :param dtos: схемы для расчета общей задолженности
-        :return: None
+        :param building_project_name: название ЖК, по которому рассчитана задолженность
+        :return: поставлено ли сообщение в очередь
         """
-        bot = await get_telegram_bot(app_settings.TG_BOT_TOKEN)
         common_debt = sum(dto.all_aparts_common_debt for dto in dtos)
         message = f'На текущий момент задолженность total:\n{common_debt} руб.'
 
@@ -61,64 +295,8 @@ class AssistantController:
         Таблицу сообщений связать связью с чатами и отдельной связью с ботами.
         Тогда из БД получаем полный шаблон сообщения, куда через ф строку подставить значения.
         """
-        await bot.send_message(chat_id=app_settings.TG_CHAT_ID, message=message)
-
-    @staticmethod
-    def map_debtors_info_response(
-            dtos: List[ApartmentFullResponse],
-            sort_flag: bool = False
-    ) -> List[DebtorInfoResponse]:
-        """
-        Маппинг дто DebtorInfoResponse из дто ApartmentFullResponse.
-
-        :param dtos: дто-шки ApartmentFullResponse
-        :param sort_flag: необходимость сортировки по убыванию суммы.
-        :return: список DebtorInfoResponse.
-        """
-        result = list()
-        person_apart_dict = dict()
-
-        for dto in dtos:  # этап получения уникальных собственников и всех их квартир
-            key_ = f'{dto.owner.fullname}-{dto.owner.phone}-{dto.owner.id}'
-            if person_apart_dict.get(key_):
-                person_apart_dict[key_].append(dto)
-            else:
-                person_apart_dict[key_] = [dto]
-
-        for person_key, full_dtos_list in person_apart_dict.items():
-            common_debt = 0
-            apartments_list = list()
-            for dto in full_dtos_list:
-                common_one_apart_debt = 0
-                bills_list = list()
-
-                for bill_dto in dto.bills:
-                    common_debt += bill_dto.bill_size
-                    common_one_apart_debt += bill_dto.bill_size
-                    bills_list.append(
-                        BillSchema.model_validate(bill_dto)
-                    )
-
-                apartments_list.append(
-                    ApartmentsDebtSchema(
-                        **dto.__dict__,
-                        address=dto.building.address,
-                        project_name=dto.building.project_name,
-                        common_debt=common_one_apart_debt,
-                        bills_not_payed=bills_list
-                    )
-
-                )
-            person_phone_splited = person_key.split('-')
-            result.append(
-                DebtorInfoResponse(
-                    id_owner=int(person_phone_splited[2]),
-                    fullname=person_phone_splited[0],
-                    phone=person_phone_splited[1],
-                    all_aparts_common_debt=common_debt,
-                    apartments_debt=apartments_list
-                )
-            )
-            if sort_flag and result:
-                result.sort(key=lambda model: model.all_aparts_common_debt, reverse=True)
-        return result
+        return telegram_notification_queue.enqueue(
+            chat_id=app_settings.TG_CHAT_ID,
+            message=message,
+            dedup_key=f'common_debt:{building_project_name}'
+        )
@@ -1,13 +1,21 @@
 from abc import ABC
+from typing import AsyncGenerator
 from typing import Generic
+from typing import Iterable
 from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
 from typing import Type
 from typing import TypeVar
 
+from src.cache import invalidate_cache
+from src.enums import CacheNamespaceEnum
 from src.exceptions import ObjectNotFoundError
 from src.logger import AppLogger
 from src.repositories.base_db_repository import BaseDbRepository
 from src.schemas.dtos import BaseSchema
+from src.utils.schema_projection_mapper import SchemaProjectionMapper
 
 MainRepositoryType = TypeVar('MainRepositoryType', bound=BaseDbRepository)  # type: ignore[type-arg]
 ShortSchema = TypeVar('ShortSchema', bound=BaseSchema)
@@ -33,7 +41,9 @@ class BaseController(
             main_repository: MainRepositoryType,
             short_schema_type: Type[ShortSchema],
             full_schema_type: Type[FullSchema],
-            external_schema_type: Type[ExternalSchema]
+            external_schema_type: Type[ExternalSchema],
+            cache_namespace: Optional[CacheNamespaceEnum] = None,
+            dependent_cache_namespaces: Sequence[CacheNamespaceEnum] = ()
     ):
         self._main_repository = main_repository
         self._short_schema_type = short_schema_type
@@ -41,6 +51,21 @@ class BaseController(
         self._external_schema_type = external_schema_type
         self._short_list_response_type = List[short_schema_type]  # type: ignore[valid-type]
         self._external_list_response = List[external_schema_type]  # type: ignore[valid-type]
+        self._cache_namespace = cache_namespace
+        self._dependent_cache_namespaces = tuple(dependent_cache_namespaces)
+        # мапперы схем кешируются на уровне класса маппера, контроллеры создаются на каждый запрос
+        self._full_from_external_mapper = SchemaProjectionMapper.get(
+            source_type=external_schema_type,
+            target_type=full_schema_type
+        )
+        self._external_from_full_mapper = SchemaProjectionMapper.get(
+            source_type=full_schema_type,
+            target_type=external_schema_type
+        )
+        self._short_from_full_mapper = SchemaProjectionMapper.get(
+            source_type=full_schema_type,
+            target_type=short_schema_type
+        )
 
     @property
     def main_repository(self) -> MainRepositoryType:
@@ -66,6 +91,32 @@ class BaseController(
     def external_list_response(self) -> Type[List[ExternalSchema]]:
         return self._external_list_response
 
+    @property
+    def cache_namespace(self) -> Optional[CacheNamespaceEnum]:
+        return self._cache_namespace
+
+    @property
+    def dependent_cache_namespaces(self) -> Tuple[CacheNamespaceEnum, ...]:
+        return self._dependent_cache_namespaces
+
+    async def invalidate_cache(self, objects_ids: Iterable[Optional[int]]) -> None:
+        """
+        Сброс закешированных ответов роутеров после записи объектов в БД.
+        Удаляются ключи измененных объектов и выборок пространства имен контроллера, а также все ключи зависимых
+        пространств имен, в ответы которых эти объекты попадают вложенными данными.
+
+        :param objects_ids: ID измененных объектов.
+        :return: None.
+        """
+        if self._cache_namespace is None:
+            return
+
+        await invalidate_cache(
+            namespace=self._cache_namespace,
+            objects_ids=[object_id for object_id in objects_ids if object_id is not None],
+            dependent_namespaces=self._dependent_cache_namespaces
+        )
+
     async def map_full_from_external(self, external_schema: ExternalSchema) -> FullSchema:
         """
         Сборка полной внутренней схемы из внешней.
@@ -76,7 +127,7 @@ class BaseController(
         """
         AppLogger.info(f'Map full schema from external schema: {external_schema}')
 
-        return self._full_schema_type(**external_schema.model_dump())
+        return self._full_from_external_mapper.map(external_schema)  # type: ignore[no-any-return]
 
     async def map_external_from_full(self, full_schema: FullSchema) -> ExternalSchema:
         """
@@ -88,7 +139,7 @@ class BaseController(
         """
         AppLogger.info(f'Map external schema from full schema: {full_schema}')
 
-        return self._external_schema_type(**full_schema.model_dump())
+        return self._external_from_full_mapper.map(full_schema)  # type: ignore[no-any-return]
 
     async def map_full_list_from_external_list(self, external_schemas_list: List[ExternalSchema]) -> List[FullSchema]:
         """
@@ -98,9 +149,9 @@ class BaseController(
         :param external_schemas_list: Список экземпляров внешних схем.
         :return: Список экземпляров полных внутренних схем.
         """
-        AppLogger.info(f'Map full schemas list from external schemas list: {external_schemas_list}')
+        AppLogger.info(f'Map full schemas list from external schemas list: {len(external_schemas_list)} items')
 
-        return [self._full_schema_type(**external_schema.model_dump()) for external_schema in external_schemas_list]
+        return self._full_from_external_mapper.map_many(external_schemas_list)
 
     async def map_external_list_from_full_list(
             self,
@@ -113,9 +164,9 @@ class BaseController(
         :param full_schemas_list: Список экземпляров полных внутренних схем.
         :return: Список экземпляров внешних схем.
         """
-        AppLogger.info(f'Map external schemas list from full internal schemas list: {full_schemas_list}')
+        AppLogger.info(f'Map external schemas list from full internal schemas list: {len(full_schemas_list)} items')
 
-        return [self._external_schema_type(**full_schema.model_dump()) for full_schema in full_schemas_list]
+        return self._external_from_full_mapper.map_many(full_schemas_list)
 
     async def map_short_list_from_full_list(
             self,
@@ -128,12 +179,9 @@ class BaseController(
         :param full_schemas_list: Список экземпляров полных внутренних схем.
         :return: Список экземпляров кратких схем.
         """
-        AppLogger.info(f'Map short schemas list from full internal schemas list: {full_schemas_list}')
+        AppLogger.info(f'Map short schemas list from full internal schemas list: {len(full_schemas_list)} items')
 
-        return [
-            self._short_schema_type(**full_schema.model_dump())
-            for full_schema in full_schemas_list
-        ]
+        return self._short_from_full_mapper.map_many(full_schemas_list)
 
     async def upsert(self, external_schema: ExternalSchema) -> ExternalSchema:
         """
@@ -144,11 +192,12 @@ class BaseController(
         """
         AppLogger.info(f'Upsert: {external_schema}')
 
-        return await self.map_external_from_full(
-            full_schema=await self.main_repository.upsert(
-                dto=await self.map_full_from_external(external_schema=external_schema)
-            )
+        full_schema = await self.main_repository.upsert(
+            dto=await self.map_full_from_external(external_schema=external_schema)
         )
+        await self.invalidate_cache(objects_ids=[getattr(full_schema, 'id', None)])
+
+        return await self.map_external_from_full(full_schema=full_schema)
 
     async def upsert_many(self, external_schemas_list: List[ExternalSchema]) -> List[ExternalSchema]:
         """
@@ -157,26 +206,29 @@ class BaseController(
         :param external_schemas_list: Список DTO для создания/обновления объектов.
         :return: Список DTO с обновленными данными.
         """
-        AppLogger.info(f'Upsert many: {external_schemas_list}')
+        AppLogger.info(f'Upsert many: {len(external_schemas_list)} items')
 
-        return await self.map_external_list_from_full_list(  # type: ignore[arg-type]
-            full_schemas_list=await self.main_repository.upsert_many(
-                dto_list=await self.map_full_list_from_external_list(
-                    external_schemas_list=external_schemas_list
-                )
+        full_schemas_list = await self.main_repository.upsert_many(
+            dto_list=await self.map_full_list_from_external_list(
+                external_schemas_list=external_schemas_list
             )
         )
+        await self.invalidate_cache(objects_ids=[getattr(full_schema, 'id', None) for full_schema in full_schemas_list])
+
+        return await self.map_external_list_from_full_list(  # type: ignore[arg-type]
+            full_schemas_list=full_schemas_list
+        )
 
     async def get_one_by_id(self, object_id: int) -> ExternalSchema:
         """
-        Выборка одного DTO объекта из БД через метод сессии.
+        Выборка одного DTO объекта из БД. Объект запоминается репозиторием до конца запроса.
 
         :param object_id: ID объекта.
         :return: DTO объекта.
         """
         AppLogger.info(f'Get one object: {object_id}')
 
-        full_schema = await self.main_repository.get_one_full_by_id(object_id=object_id)
+        full_schema = await self.main_repository.load_one(object_id=object_id)
         if full_schema:
             return await self.map_external_from_full(full_schema=full_schema)
 
@@ -197,27 +249,68 @@ class BaseController(
 
         raise ObjectNotFoundError()
 
-    async def get_all_short(self) -> List[ShortSchema]:
+    async def get_many_by_ids(self, objects_ids: List[int]) -> List[ExternalSchema]:
+        """
+        Выборка DTO объектов из БД по списку ID одним запросом. Ненайденные объекты пропускаются.
+
+        :param objects_ids: Список ID объектов.
+        :return: Список DTO объектов в порядке переданных ID.
+        """
+        AppLogger.info(f'Get many objects: {objects_ids}')
+
+        full_schemas_list = await self.main_repository.load_many(objects_ids=objects_ids)
+
+        return await self.map_external_list_from_full_list(
+            full_schemas_list=[full_schema for full_schema in full_schemas_list if full_schema is not None]
+        )
+
+    async def get_all_short(self, after_id: Optional[int] = None, limit: Optional[int] = None) -> List[ShortSchema]:
         """
         Выборка всех DTO объектов из БД через SELECT.
 
+        :param after_id: ID последнего объекта предыдущей страницы.
+        :param limit: Максимальное кол-во объектов на странице.
         :return: Список кратких DTO объектов.
         """
         AppLogger.info('Select all objects')
-        models_dtos = await self.main_repository.select_all_short()
+        models_dtos = await self.main_repository.select_all_short(after_id=after_id, limit=limit)
         return await self.map_short_list_from_full_list(models_dtos)
 
-    async def get_all_full(self) -> List[ExternalSchema]:
+    async def get_all_full(self, after_id: Optional[int] = None, limit: Optional[int] = None) -> List[ExternalSchema]:
         """
         Выборка всех DTO объектов из БД через SELECT.
 
+        :param after_id: ID последнего объекта предыдущей страницы.
+        :param limit: Максимальное кол-во объектов на странице.
         :return: Список DTO объектов.
         """
         AppLogger.info('Select all objects')
-        models_dtos = await self.main_repository.select_all_full()
+        models_dtos = await self.main_repository.select_all_full(after_id=after_id, limit=limit)
 
         return await self.map_external_list_from_full_list(models_dtos)
 
+    async def stream_all_short(self, chunk_size: int) -> AsyncGenerator[List[ShortSchema], None]:
+        """
+        Потоковая выборка всех кратких DTO объектов из БД порциями.
+
+        :param chunk_size: Кол-во объектов в одной порции.
+        :return: Асинхронный генератор списков кратких DTO объектов.
+        """
+        AppLogger.info('Stream all objects')
+        async for models_dtos in self.main_repository.stream_all_short(chunk_size=chunk_size):
+            yield await self.map_short_list_from_full_list(models_dtos)
+
+    async def stream_all_full(self, chunk_size: int) -> AsyncGenerator[List[ExternalSchema], None]:
+        """
+        Потоковая выборка всех DTO объектов из БД порциями.
+
+        :param chunk_size: Кол-во объектов в одной порции.
+        :return: Асинхронный генератор списков DTO объектов.
+        """
+        AppLogger.info('Stream all objects')
+        async for models_dtos in self.main_repository.stream_all_full(chunk_size=chunk_size):
+            yield await self.map_external_list_from_full_list(models_dtos)
+
     async def delete(
             self,
             object_id: int
@@ -232,6 +325,7 @@ class BaseController(
         AppLogger.info(f'Delete object: {object_id}')
 
         await self.main_repository.delete(object_id=object_id)
+        await self.invalidate_cache(objects_ids=[object_id])
 
         return dict()
 
@@ -249,5 +343,6 @@ class BaseController(
         AppLogger.info(f'Delete many objects: {objects_ids_list}')
 
         await self.main_repository.delete_many(objects_ids_list=objects_ids_list)
+        await self.invalidate_cache(objects_ids=objects_ids_list)
 
         return dict()
@@ -1,3 +1,4 @@
+from src.enums import CacheNamespaceEnum
 from src.repositories import BillRepository
 from src.schemas.dtos import BillDto
 from .base_controller import BaseController
@@ -17,4 +18,6 @@ class BillController(
             short_schema_type=BillDto,
             full_schema_type=BillDto,
             external_schema_type=BillDto,
+            cache_namespace=CacheNamespaceEnum.BILL,
+            dependent_cache_namespaces=(CacheNamespaceEnum.APARTMENTS, CacheNamespaceEnum.ASSISTANT),
         )
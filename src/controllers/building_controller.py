@@ -1,5 +1,7 @@
 from typing import List
+from typing import Optional
 
+from src.enums import CacheNamespaceEnum
 from src.logger import AppLogger
 from src.repositories import BuildingRepository
 from src.schemas.dtos import BuildingDto
@@ -21,16 +23,25 @@ class BuildingController(
             short_schema_type=BuildingDto,
             full_schema_type=BuildingFullDto,
             external_schema_type=BuildingDto,
+            cache_namespace=CacheNamespaceEnum.BUILDING,
+            dependent_cache_namespaces=(CacheNamespaceEnum.APARTMENTS, CacheNamespaceEnum.ASSISTANT),
         )
 
-    async def get_all_full(self) -> List[BuildingFullDto]:
+    async def get_all_full(
+            self,
+            after_id: Optional[int] = None,
+            limit: Optional[int] = None
+    ) -> List[BuildingFullDto]:
         """
         Выборка всех DTO объектов из БД через SELECT.
         Метод переопределен, т.к. внешняя схема отличается от полной схемы, а вернуть нужно полную.
+        Репозиторий уже возвращает полные DTO, поэтому список отдается без преобразования.
 
+        :param after_id: ID последнего объекта предыдущей страницы.
+        :param limit: Максимальное кол-во объектов на странице.
         :return: Список DTO объектов.
         """
         AppLogger.info('Select all objects')
-        models_sequence = await self.main_repository.select_all_full()
+        models_sequence = await self.main_repository.select_all_full(after_id=after_id, limit=limit)
 
-        return [self._full_schema_type.model_validate(model) for model in models_sequence]
+        return models_sequence
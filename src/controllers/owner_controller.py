@@ -1,5 +1,6 @@
 from typing import List
 
+from src.enums import CacheNamespaceEnum
 from src.logger import AppLogger
 from src.repositories import OwnerRepository
 from src.schemas.dtos import OwnerDto
@@ -21,6 +22,8 @@ class OwnerController(
             short_schema_type=OwnerDto,
             full_schema_type=OwnerFullDto,
             external_schema_type=OwnerDto,
+            cache_namespace=CacheNamespaceEnum.OWNER,
+            dependent_cache_namespaces=(CacheNamespaceEnum.APARTMENTS, CacheNamespaceEnum.ASSISTANT),
         )
 
     async def map_full_from_external(self, external_schema: OwnerFullDto) -> OwnerDto:
@@ -51,7 +54,7 @@ class OwnerController(
         :param external_schemas_list: Список экземпляров внешних схем.
         :return: Список экземпляров полных внутренних схем.
         """
-        AppLogger.info(f'Map full schemas list from external schemas list: {external_schemas_list}')
+        AppLogger.info(f'Map full schemas list from external schemas list: {len(external_schemas_list)} items')
 
         return [OwnerDto.model_validate(dto) for dto in external_schemas_list]
 
@@ -66,6 +69,6 @@ class OwnerController(
         :param full_schemas_list: Список экземпляров полных внутренних схем.
         :return: Список экземпляров полных внутренних схем.
         """
-        AppLogger.info(f'Map external schemas list from full internal schemas list: {full_schemas_list}')
+        AppLogger.info(f'Map external schemas list from full internal schemas list: {len(full_schemas_list)} items')
 
         return full_schemas_list
@@ -1,8 +1,13 @@
 from typing import Callable, AsyncGenerator
 
+from sqlalchemy import URL
+from sqlalchemy import make_url
 from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
 from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.ext.asyncio import AsyncEngine
 from src.logger import AppLogger
+from .metered_pool import MeteredAsyncAdaptedQueuePool
+from .statement_cache_metrics import statement_cache_metrics
 
 from settings import app_settings
 
@@ -13,6 +18,8 @@ def get_sqlalchemy_async_session_generator(
     async def sqlalchemy_async_session_generator() -> AsyncGenerator[AsyncSession, None]:
         """
         Возвращает объект AsyncSession. При успешном выполнении всех запросов фиксирует изменения в БД.
+        FastAPI кеширует результат зависимости в пределах запроса, поэтому сессия одна на HTTP запрос и общая для
+        всех репозиториев и контроллеров, от которых зависит маршрут.
         При ошибке отменяет все изменения в БД.
         В конце закрывает сессию.
 
@@ -43,7 +50,42 @@ def get_sqlalchemy_async_session_generator(
     return sqlalchemy_async_session_generator
 
 
+def create_app_async_engine(sql_dsn: str) -> AsyncEngine:
+    """
+    Создание движка БД с настройками пула соединений из AppSettings и сбором метрик кеша
+    скомпилированных SQL выражений.
+    Для asyncpg задаются размеры кеша подготовленных выражений SQLAlchemy и самого asyncpg
+    (0 отключает кеш, что нужно при работе через pgbouncer в режиме transaction).
+
+    :param sql_dsn: Строка подключения к БД.
+    :return: AsyncEngine.
+    """
+    sql_url: URL = make_url(sql_dsn)
+    connect_args = dict()
+    if sql_url.get_driver_name() == 'asyncpg':
+        sql_url = sql_url.update_query_dict(
+            {'prepared_statement_cache_size': str(app_settings.DB_STATEMENT_CACHE_SIZE)}
+        )
+        connect_args['statement_cache_size'] = app_settings.DB_STATEMENT_CACHE_SIZE
+
+    async_engine = create_async_engine(
+        sql_url,
+        echo=app_settings.IS_DEBUG,
+        query_cache_size=app_settings.DB_QUERY_CACHE_SIZE,
+        poolclass=MeteredAsyncAdaptedQueuePool,
+        pool_size=app_settings.DB_POOL_SIZE,
+        max_overflow=app_settings.DB_MAX_OVERFLOW,
+        pool_timeout=app_settings.DB_POOL_TIMEOUT,
+        pool_recycle=app_settings.DB_POOL_RECYCLE,
+        pool_pre_ping=app_settings.DB_POOL_PRE_PING,
+        connect_args=connect_args,
+    )
+    statement_cache_metrics.attach(async_engine=async_engine)
+
+    return async_engine
+
+
 # Для зависимостей подключения к БД
-engine = create_async_engine(app_settings.SQL_DSN, echo=app_settings.IS_DEBUG)
+engine = create_app_async_engine(app_settings.SQL_DSN)
 async_session_factory = async_sessionmaker(bind=engine, expire_on_commit=False)
 sqlalchemy_async_session_generator = get_sqlalchemy_async_session_generator(async_session_factory)
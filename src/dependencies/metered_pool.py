@@ -0,0 +1,82 @@
+from threading import Lock
+from time import perf_counter
+
+from sqlalchemy.exc import TimeoutError as SqlAlchemyTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.pool import ConnectionPoolEntry
+
+from src.logger import AppLogger
+from src.schemas.responses import DbPoolStatsResponse
+
+
+class DbPoolMetrics:
+    """
+    Счетчики ожидания соединений из пула: кол-во выдач, суммарное и максимальное время ожидания, таймауты.
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._acquired = 0
+        self._timeouts = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def add_acquired(self, wait: float) -> None:
+        with self._lock:
+            self._acquired += 1
+            self._total_wait += wait
+            self._max_wait = max(self._max_wait, wait)
+
+    def add_timeout(self) -> None:
+        with self._lock:
+            self._timeouts += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._acquired = 0
+            self._timeouts = 0
+            self._total_wait = 0.0
+            self._max_wait = 0.0
+
+    def get_stats(self, pool: AsyncAdaptedQueuePool) -> DbPoolStatsResponse:
+        """
+        Снимок состояния пула и счетчиков ожидания.
+
+        :param pool: Пул соединений движка.
+        :return: Метрики пула.
+        """
+        with self._lock:
+            return DbPoolStatsResponse(
+                pool_size=pool.size(),
+                max_overflow=pool._max_overflow,
+                checked_out=pool.checkedout(),
+                checked_in=pool.checkedin(),
+                overflow=pool.overflow(),
+                acquired=self._acquired,
+                timeouts=self._timeouts,
+                avg_wait_ms=self._total_wait / self._acquired * 1000 if self._acquired else 0.0,
+                max_wait_ms=self._max_wait * 1000,
+            )
+
+
+class MeteredAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Пул соединений с замером времени ожидания свободного соединения.
+    События пула SQLAlchemy срабатывают уже после выдачи соединения, поэтому замер делается вокруг _do_get.
+    Метрики хранятся на уровне класса: пул пересоздается при dispose без передачи дополнительных аргументов.
+    """
+
+    metrics = DbPoolMetrics()
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        started_at = perf_counter()
+        try:
+            connection = super()._do_get()
+        except SqlAlchemyTimeoutError:
+            self.metrics.add_timeout()
+            AppLogger.warning(f'DB pool timeout: {self.metrics.get_stats(self).model_dump()}')
+
+            raise
+
+        self.metrics.add_acquired(wait=perf_counter() - started_at)
+        return connection
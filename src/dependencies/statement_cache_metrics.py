@@ -0,0 +1,82 @@
+from threading import Lock
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.default import CacheStats
+from sqlalchemy.engine.default import DefaultExecutionContext
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from settings import app_settings
+from src.schemas.responses import StatementCacheStatsResponse
+
+
+class StatementCacheMetrics:
+    """
+    Счетчики попаданий в кеш скомпилированных SQL выражений SQLAlchemy.
+    Результат поиска в кеше известен контексту выполнения, поэтому счетчики обновляются в событии
+    before_cursor_execute движка.
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+        self._not_cached = 0
+
+    def attach(self, async_engine: AsyncEngine) -> None:
+        """
+        Подписка на выполнение запросов движка.
+
+        :param async_engine: Асинхронный движок БД.
+        :return: None.
+        """
+        event.listen(async_engine.sync_engine, 'before_cursor_execute', self.on_before_cursor_execute)
+
+    def on_before_cursor_execute(
+            self,
+            conn: Connection,
+            cursor: Any,
+            statement: str,
+            parameters: Any,
+            context: DefaultExecutionContext,
+            executemany: bool
+    ) -> None:
+        cache_hit = getattr(context, 'cache_hit', None)
+        with self._lock:
+            if cache_hit is CacheStats.CACHE_HIT:
+                self._hits += 1
+            elif cache_hit is CacheStats.CACHE_MISS:
+                self._misses += 1
+            else:
+                # выражения без ключа кеша, строковый SQL и т.п.
+                self._not_cached += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._hits = 0
+            self._misses = 0
+            self._not_cached = 0
+
+    def get_stats(self, sync_engine: Engine) -> StatementCacheStatsResponse:
+        """
+        Снимок состояния кеша скомпилированных выражений и счетчиков попаданий.
+
+        :param sync_engine: Синхронный движок, лежащий в основе асинхронного.
+        :return: Метрики кеша.
+        """
+        compiled_cache = sync_engine._compiled_cache
+        with self._lock:
+            cached = self._hits + self._misses
+            return StatementCacheStatsResponse(
+                cache_size=len(compiled_cache) if compiled_cache is not None else 0,
+                cache_capacity=app_settings.DB_QUERY_CACHE_SIZE,
+                hits=self._hits,
+                misses=self._misses,
+                not_cached=self._not_cached,
+                hit_rate=self._hits / cached if cached else 0.0,
+            )
+
+
+statement_cache_metrics = StatementCacheMetrics()
@@ -1 +1,3 @@
 from .base_message_enum import BaseMessageEnum
+from .cache_namespace_enum import CacheNamespaceEnum
+from .debtor_letters_format_enum import DebtorLettersFormatEnum
@@ -9,4 +9,6 @@ class BaseMessageEnum(Enum):
     OBJECT_NOT_FOUND_ERROR_MESSAGE = 'object_not_found_error'
     SQLALCHEMY_INTEGRITY_ERROR_MESSAGE = 'sqlalchemy_integrity_error'
     VALIDATION_ERROR_MESSAGE = 'validation_error'
+    DUPLICATE_IDS_ERROR_MESSAGE = 'duplicate_ids_error'
     USER_NOT_FOUND = 'there is no user with such login'
+    PASSWORD_HASHING_OVERLOAD = 'password hashing queue is full, try again later'
@@ -0,0 +1,13 @@
+from enum import Enum
+
+
+class CacheNamespaceEnum(Enum):
+    """
+    Пространства имен ключей кеша ответов, по одному на роутер.
+    """
+
+    APARTMENTS = 'apartments'
+    ASSISTANT = 'assistant'
+    BILL = 'bill'
+    BUILDING = 'building'
+    OWNER = 'owner'
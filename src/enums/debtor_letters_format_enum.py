@@ -0,0 +1,10 @@
+from enum import Enum
+
+
+class DebtorLettersFormatEnum(str, Enum):
+    """
+    Форматы потоковой выгрузки уведомлений должникам.
+    """
+
+    NDJSON = 'ndjson'
+    ZIP = 'zip'
@@ -1,5 +1,7 @@
 from .base_response_error import BaseResponseError
 from .base_response_with_data import BaseResponseErrorWithData
+from .duplicate_ids_error import DuplicateIdsError
 from .object_not_found_error import ObjectNotFoundError
+from .password_hashing_overload_error import PasswordHashingOverloadError
 from .sql_alchemy_error import SqlAlchemyError
 from .user_not_found_error import UserNotFoundError
@@ -1,18 +1,21 @@
 from enum import Enum
-from src.schemas.dtos import BaseSchema
+from typing import TYPE_CHECKING
 
 from .base_response_error import BaseResponseError
 
+if TYPE_CHECKING:  # схемы импортируют это исключение в валидаторах, импорт в рантайме даст цикл
+    from src.schemas.dtos import BaseSchema
+
 
 class BaseResponseErrorWithData(BaseResponseError):
     """
     Базовый класс ошибок с данными.
     """
 
-    def __init__(self, message: Enum, code: int, data: BaseSchema):
+    def __init__(self, message: Enum, code: int, data: 'BaseSchema'):
         super().__init__(message=message, code=code)
         self._data = data
 
     @property
-    def data(self) -> BaseSchema:
+    def data(self) -> 'BaseSchema':
         return self._data
@@ -0,0 +1,13 @@
+from http import HTTPStatus
+
+from src.enums import BaseMessageEnum
+from .base_response_error import BaseResponseError
+
+
+class DuplicateIdsError(BaseResponseError):
+    """
+    Ошибка повторяющихся id объектов в одном запросе массового создания/обновления.
+    """
+
+    def __init__(self):
+        super().__init__(message=BaseMessageEnum.DUPLICATE_IDS_ERROR_MESSAGE, code=HTTPStatus.BAD_REQUEST)
@@ -0,0 +1,13 @@
+from http import HTTPStatus
+
+from src.enums import BaseMessageEnum
+from .base_response_error import BaseResponseError
+
+
+class PasswordHashingOverloadError(BaseResponseError):
+    """
+    Ошибка, когда очередь задач хеширования паролей переполнена.
+    """
+
+    def __init__(self):
+        super().__init__(message=BaseMessageEnum.PASSWORD_HASHING_OVERLOAD, code=HTTPStatus.SERVICE_UNAVAILABLE)
@@ -67,6 +67,16 @@ class AppLogger:
             cls.app_logger.setLevel(DEBUG)
         getLogger('sqlalchemy.engine.Engine').disabled = not is_debug
 
+    @classmethod
+    def is_debug_enabled(cls) -> bool:
+        """
+        Проверка, будут ли записаны отладочные сообщения.
+        Нужна, чтобы не формировать дорогие сообщения (например, текст SQL выражения), которые не попадут в лог.
+
+        :return: Логическое значение.
+        """
+        return cls.app_logger is not None and cls.app_logger.isEnabledFor(DEBUG)
+
     @classmethod
     def debug(cls, message: str) -> None:
         """
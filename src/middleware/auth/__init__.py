@@ -1,2 +1,5 @@
+from .api_key_store import ApiKeyStore
 from .auth_middleware import AuthMiddleware
+from .credentials_verifier import CredentialsVerifier
 from .depends import get_user_repository
+from .password_hashing_service import PasswordHashingService
@@ -0,0 +1,11 @@
+from datetime import datetime
+
+from src.schemas.dtos import BaseSchema
+
+
+class ApiKeyDto(BaseSchema):
+    id: int
+    name: str
+    key_hash: str
+    is_active: bool
+    updated_at: datetime
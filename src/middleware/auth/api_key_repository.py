@@ -0,0 +1,29 @@
+from datetime import datetime
+from typing import List
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.models import ApiKey
+from .api_key_dto import ApiKeyDto
+
+
+class ApiKeyRepository:
+    """
+    Репозиторий для загрузки api ключей.
+    """
+    def __init__(self, async_db_session: AsyncSession):
+        self.async_db_session = async_db_session
+
+    async def get_api_keys(self, updated_since: Optional[datetime] = None) -> List[ApiKeyDto]:
+        """
+        Выборка api ключей, включая отозванные.
+
+        :param updated_since: Время, начиная с которого выбираются измененные ключи, None - все ключи.
+        :return: Список DTO ключей.
+        """
+        stmt = select(ApiKey)
+        if updated_since is not None:
+            stmt = stmt.where(ApiKey.updated_at >= updated_since)
+        models = await self.async_db_session.scalars(stmt)
+        return [ApiKeyDto.model_validate(model) for model in models]
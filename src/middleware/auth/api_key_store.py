@@ -0,0 +1,161 @@
+import asyncio
+from datetime import datetime
+from datetime import timedelta
+from time import monotonic
+from typing import Any
+from typing import Dict
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from src.logger import AppLogger
+from .api_key_repository import ApiKeyRepository
+from .common import make_api_key_hash
+
+
+class ApiKeyStore:
+    """
+    Хранилище хешей активных api ключей в памяти процесса.
+    Проверка ключа - SHA-256 и поиск в словаре, без обращения к БД.
+    Ключи загружаются при старте приложения, затем фоновая задача раз в refresh_interval догружает ключи,
+    измененные с прошлого опроса, и раз в full_reload_interval перечитывает таблицу целиком, чтобы удалить
+    из памяти ключи, строки которых удалены из БД.
+    """
+
+    def __init__(
+            self,
+            async_session_factory: async_sessionmaker[AsyncSession],
+            refresh_interval: float,
+            full_reload_interval: float
+    ):
+        """
+        :param async_session_factory: Фабрика асинхронных сессий SQLAlchemy.
+        :param refresh_interval: Период опроса измененных ключей в секундах.
+        :param full_reload_interval: Период полной перезагрузки ключей в секундах.
+        """
+        self._async_session_factory = async_session_factory
+        self._refresh_interval = refresh_interval
+        self._full_reload_interval = full_reload_interval
+        self._names_by_hash: Dict[str, str] = dict()
+        # хеш по id строки нужен, чтобы при замене ключа в строке удалить из памяти прежний хеш
+        self._hashes_by_id: Dict[int, str] = dict()
+        self._updated_since: Optional[datetime] = None
+        self._full_reloaded_at = 0.0
+        self._task: Optional[asyncio.Task[None]] = None
+
+    def __len__(self) -> int:
+        return len(self._names_by_hash)
+
+    def verify(self, api_key: str) -> Optional[str]:
+        """
+        Проверка api ключа.
+
+        :param api_key: Ключ из заголовка запроса.
+        :return: Название сервиса-клиента или None, если ключ не найден или отозван.
+        """
+        return self._names_by_hash.get(make_api_key_hash(api_key))
+
+    async def reload(self) -> None:
+        """
+        Полная перезагрузка ключей из БД.
+
+        :return: None.
+        """
+        async with self._async_session_factory() as async_db_session:
+            api_keys = await ApiKeyRepository(async_db_session=async_db_session).get_api_keys()
+
+        active_api_keys = [api_key for api_key in api_keys if api_key.is_active]
+        self._names_by_hash = {api_key.key_hash: api_key.name for api_key in active_api_keys}
+        self._hashes_by_id = {api_key.id: api_key.key_hash for api_key in active_api_keys}
+        self._updated_since = max((api_key.updated_at for api_key in api_keys), default=None)
+        self._full_reloaded_at = monotonic()
+        AppLogger.info(f'Api keys are loaded: {len(self)} active')
+
+    async def refresh(self) -> None:
+        """
+        Догрузка ключей, измененных с прошлого опроса.
+        Окно опроса захватывает и предыдущий период: updated_at выставляется временем начала транзакции,
+        поэтому строка долгой транзакции может стать видна позже, чем более новые строки.
+
+        :return: None.
+        """
+        if self._updated_since is None or monotonic() - self._full_reloaded_at >= self._full_reload_interval:
+            await self.reload()
+            return
+
+        async with self._async_session_factory() as async_db_session:
+            api_keys = await ApiKeyRepository(async_db_session=async_db_session).get_api_keys(
+                updated_since=self._updated_since - timedelta(seconds=self._refresh_interval)
+            )
+
+        for api_key in api_keys:
+            self.forget(object_id=api_key.id)
+            if api_key.is_active:
+                self._names_by_hash[api_key.key_hash] = api_key.name
+                self._hashes_by_id[api_key.id] = api_key.key_hash
+            self._updated_since = max(self._updated_since, api_key.updated_at)
+
+    def forget(self, object_id: int) -> None:
+        """
+        Удаление ключа строки из памяти.
+
+        :param object_id: ID строки ключа.
+        :return: None.
+        """
+        key_hash = self._hashes_by_id.pop(object_id, None)
+        if key_hash is not None:
+            self._names_by_hash.pop(key_hash, None)
+
+    async def poll(self) -> None:
+        """
+        Цикл фонового опроса БД до остановки.
+
+        :return: None.
+        """
+        while True:
+            await asyncio.sleep(self._refresh_interval)
+            try:
+                await self.refresh()
+            except Exception as exc:
+                AppLogger.error(f'Api keys refresh error: {exc}')
+
+    async def start(self) -> None:
+        """
+        Загрузка ключей и запуск фонового опроса при старте приложения.
+        Если БД недоступна, приложение стартует, а ключи загрузятся при следующем опросе.
+
+        :return: None.
+        """
+        try:
+            await self.reload()
+        except Exception as exc:
+            AppLogger.error(f'Api keys are not loaded: {exc}')
+        if self._task is None:
+            self._task = asyncio.create_task(self.poll())
+
+    async def stop(self) -> None:
+        """
+        Остановка фонового опроса при остановке приложения.
+
+        :return: None.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def on_api_key_changed(self, _mapper: Any, _connection: Any, target: Any) -> None:
+        """
+        Обработчик событий ORM изменения/удаления строки таблицы api_keys.
+        Ключ сразу удаляется из памяти, чтобы отзыв через ORM в этом процессе применялся без ожидания опроса.
+        Если ключ остался активным, он вернется при следующем опросе.
+
+        :param _mapper: Маппер модели.
+        :param _connection: Подключение к БД.
+        :param target: Измененная модель ключа.
+        :return: None.
+        """
+        AppLogger.info(f'Api key row changed: {target.name}')
+
+        self.forget(object_id=target.id)
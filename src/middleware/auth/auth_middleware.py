@@ -1,58 +1,89 @@
 from base64 import b64decode
+from typing import Optional
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.middleware.base import RequestResponseEndpoint
-from starlette.requests import Request
-from starlette.responses import JSONResponse
+from starlette.datastructures import Headers
 from starlette.responses import Response
 from starlette.status import HTTP_401_UNAUTHORIZED
 from starlette.types import ASGIApp
+from starlette.types import Receive
+from starlette.types import Scope
+from starlette.types import Send
 
 from settings import app_settings
-from .common import is_the_same_passwords
-from .user_repository import UserRepository
+from src.exceptions import BaseResponseError
+from src.utils.json_response_mapper import JsonResponseMapper
+from src.utils.orjson_response import ORJSONResponse
+from .api_key_store import ApiKeyStore
+from .credentials_verifier import CredentialsVerifier
 
 
-class AuthMiddleware(BaseHTTPMiddleware):
+class AuthMiddleware:
     """
     Класс для api и basic авторизация в сервисе.
+    Реализован как ASGI middleware без BaseHTTPMiddleware: запрос передается дальше без обертки потоков
+    запроса и ответа, а пути без авторизации пропускаются до разбора заголовков.
     """
-    def __init__(self, app: ASGIApp, user_repository: UserRepository):
-        super().__init__(app)
-        self.user_repository = user_repository
+    def __init__(self, app: ASGIApp, credentials_verifier: CredentialsVerifier, api_key_store: ApiKeyStore):
+        self.app = app
+        self.credentials_verifier = credentials_verifier
+        self.api_key_store = api_key_store
+        self._paths_not_require_auth = frozenset(app_settings.PATH_NOT_REQUIRE_AUTH)
+        self._path_prefixes_not_require_auth = tuple(app_settings.PATH_PREFIXES_NOT_REQUIRE_AUTH)
 
+    def is_auth_required(self, path: str) -> bool:
+        """
+        Проверка, требует ли путь авторизации.
 
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response | JSONResponse:  # noqa,
-        # type: ignore
+        :param path: Путь запроса.
+        :return: Логическое значение.
         """
-        Проверка логина и пароля.
+        return path not in self._paths_not_require_auth and not path.startswith(self._path_prefixes_not_require_auth)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http' or not self.is_auth_required(scope['path']):
+            await self.app(scope, receive, send)
+            return
+
+        error_response = await self.authenticate(headers=Headers(scope=scope))
+        if error_response is None:
+            await self.app(scope, receive, send)
+        else:
+            await error_response(scope, receive, send)
 
-        :param request: Входящий запрос.
-        :param call_next: Следующий в цепочке вызовов метод.
-        :return: Ответ на запрос.
+    async def authenticate(self, headers: Headers) -> Optional[Response]:
         """
-        if request.url.path not in app_settings.PATH_NOT_REQUIRE_AUTH:
+        Проверка api ключа либо логина и пароля.
+        Api ключ проверяется по хранилищу в памяти, БД запрашивается только для basic авторизации и только
+        при промахе кеша учетных данных.
 
-            api_key_header = request.headers.get('example_name_of_api_key')
-            auth_header = request.headers.get('authorization')
+        :param headers: Заголовки запроса.
+        :return: None при успешной проверке, иначе ответ с ошибкой.
+        """
+        api_key_header = headers.get(app_settings.API_KEY_HEADER)
+        auth_header = headers.get('authorization')
 
-            if api_key_header:
-                if api_key_header == 'NEED_TO_GET_API_KEY_FROM_DB':
-                    return await call_next(request)
+        if api_key_header:
+            if self.api_key_store.verify(api_key=api_key_header) is not None:
+                return None
 
-            elif auth_header:
+        elif auth_header:
+            try:
                 scheme, credentials = auth_header.split()
                 if scheme.lower() == 'basic':
                     decoded = b64decode(credentials).decode('ascii')
-                    username, password = decoded.split(':')
-
-                    user_dto = await self.user_repository.get_user_by_login(username)
-                    if user_dto and user_dto.hashed_password:
-                        if is_the_same_passwords(password, user_dto.hashed_password):
-                            return await call_next(request)
-
-            content = {'detail': 'Authorization error'}
-            response = JSONResponse(content=content, status_code=HTTP_401_UNAUTHORIZED)
-            response.headers['WWW-Authenticate'] = 'Basic'  # оставлено для сваггера
-            return response
-        return await call_next(request)
+                    username, password = decoded.split(':', 1)
+                    if await self.credentials_verifier.verify(login=username, password=password):
+                        return None
+            except BaseResponseError as exc:
+                return await JsonResponseMapper.get_from_base_response_error(
+                    exception=exc,
+                    message=exc.message.value
+                )
+            except ValueError:
+                # неверный формат заголовка, base64 или пары логин:пароль
+                pass
+
+        content = {'detail': 'Authorization error'}
+        response = ORJSONResponse(content=content, status_code=HTTP_401_UNAUTHORIZED)
+        response.headers['WWW-Authenticate'] = 'Basic'  # оставлено для сваггера
+        return response
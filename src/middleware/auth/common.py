@@ -1,13 +1,16 @@
+from hashlib import sha256
+
 from bcrypt import hashpw, gensalt, checkpw
 
 
-def make_hashed_pwd(password: str) -> str:
+def make_hashed_pwd(password: str, rounds: int = 12) -> str:
     """
     Метод для хеширования пароля
     :param password: Исходный пароль
+    :param rounds: Стоимость bcrypt (логарифм кол-ва раундов)
     :return: Хешированный пароль
     """
-    return hashpw(password.encode('utf-8'), gensalt()).decode(encoding='utf-8')
+    return hashpw(password.encode('utf-8'), gensalt(rounds=rounds)).decode(encoding='utf-8')
 
 
 def is_the_same_passwords(password: str, hashed: str) -> bool:
@@ -18,3 +21,13 @@ def is_the_same_passwords(password: str, hashed: str) -> bool:
     :return: Верно ли указан пароль
     """
     return checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+
+
+def make_api_key_hash(api_key: str) -> str:
+    """
+    Хеширование api ключа.
+    Ключи генерируются случайными и длинными, поэтому медленный bcrypt не нужен, достаточно SHA-256.
+    :param api_key: Исходный ключ
+    :return: Хеш ключа в hex
+    """
+    return sha256(api_key.encode('utf-8')).hexdigest()
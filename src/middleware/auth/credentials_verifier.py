@@ -0,0 +1,93 @@
+from hashlib import sha256
+from hmac import new as new_hmac
+from secrets import token_bytes
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from src.logger import AppLogger
+from src.utils.ttl_lru_cache import TtlLruCache
+from .password_hashing_service import PasswordHashingService
+from .user_repository import UserRepository
+
+
+class CredentialsVerifier:
+    """
+    Проверка логина и пароля пользователя с кешированием успешных проверок.
+    Повторный запрос с теми же учетными данными не обращается ни к БД, ни к bcrypt.
+    """
+
+    def __init__(
+            self,
+            async_session_factory: async_sessionmaker[AsyncSession],
+            password_hashing_service: PasswordHashingService,
+            cache_size: int,
+            cache_ttl: float
+    ):
+        """
+        :param async_session_factory: Фабрика асинхронных сессий SQLAlchemy, сессия открывается только при промахе кеша.
+        :param password_hashing_service: Сервис проверки паролей bcrypt в пуле потоков.
+        :param cache_size: Максимальное кол-во закешированных учетных данных.
+        :param cache_ttl: Время жизни успешной проверки в кеше в секундах.
+        """
+        self._async_session_factory = async_session_factory
+        self._password_hashing_service = password_hashing_service
+        self._cache: TtlLruCache[bytes, str] = TtlLruCache(max_size=cache_size, ttl=cache_ttl)
+        # ключ кеша - HMAC со случайным секретом процесса, чтобы в памяти не хранились пароли и их быстрые хеши
+        self._cache_key_secret = token_bytes(32)
+
+    def make_cache_key(self, login: str, password: str) -> bytes:
+        """
+        Формирование ключа кеша по логину и паролю.
+
+        :param login: Логин.
+        :param password: Пароль.
+        :return: Ключ кеша.
+        """
+        return new_hmac(self._cache_key_secret, f'{login}\x00{password}'.encode('utf-8'), sha256).digest()
+
+    async def verify(self, login: str, password: str) -> bool:
+        """
+        Проверка логина и пароля.
+
+        :param login: Логин.
+        :param password: Пароль.
+        :return: Верно ли указаны учетные данные.
+        """
+        cache_key = self.make_cache_key(login=login, password=password)
+        if self._cache.get(cache_key) is not None:
+            return True
+
+        async with self._async_session_factory() as async_db_session:
+            user_dto = await UserRepository(async_db_session=async_db_session).get_user_by_login(login)
+        if not user_dto or not user_dto.hashed_password:
+            return False
+
+        if not await self._password_hashing_service.check_password(password, user_dto.hashed_password):
+            return False
+
+        self._cache.set(cache_key, login)
+        return True
+
+    def clear(self) -> None:
+        """
+        Сброс всех закешированных проверок.
+
+        :return: None.
+        """
+        self._cache.clear()
+
+    def on_users_changed(self, _mapper: Any, _connection: Any, target: Any) -> None:
+        """
+        Обработчик событий ORM изменения/удаления строки таблицы users.
+        Сбрасывает кеш целиком, т.к. мог измениться как пароль, так и сам логин.
+
+        :param _mapper: Маппер модели.
+        :param _connection: Подключение к БД.
+        :param target: Измененная модель пользователя.
+        :return: None.
+        """
+        AppLogger.info(f'Users row changed, credentials cache cleared: {target.login}')
+
+        self.clear()
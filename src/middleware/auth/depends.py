@@ -1,7 +1,15 @@
 from fastapi import Depends
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from settings import app_settings
+from src.dependencies.common import async_session_factory
 from src.dependencies.common import sqlalchemy_async_session_generator
+from src.models import ApiKey
+from src.models import Users
+from .api_key_store import ApiKeyStore
+from .credentials_verifier import CredentialsVerifier
+from .password_hashing_service import PasswordHashingService
 from .user_repository import UserRepository
 
 
@@ -15,3 +23,31 @@ async def get_user_repository(
     :return: Репозиторий UserRepository.
     """
     return UserRepository(async_db_session=async_db_session)
+
+
+# Единый на процесс пул bcrypt, используется и при проверке, и при создании паролей
+password_hashing_service = PasswordHashingService(
+    max_workers=app_settings.AUTH_HASHING_WORKERS,
+    max_pending=app_settings.AUTH_HASHING_MAX_PENDING,
+    queue_timeout=app_settings.AUTH_HASHING_QUEUE_TIMEOUT,
+    bcrypt_rounds=app_settings.AUTH_BCRYPT_ROUNDS
+)
+
+# Единый на процесс проверяющий учетные данные с кешем успешных проверок
+credentials_verifier = CredentialsVerifier(
+    async_session_factory=async_session_factory,
+    password_hashing_service=password_hashing_service,
+    cache_size=app_settings.AUTH_CACHE_SIZE,
+    cache_ttl=app_settings.AUTH_CACHE_TTL
+)
+event.listen(Users, 'after_update', credentials_verifier.on_users_changed)
+event.listen(Users, 'after_delete', credentials_verifier.on_users_changed)
+
+# Единое на процесс хранилище хешей api ключей, обновляемое фоновым опросом БД
+api_key_store = ApiKeyStore(
+    async_session_factory=async_session_factory,
+    refresh_interval=app_settings.API_KEYS_REFRESH_INTERVAL,
+    full_reload_interval=app_settings.API_KEYS_FULL_RELOAD_INTERVAL
+)
+event.listen(ApiKey, 'after_update', api_key_store.on_api_key_changed)
+event.listen(ApiKey, 'after_delete', api_key_store.on_api_key_changed)
@@ -0,0 +1,130 @@
+from asyncio import Semaphore
+from asyncio import TimeoutError as QueueTimeoutError
+from asyncio import get_running_loop
+from asyncio import wait_for
+from concurrent.futures import ThreadPoolExecutor
+from time import monotonic
+from typing import Any
+from typing import Callable
+from typing import TypeVar
+
+from src.exceptions import PasswordHashingOverloadError
+from src.logger import AppLogger
+from src.schemas.responses import PasswordHashingStatsResponse
+from .common import is_the_same_passwords
+from .common import make_hashed_pwd
+
+ResultType = TypeVar('ResultType')
+
+
+class PasswordHashingService:
+    """
+    Асинхронное хеширование и проверка паролей bcrypt в ограниченном пуле потоков.
+    bcrypt отпускает GIL, поэтому потоков достаточно, а цикл событий не блокируется на время хеширования.
+    Кол-во принятых в пул задач ограничено, при переполнении задача ждет очереди не дольше queue_timeout.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int, queue_timeout: float, bcrypt_rounds: int):
+        """
+        :param max_workers: Кол-во потоков пула.
+        :param max_pending: Кол-во одновременно принятых в пул задач (выполняемых и ожидающих свободный поток).
+        :param queue_timeout: Время ожидания места в пуле в секундах, после чего выбрасывается исключение.
+        :param bcrypt_rounds: Стоимость bcrypt при хешировании новых паролей.
+        """
+        self._max_workers = max_workers
+        self._max_pending = max_pending
+        self._queue_timeout = queue_timeout
+        self._bcrypt_rounds = bcrypt_rounds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='password_hashing')
+        self._semaphore = Semaphore(max_pending)
+
+        self._in_flight = 0
+        self._waiting = 0
+        self._completed = 0
+        self._rejected = 0
+        self._queue_wait_total = 0.0
+        self._hashing_total = 0.0
+
+    async def run_in_pool(self, func: Callable[..., ResultType], *args: Any) -> ResultType:
+        """
+        Выполнение функции в пуле потоков с ограничением кол-ва принятых задач.
+
+        :param func: Синхронная функция.
+        :param args: Аргументы функции.
+        :return: Результат функции.
+        """
+        called_at = monotonic()
+        self._waiting += 1
+        try:
+            await wait_for(self._semaphore.acquire(), timeout=self._queue_timeout)
+        except QueueTimeoutError:
+            self._rejected += 1
+            AppLogger.warning(f'Password hashing queue is full: {self._in_flight} tasks in flight')
+
+            raise PasswordHashingOverloadError()
+        finally:
+            self._waiting -= 1
+
+        self._in_flight += 1
+        started_at = called_at
+
+        def run_and_measure() -> ResultType:
+            nonlocal started_at
+            started_at = monotonic()
+            return func(*args)
+
+        try:
+            return await get_running_loop().run_in_executor(self._executor, run_and_measure)
+        finally:
+            finished_at = monotonic()
+            self._in_flight -= 1
+            self._completed += 1
+            self._queue_wait_total += started_at - called_at
+            self._hashing_total += finished_at - started_at
+            self._semaphore.release()
+
+    async def hash_password(self, password: str) -> str:
+        """
+        Хеширование пароля с настроенной стоимостью bcrypt.
+
+        :param password: Исходный пароль.
+        :return: Хешированный пароль.
+        """
+        return await self.run_in_pool(make_hashed_pwd, password, self._bcrypt_rounds)
+
+    async def check_password(self, password: str, hashed: str) -> bool:
+        """
+        Проверка пароля.
+
+        :param password: Исходный пароль.
+        :param hashed: Хешированный пароль.
+        :return: Верно ли указан пароль.
+        """
+        return await self.run_in_pool(is_the_same_passwords, password, hashed)
+
+    def get_stats(self) -> PasswordHashingStatsResponse:
+        """
+        Получение метрик пула для контроля нагрузки.
+
+        :return: Метрики пула.
+        """
+        completed = self._completed or 1
+
+        return PasswordHashingStatsResponse(
+            max_workers=self._max_workers,
+            max_pending=self._max_pending,
+            in_flight=self._in_flight,
+            waiting=self._waiting,
+            completed=self._completed,
+            rejected=self._rejected,
+            avg_queue_wait_ms=self._queue_wait_total / completed * 1000,
+            avg_hashing_ms=self._hashing_total / completed * 1000
+        )
+
+    def shutdown(self) -> None:
+        """
+        Остановка пула потоков.
+
+        :return: None.
+        """
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -6,3 +6,5 @@ from .bill import Bill
 from .building import Building
 from .owner import Owner
 from .users import Users
+from .apartment_debt_summary import ApartmentDebtSummary
+from .api_key import ApiKey
@@ -1,6 +1,6 @@
 from typing import List
 
-from sqlalchemy import ForeignKey, String, Integer, UniqueConstraint
+from sqlalchemy import ForeignKey, String, Integer, UniqueConstraint, Index
 from sqlalchemy.orm import mapped_column, Mapped
 from sqlalchemy.orm import relationship
 
@@ -14,6 +14,8 @@ class Apartment(BaseDbModel):
 
     __table_args__ = (  # type: ignore[assignment]
         UniqueConstraint('id_building', 'utility_account', name='unique_id_building_utility_account'),
+        # покрывает и выборки только по id_building
+        Index('ix_payment_management_apartment_id_building_apartment_number', 'id_building', 'apartment_number'),
         BaseDbModel.__table_args__,
     )
     id_building: Mapped[int] = mapped_column(
@@ -24,6 +26,7 @@ class Apartment(BaseDbModel):
     id_owner: Mapped[int] = mapped_column(
         ForeignKey(Owner.id, ondelete='SET NULL'),
         nullable=True,
+        index=True,
         comment='Идентификатор владельца'
     )
     utility_account: Mapped[str] = mapped_column(String(100), nullable=False, comment='Лицевой счет')
@@ -32,21 +35,18 @@ class Apartment(BaseDbModel):
 
     apartment_info: Mapped["ApartmentInfo"] = relationship(  # type: ignore[name-defined] # noqa: F821
         'ApartmentInfo',
-        lazy="joined",
         single_parent=True,
         cascade='all, delete-orphan'
     )
     building: Mapped[Building] = relationship(
         'Building',
         back_populates='apartments',
-        lazy="joined",
         single_parent=True,
 
     )
     owner: Mapped["Owner"] = relationship(  # type: ignore[name-defined] # noqa: F821
         'Owner',
         back_populates='apartments',
-        lazy="joined",
         single_parent=True,
         cascade='all, delete-orphan'
     )
@@ -54,6 +54,5 @@ class Apartment(BaseDbModel):
     bills: Mapped[List["Bill"]] = relationship(  # type: ignore[name-defined] # noqa: F821
         'Bill',
         # foreign_keys=[id_building, utility_account],  # связь по составному ключу
-        lazy="joined",
         uselist=True
     )
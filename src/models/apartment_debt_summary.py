@@ -0,0 +1,33 @@
+from sqlalchemy import ForeignKey, Float, Integer, String
+from sqlalchemy.orm import mapped_column, Mapped
+
+from .apartment import Apartment
+from .base_db_model import BaseDbModel
+
+
+class ApartmentDebtSummary(BaseDbModel):
+    """
+    Поддерживаемая сводка по неоплаченным счетам квартиры.
+    Пересчитывается в той же транзакции, в которой BillRepository создает, изменяет или удаляет счета.
+    """
+    __tablename__ = 'apartment_debt_summary'
+
+    id_apartment: Mapped[int] = mapped_column(
+        ForeignKey(Apartment.id, ondelete='CASCADE'),  # удалить при удалении квартиры
+        nullable=False,
+        unique=True,
+        comment='Идентификатор квартиры'
+    )
+    unpaid_total: Mapped[float] = mapped_column(Float, nullable=False, default=0, comment='Сумма неоплаченных счетов')
+    unpaid_count: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        index=True,
+        comment='Кол-во неоплаченных счетов'
+    )
+    oldest_unpaid_period: Mapped[str] = mapped_column(
+        String(100),
+        nullable=True,
+        comment='Самый ранний период неоплаченного начисления'
+    )
@@ -11,6 +11,7 @@ class ApartmentInfo(BaseDbModel):
     id_apartment: Mapped[int] = mapped_column(
         ForeignKey(Apartment.id, ondelete='CASCADE'),  # удалить при удалении квартиры
         nullable=False,
+        index=True,
         comment='Идентификатор квартиры'
     )
     room_number: Mapped[int] = mapped_column(Integer, nullable=False, comment='Количество комнат')
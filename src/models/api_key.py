@@ -0,0 +1,27 @@
+from datetime import datetime
+
+from sqlalchemy import Boolean, DateTime, String, func
+from sqlalchemy.orm import mapped_column, Mapped
+
+from .base_db_model import BaseDbModel
+
+
+class ApiKey(BaseDbModel):
+    """
+    Ключи доступа к api для межсервисных вызовов. Хранится только SHA-256 хеш ключа.
+    Ключ отзывается снятием флага is_active: изменение updated_at подхватывается периодическим опросом.
+    updated_at выставляет триггер БД при любом UPDATE, в том числе выполненном напрямую в SQL, в обход ORM.
+    """
+    __tablename__ = 'api_keys'
+
+    name: Mapped[str] = mapped_column(String(100), unique=True, nullable=False, comment='Название сервиса-клиента')
+    key_hash: Mapped[str] = mapped_column(String(64), unique=True, nullable=False, comment='SHA-256 хеш ключа')
+    is_active: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True, comment='Флаг активности ключа')
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        onupdate=func.now(),
+        index=True,
+        comment='Время последнего изменения'
+    )
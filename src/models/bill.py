@@ -1,4 +1,5 @@
-from sqlalchemy import ForeignKey, Boolean
+from sqlalchemy import ForeignKey, Boolean, Index
+from sqlalchemy import text
 from sqlalchemy import String, Float
 from sqlalchemy.orm import Mapped
 from sqlalchemy.orm import mapped_column
@@ -10,9 +11,16 @@ from .base_db_model import BaseDbModel
 class Bill(BaseDbModel):
     __tablename__ = 'bill'
 
+    __table_args__ = (  # type: ignore[assignment]
+        # частичный индекс под выборки задолженности: только неоплаченные счета
+        Index('ix_payment_management_bill_unpaid_id_apartment', 'id_apartment', postgresql_where=text('NOT is_paid')),
+        BaseDbModel.__table_args__,
+    )
+
     id_apartment: Mapped[int] = mapped_column(
         ForeignKey(Apartment.id),
         nullable=False,
+        index=True,
         comment='Идентификатор квартиры'
     )
     bill_period: Mapped[str] = mapped_column(String(100), nullable=False, comment='Период начисления')
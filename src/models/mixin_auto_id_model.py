@@ -14,9 +14,7 @@ class MixinAutoIdModel(Base):
 
     id: Mapped[int] = mapped_column(
         Integer,
-        primary_key=True,
-        index=True,
-        unique=True,
+        primary_key=True,  # индекс первичного ключа создается БД, отдельный уникальный индекс не нужен
         autoincrement=True,
         comment='Идентификатор',
         sort_order=-10
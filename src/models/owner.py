@@ -18,6 +18,5 @@ class Owner(BaseDbModel):
     apartments: Mapped[List["Apartment"]] = relationship(  # type: ignore[name-defined] # noqa: F821
         'Apartment',
         back_populates='owner',
-        lazy="joined",
         uselist=True
     )
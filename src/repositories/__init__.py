@@ -2,4 +2,7 @@ from .apartment_repository import ApartmentRepository
 from .assistant_repository import AssistantRepository
 from .bill_repository import BillRepository
 from .building_repository import BuildingRepository
+from .debt_summary_repository import DebtSummaryRepository
+from .loading_profile import LoadingProfile
 from .owner_repository import OwnerRepository
+from .statement_templates import StatementTemplates
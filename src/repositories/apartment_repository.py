@@ -1,17 +1,46 @@
+from typing import AsyncGenerator
 from typing import List, Optional
 
-from sqlalchemy import select, and_
+from sqlalchemy import Select
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import contains_eager
 from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import raiseload
+from sqlalchemy.orm import selectinload
 
 from src.models import Apartment, Building
+from src.models import ApartmentDebtSummary
 from src.models import ApartmentInfo
 from src.models import Bill
 from src.schemas.dtos import ApartmentDto
 from src.schemas.dtos import ApartmentFullDto
 from src.schemas.dtos import ApartmentInfoDto
 from .base_db_repository import BaseDbRepository
+from .loading_profile import LoadingProfile
 from src.schemas.responses import ApartmentFullResponse
+from src.utils.trusted_dto_mapper import TrustedDtoMapper
+
+APARTMENT_LOADING_PROFILE = LoadingProfile(
+    short=(
+        raiseload('*'),
+    ),
+    full=(
+        selectinload(Apartment.apartment_info),
+        raiseload('*'),
+    ),
+    debt=(
+        # дом загружается через contains_eager в build_debt_statement, связи "к одному" присоединяются тем же
+        # запросом без размножения строк, отдельным запросом загружаются только счета
+        joinedload(Apartment.apartment_info),
+        joinedload(Apartment.owner),
+        # условие NOT is_paid совпадает с условием частичного индекса bill, с IS false индекс не выбирается
+        selectinload(Apartment.bills.and_(~Bill.is_paid)),
+        raiseload('*'),
+    )
+)
+
+APARTMENT_FULL_RESPONSE_MAPPER = TrustedDtoMapper.get(ApartmentFullResponse)
 
 
 class ApartmentRepository(BaseDbRepository[Apartment, ApartmentDto, ApartmentFullDto]):
@@ -30,9 +59,49 @@ class ApartmentRepository(BaseDbRepository[Apartment, ApartmentDto, ApartmentFul
                 ApartmentFullDto: Apartment,
                 ApartmentInfoDto: ApartmentInfo,
             },
-            full_select_statement=select(Apartment).options(joinedload(Apartment.apartment_info))
+            loading_profile=APARTMENT_LOADING_PROFILE
         )
 
+    def build_debt_statement(
+            self,
+            building_id: Optional[int] = None,
+            building_project_name: Optional[str] = None,
+            apartment_number: Optional[int] = None
+    ) -> Select:  # type: ignore[type-arg]
+        """
+        Единое выражение выборки квартир с наличием задолженности для всех методов по задолженности.
+        Квартиры с неоплаченными счетами отбираются внутренним соединением со сводкой apartment_debt_summary
+        (одна строка на квартиру, без размножения строк по счетам), дом присоединяется тем же запросом и
+        заполняется через contains_eager, доп. информация и владелец - через joinedload, неоплаченные счета
+        догружаются через selectinload.
+
+        :param building_id: идентификатор дома, если не передан, то поиск по всем домам.
+        :param building_project_name: название ЖК, если не передано, то поиск по всем жилым комплексам.
+        :param apartment_number: номер квартиры, если не передан, то все квартиры.
+        :return: выражение SELECT.
+        """
+        statement = select(
+            Apartment
+        ).join(
+            ApartmentDebtSummary, ApartmentDebtSummary.id_apartment == Apartment.id
+        ).join(
+            Apartment.building
+        ).options(
+            contains_eager(Apartment.building),
+            *self.loading_profile.debt
+        ).where(
+            ApartmentDebtSummary.unpaid_count > 0
+        )
+
+        if building_id:
+            statement = statement.where(Apartment.id_building == building_id)
+        if building_project_name:
+            statement = statement.where(Building.project_name == building_project_name)
+        if apartment_number is not None:
+            statement = statement.where(Apartment.apartment_number == apartment_number)
+
+        return statement
+
     async def get_apartments_full_data_with_debt(
             self,
             building_id: Optional[int] = None
@@ -43,44 +112,29 @@ class ApartmentRepository(BaseDbRepository[Apartment, ApartmentDto, ApartmentFul
         :param building_id: идентификатор дома, если не передан, то поиск по всем домам.
         :return: список дто с расширенными данными о квартирах.
         """
-        statement = select(self.model_type).options(
-            joinedload(self.model_type.building),
-            joinedload(self.model_type.owner),
-            joinedload(self.model_type.bills.and_(Bill.is_paid == False))  # .and_(Bill.is_paid is False))
-        ).where(self.model_type.bills.and_(Bill.is_paid == False))
-
-        if building_id:
-            statement = statement.where(self.model_type.id_building == building_id)
-
+        statement = self.build_debt_statement(building_id=building_id)
         models_sequence = await self.execute_select_many_statement(statement)
-        return [ApartmentFullResponse.model_validate(model) for model in models_sequence]
+        return APARTMENT_FULL_RESPONSE_MAPPER.map_many(models_sequence)
 
     async def get_apartments_full_data_with_debt_by_apart_id(
             self,
             apartment_number: int,
             building_id: int
-    ) -> ApartmentFullResponse:
+    ) -> Optional[ApartmentFullResponse]:
         """
         Специальный метод предоставления расширенных данных о квартире с наличием задолженности по заранее
         известным apartment_number и building_id.
 
         :param apartment_number: номер квартиры.
         :param building_id: идентификатор дома.
-        :return: дто с расширенными данными о квартире.
+        :return: дто с расширенными данными о квартире или None, если квартира без задолженности не найдена.
         """
-        statement = select(Apartment).options(
-            joinedload(Apartment.building),
-            joinedload(Apartment.owner),
-            joinedload(Apartment.bills.and_(Bill.is_paid == False))  # .and_(Bill.is_paid is False))
-        ).where(
-            and_(
-                Apartment.bills.and_(Bill.is_paid == False),
-                Apartment.apartment_number == apartment_number,
-                Apartment.id_building == building_id
-            )
-        )
+        statement = self.build_debt_statement(building_id=building_id, apartment_number=apartment_number)
         model = await self.async_db_session.scalar(statement)
-        return ApartmentFullResponse.model_validate(model)
+        if model is None:
+            return None
+
+        return APARTMENT_FULL_RESPONSE_MAPPER.map(model)
 
     async def get_apartments_full_data_with_debt_by_project_name(
             self,
@@ -93,28 +147,23 @@ class ApartmentRepository(BaseDbRepository[Apartment, ApartmentDto, ApartmentFul
         :param building_project_name: название ЖК, если не передано, то поиск по всем жилым комплексам.
         :return: список дто с расширенными данными о квартирах.
         """
-        statement = select(Apartment).options(
-            joinedload(Apartment.building),
-            joinedload(Apartment.owner),
-            joinedload(Apartment.bills.and_(Bill.is_paid == False))  # .and_(Bill.is_paid is False))
-        ).where(Apartment.bills.and_(Bill.is_paid == False))
-
-        if building_project_name:
-            statement = select(Apartment).options(
-                joinedload(
-                    Apartment.building.and_(
-                        Building.project_name == building_project_name
-                    )
-                ),
-                joinedload(Apartment.owner),
-                joinedload(Apartment.bills.and_(Bill.is_paid == False))  # .and_(Bill.is_paid is False))
-            ).where(
-                and_(
-                    Apartment.bills.and_(Bill.is_paid == False),
-                    Apartment.building.has(
-                        Building.project_name == building_project_name
-                                           )
-                )
-            )
+        statement = self.build_debt_statement(building_project_name=building_project_name)
         models_sequence = await self.execute_select_many_statement(statement)
-        return [ApartmentFullResponse.model_validate(model) for model in models_sequence]
+        return APARTMENT_FULL_RESPONSE_MAPPER.map_many(models_sequence)
+
+    async def stream_apartments_full_data_with_debt_by_project_name(
+            self,
+            chunk_size: int,
+            building_project_name: Optional[str] = None
+    ) -> AsyncGenerator[List[ApartmentFullResponse], None]:
+        """
+        Потоковая выборка расширенных данных о квартирах с наличием задолженности по названию жилого комплекса
+        порциями по chunk_size.
+
+        :param chunk_size: кол-во квартир в одной порции.
+        :param building_project_name: название ЖК, если не передано, то поиск по всем жилым комплексам.
+        :return: асинхронный генератор списков дто с расширенными данными о квартирах.
+        """
+        statement = self.build_debt_statement(building_project_name=building_project_name)
+        async for models_list in self.stream_select_statement(statement, chunk_size=chunk_size):
+            yield APARTMENT_FULL_RESPONSE_MAPPER.map_many(models_list)
@@ -1,5 +1,23 @@
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+
+from sqlalchemy import and_
+from sqlalchemy import func
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import JSON
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.logger import AppLogger
+from src.models import Apartment
+from src.models import ApartmentDebtSummary
+from src.models import Bill
+from src.models import Building
+from src.models import Owner
+from src.schemas.responses import DebtorInfoResponse
+
 
 class AssistantRepository:
     """
@@ -8,4 +26,120 @@ class AssistantRepository:
     def __init__(self, async_db_session: AsyncSession):
         self.async_db_session = async_db_session
 
-    # TODO можно реализовать какие-нибудь специфичные запросы в БД
+    async def get_debtors_info(self, building_project_name: Optional[str] = None) -> List[DebtorInfoResponse]:
+        """
+        Агрегация задолженности по собственникам на стороне БД.
+        Квартиры с задолженностью и суммы долга по ним берутся из поддерживаемой сводки apartment_debt_summary,
+        затем квартиры суммируются по собственникам. Счета и квартиры
+        собираются в JSON прямо в запросе, поэтому из БД приходит по одной готовой строке на должника.
+        Должники отсортированы по убыванию общей задолженности, их квартиры - по убыванию задолженности по квартире.
+
+        :param building_project_name: название ЖК, если не передано, то поиск по всем жилым комплексам.
+        :return: список дто DebtorInfoResponse.
+        """
+        AppLogger.debug(f'Select debtors info: {building_project_name}')
+
+        bill_json = func.json_build_object(
+            'bill_period', Bill.bill_period,
+            'bill_size', Bill.bill_size,
+            'is_paid', Bill.is_paid
+        )
+        apartment_debt_statement = select(
+            Apartment.id_owner,
+            Apartment.utility_account,
+            Apartment.apartment_number,
+            Apartment.floor,
+            Building.address,
+            Building.project_name,
+            ApartmentDebtSummary.unpaid_total.label('common_debt'),
+            func.json_agg(aggregate_order_by(bill_json, Bill.id), type_=JSON).label('bills_not_payed')
+        ).join(
+            ApartmentDebtSummary, ApartmentDebtSummary.id_apartment == Apartment.id
+        ).join(
+            Building, Building.id == Apartment.id_building
+        ).join(
+            Bill, and_(Bill.id_apartment == Apartment.id, ~Bill.is_paid)
+        ).where(
+            ApartmentDebtSummary.unpaid_count > 0,
+            Apartment.id_owner.is_not(None)
+        ).group_by(
+            Apartment.id,
+            Building.id,
+            ApartmentDebtSummary.id
+        )
+        if building_project_name:
+            apartment_debt_statement = apartment_debt_statement.where(Building.project_name == building_project_name)
+        apartment_debt = apartment_debt_statement.subquery('apartment_debt')
+
+        apartment_json = func.json_build_object(
+            'utility_account', apartment_debt.c.utility_account,
+            'apartment_number', apartment_debt.c.apartment_number,
+            'floor', apartment_debt.c.floor,
+            'address', apartment_debt.c.address,
+            'project_name', apartment_debt.c.project_name,
+            'common_debt', apartment_debt.c.common_debt,
+            'bills_not_payed', apartment_debt.c.bills_not_payed
+        )
+        all_aparts_common_debt = func.sum(apartment_debt.c.common_debt).label('all_aparts_common_debt')
+        statement = select(
+            Owner.id.label('id_owner'),
+            Owner.fullname,
+            Owner.phone,
+            all_aparts_common_debt,
+            func.json_agg(
+                aggregate_order_by(apartment_json, apartment_debt.c.common_debt.desc()),
+                type_=JSON
+            ).label('apartments_debt')
+        ).join(
+            apartment_debt, apartment_debt.c.id_owner == Owner.id
+        ).group_by(
+            Owner.id
+        ).order_by(
+            all_aparts_common_debt.desc()
+        )
+
+        result = await self.async_db_session.execute(statement)
+
+        return [DebtorInfoResponse.model_validate(dict(row)) for row in result.mappings()]
+
+    async def get_unpaid_bills_columns(
+            self,
+            chunk_size: int,
+            building_project_name: Optional[str] = None
+    ) -> Dict[str, List[Any]]:
+        """
+        Выборка неоплаченных счетов с данными квартиры и дома по колонкам для аналитики задолженности.
+        Строки читаются одним запросом через серверный курсор порциями по chunk_size и сразу раскладываются по
+        спискам значений колонок, без создания объектов ORM и DTO на каждую строку.
+
+        :param chunk_size: кол-во строк в одной порции.
+        :param building_project_name: название ЖК, если не передано, то выборка по всем жилым комплексам.
+        :return: словарь название колонки - список значений.
+        """
+        AppLogger.debug(f'Select unpaid bills columns: {building_project_name}')
+
+        statement = select(
+            Bill.id_apartment,
+            Bill.bill_period,
+            Bill.bill_size,
+            Apartment.floor,
+            Apartment.id_building,
+            Building.address,
+            Building.project_name
+        ).join(
+            Apartment, Apartment.id == Bill.id_apartment
+        ).join(
+            Building, Building.id == Apartment.id_building
+        ).where(
+            ~Bill.is_paid
+        )
+        if building_project_name:
+            statement = statement.where(Building.project_name == building_project_name)
+
+        result = await self.async_db_session.stream(statement.execution_options(yield_per=chunk_size))
+        columns: Dict[str, List[Any]] = {column_name: list() for column_name in result.keys()}
+        async for rows in result.partitions():
+            for column_values, chunk_values in zip(columns.values(), zip(*rows)):
+                column_values.extend(chunk_values)
+
+        return columns
@@ -1,28 +1,38 @@
 from typing import Any
+from typing import AsyncGenerator
 from typing import Dict
 from typing import Generic
 from typing import List
 from typing import Optional
+from typing import Sequence
 from typing import Tuple
 from typing import Type
 from typing import TypeVar
 
 from sqlalchemy import Select
-from sqlalchemy import delete
-from sqlalchemy import select
+from sqlalchemy import Table
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from settings import app_settings
 from src.logger import AppLogger
+from src.exceptions import DuplicateIdsError
 from src.exceptions import SqlAlchemyError
 from src.schemas.dtos import BaseSchema
 from src.models import MixinAutoIdModel
+from src.utils.trusted_dto_mapper import TrustedDtoMapper
+from .loading_profile import LoadingProfile
+from .statement_templates import StatementTemplates
 
 
 ModelType = TypeVar('ModelType', bound=MixinAutoIdModel)
 ShortDto = TypeVar('ShortDto', bound=BaseSchema)
 FullDto = TypeVar('FullDto', bound=BaseSchema)
 
+# общий профиль для репозиториев без своего профиля, чтобы их шаблоны выражений тоже собирались один раз
+DEFAULT_LOADING_PROFILE = LoadingProfile()
+
 
 class BaseRepositoryInterface:
     """
@@ -34,6 +44,8 @@ class BaseRepositoryInterface:
 class BaseDbRepository(BaseRepositoryInterface, Generic[ModelType, ShortDto, FullDto]):
     """
     Базовый репозиторий для работы с БД.
+    Репозиторий и его сессия создаются на один HTTP запрос и общие для всех зависимостей этого запроса,
+    поэтому загруженные через load_many объекты запоминаются до конца запроса либо до изменения данных репозиторием.
     """
 
     def __init__(
@@ -46,7 +58,8 @@ class BaseDbRepository(BaseRepositoryInterface, Generic[ModelType, ShortDto, Ful
                 Dict[Type[BaseSchema], Type[MixinAutoIdModel]]
             ] = None,
             short_select_statement: Optional[Select[Tuple[ModelType]]] = None,
-            full_select_statement: Optional[Select[Tuple[ModelType]]] = None
+            full_select_statement: Optional[Select[Tuple[ModelType]]] = None,
+            loading_profile: Optional[LoadingProfile] = None
     ):
         self._async_db_session = async_db_session
         self._model_type = model_type
@@ -63,13 +76,27 @@ class BaseDbRepository(BaseRepositoryInterface, Generic[ModelType, ShortDto, Ful
             schemas_to_models_dict = default_schemas_to_models_dict
         self._schemas_correspond_models_dict = schemas_to_models_dict
 
-        if short_select_statement is None:
-            short_select_statement = select(model_type)
-        self._short_select_statement = short_select_statement
+        if loading_profile is None:
+            loading_profile = DEFAULT_LOADING_PROFILE
+        self._loading_profile = loading_profile
+
+        if short_select_statement is None and full_select_statement is None:
+            self._statement_templates = StatementTemplates.get(model_type=model_type, loading_profile=loading_profile)
+        else:
+            self._statement_templates = StatementTemplates(
+                model_type=model_type,
+                loading_profile=loading_profile,
+                short_select_statement=short_select_statement,
+                full_select_statement=full_select_statement
+            )
+        self._short_select_statement = self._statement_templates.short_select
+        self._full_select_statement = self._statement_templates.full_select
 
-        if full_select_statement is None:
-            full_select_statement = select(model_type)
-        self._full_select_statement = full_select_statement
+        # строки из БД считаются проверенными: DTO собираются без повторной валидации Pydantic
+        self._short_dto_mapper = TrustedDtoMapper.get(short_dto_type)
+        self._full_dto_mapper = TrustedDtoMapper.get(full_dto_type)
+
+        self._loaded_full_dtos: Dict[int, Optional[FullDto]] = dict()
 
     @property
     def async_db_session(self) -> AsyncSession:
@@ -116,6 +143,15 @@ class BaseDbRepository(BaseRepositoryInterface, Generic[ModelType, ShortDto, Ful
         """
         return self._schemas_correspond_models_dict
 
+    @property
+    def loading_profile(self) -> LoadingProfile:
+        """
+        Получение профиля стратегий загрузки связей модели.
+
+        :return: Профиль загрузки.
+        """
+        return self._loading_profile
+
     @property
     def short_select_statement(
             self
@@ -138,20 +174,38 @@ class BaseDbRepository(BaseRepositoryInterface, Generic[ModelType, ShortDto, Ful
         """
         return self._full_select_statement
 
+    @property
+    def statement_templates(self) -> StatementTemplates:
+        """
+        Получение заранее собранных выражений типовых запросов.
+
+        :return: Шаблоны выражений.
+        """
+        return self._statement_templates
+
     async def commit(self) -> None:
         """
         Фиксация изменений в БД.
+        Сессия не закрывается: она общая для всех репозиториев запроса и закрывается зависимостью по окончании
+        запроса, а соединение возвращается в пул уже при завершении транзакции.
 
         :return: None.
         """
         AppLogger.debug('Commit some changes in DB')
+        self.clear_loaded_objects()
         try:
             await self._async_db_session.commit()
         except Exception as e:
             await self._async_db_session.rollback()
             AppLogger.error(f"Ошибка при коммите: {e}")
-        finally:
-            await self._async_db_session.close()
+
+    def clear_loaded_objects(self) -> None:
+        """
+        Сброс запомненных через load_many объектов перед изменением данных, чтобы не вернуть устаревшие DTO.
+
+        :return: None.
+        """
+        self._loaded_full_dtos.clear()
 
     async def merge(self, model: ModelType) -> ModelType:
         """
@@ -161,8 +215,10 @@ class BaseDbRepository(BaseRepositoryInterface, Generic[ModelType, ShortDto, Ful
         :return: None.
         """
         AppLogger.debug(f'Merge model: {model}')
+        self.clear_loaded_objects()
 
-        model = await self._async_db_session.merge(model)
+        # существующая версия объекта подгружается с теми же связями, что и полная выборка
+        model = await self._async_db_session.merge(model, options=self._loading_profile.full)
         await self._async_db_session.flush()
 
         return model
@@ -198,33 +254,41 @@ class BaseDbRepository(BaseRepositoryInterface, Generic[ModelType, ShortDto, Ful
 
     async def execute_select_one_statement(
             self,
-            select_statement: Select  # type: ignore[type-arg]
+            select_statement: Select,  # type: ignore[type-arg]
+            params: Optional[Dict[str, Any]] = None
     ) -> Optional[MixinAutoIdModel]:
         """
         Выполнение SELECT запроса для выборки одного объекта из БД.
 
         :param select_statement: Выражение SELECT.
+        :param params: Значения именованных параметров (bindparam) выражения.
         :return: Объект ORM.
         """
-        AppLogger.debug(f'Execute select statement: {select_statement}')
+        # текст выражения формируется компиляцией, поэтому только при включенном отладочном логировании
+        if AppLogger.is_debug_enabled():
+            AppLogger.debug(f'Execute select statement: {select_statement}')
 
         return await self._async_db_session.scalar(  # type: ignore[no-any-return]
-            select_statement
+            select_statement,
+            params
         )
 
     async def execute_select_many_statement(
             self,
-            select_statement: Select  # type: ignore[type-arg]
+            select_statement: Select,  # type: ignore[type-arg]
+            params: Optional[Dict[str, Any]] = None
     ) -> List[MixinAutoIdModel]:
         """
         Выполнение SELECT запроса для выборки множества объектов из БД.
 
         :param select_statement: Выражение SELECT.
+        :param params: Значения именованных параметров (bindparam) выражения.
         :return: Список объектов ORM.
         """
-        AppLogger.debug(f'Execute select statement: {select_statement}')
+        if AppLogger.is_debug_enabled():
+            AppLogger.debug(f'Execute select statement: {select_statement}')
 
-        result = await self._async_db_session.execute(select_statement)
+        result = await self._async_db_session.execute(select_statement, params)
 
         return list(result.scalars().unique().all())
 
@@ -240,28 +304,145 @@ class BaseDbRepository(BaseRepositoryInterface, Generic[ModelType, ShortDto, Ful
         model = self.convert_schema_to_orm_model(schema=dto)
         try:
             model = await self.merge(model=model)
+            dto = self._full_dto_mapper.map(model)
+            # фиксация до возврата, чтобы сброс кеша в контроллере не опередил запись в БД
+            await self.commit()
 
-            return self._full_dto_type.model_validate(obj=model)
+            return dto
         except IntegrityError as exc:
             AppLogger.error(f'IntegrityError {exc}. Data: {dto.model_dump()}')
 
             raise SqlAlchemyError()
 
+    def is_bulk_upsert_supported(self, dto_list: List[FullDto]) -> bool:
+        """
+        Проверка возможности массового создания/обновления одним INSERT ... ON CONFLICT.
+        Возможно только для плоских DTO, все поля которых являются колонками таблицы основной модели.
+
+        :param dto_list: Список данных для обновления или создания объектов.
+        :return: Логическое значение.
+        """
+        table_columns = self._model_type.__table__.columns.keys()
+
+        return all(set(type(dto).model_fields).issubset(table_columns) for dto in dto_list)
+
+    async def execute_bulk_insert(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Массовое создание строк основной таблицы через INSERT ... RETURNING.
+        Строки передаются списком параметров: SQLAlchemy сам разбивает их на пачки многострочных INSERT, а с
+        sort_by_parameter_order возвращает строки в порядке переданных (БД этот порядок не гарантирует).
+
+        :param rows: Список словарей со значениями колонок без id. Все словари должны иметь одинаковый набор ключей.
+        :return: Список словарей со значениями колонок после записи в БД в порядке переданных строк.
+        """
+        table: Table = self._model_type.__table__  # type: ignore[assignment]
+        result = await self._async_db_session.execute(
+            pg_insert(table).returning(*table.columns, sort_by_parameter_order=True),
+            rows
+        )
+
+        return [dict(row._mapping) for row in result]
+
+    async def execute_bulk_upsert(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Массовое создание/обновление строк основной таблицы с заданными id через
+        INSERT ... ON CONFLICT (id) DO UPDATE ... RETURNING.
+        Строки разбиваются на чанки размером UPSERT_CHUNK_SIZE, чтобы не упереться в лимит параметров запроса.
+        Порядок строк RETURNING не гарантирован, поэтому строки сопоставляются с переданными по id.
+        Id в rows должны быть уникальны: повтор id в одном INSERT ... ON CONFLICT - ошибка БД.
+
+        :param rows: Список словарей со значениями колонок. Все словари должны иметь одинаковый набор ключей.
+        :return: Список словарей со значениями колонок после записи в БД в порядке переданных строк.
+        """
+        table: Table = self._model_type.__table__  # type: ignore[assignment]
+        upserted_rows: Dict[Any, Dict[str, Any]] = dict()
+
+        for start in range(0, len(rows), app_settings.UPSERT_CHUNK_SIZE):
+            chunk = rows[start:start + app_settings.UPSERT_CHUNK_SIZE]
+            statement = pg_insert(table).values(chunk)
+            update_columns = {
+                key: statement.excluded[key]
+                for key in chunk[0]
+                if key != 'id'
+            }
+            if update_columns:
+                statement = statement.on_conflict_do_update(index_elements=[table.c.id], set_=update_columns)
+            result = await self._async_db_session.execute(statement.returning(*table.columns))
+            upserted_rows.update((row.id, dict(row._mapping)) for row in result)
+
+        return [upserted_rows[row['id']] for row in rows]
+
     async def upsert_many(self, dto_list: List[FullDto]) -> List[FullDto]:
         """
         Обновление или создание списка объектов в БД.
+        Для плоских DTO используется массовый INSERT ... ON CONFLICT, для DTO со вложенными объектами - merge
+        каждого объекта. Повтор id в списке отклоняется до записи.
 
         :param dto_list: Список данных для обновления или создания объектов.
         :return: Список обновленных или созданных объектов.
         """
-        AppLogger.debug(f'Upsert many objects: {dto_list}')
+        AppLogger.debug(f'Upsert many objects: {len(dto_list)} items')
+
+        if not dto_list:
+            return list()
+
+        objects_ids = [getattr(dto, 'id', None) for dto in dto_list]
+        existing_objects_ids = [object_id for object_id in objects_ids if object_id]
+        if len(set(existing_objects_ids)) != len(existing_objects_ids):
+            raise DuplicateIdsError()
+
+        self.clear_loaded_objects()
+        if not self.is_bulk_upsert_supported(dto_list=dto_list):
+            return await self.merge_many(dto_list=dto_list)
+
+        # новые объекты (id=0) и существующие пишутся отдельными запросами, т.к. у них разный набор колонок
+        new_rows_indexes: List[int] = list()
+        existing_rows_indexes: List[int] = list()
+        rows: List[Dict[str, Any]] = list()
+        for index, dto in enumerate(dto_list):
+            row = dto.model_dump()
+            if row.get('id'):
+                existing_rows_indexes.append(index)
+            else:
+                row.pop('id', None)
+                new_rows_indexes.append(index)
+            rows.append(row)
+
+        result_rows: List[Optional[Dict[str, Any]]] = [None] * len(rows)
+        try:
+            for indexes, execute in (
+                    (existing_rows_indexes, self.execute_bulk_upsert),
+                    (new_rows_indexes, self.execute_bulk_insert)
+            ):
+                if not indexes:
+                    continue
+                written_rows = await execute([rows[index] for index in indexes])
+                for index, written_row in zip(indexes, written_rows):
+                    result_rows[index] = written_row
+            await self.commit()
+
+            return [self._full_dto_mapper.map_mapping(row) for row in result_rows]  # type: ignore[arg-type]
+        except IntegrityError as exc:
+            AppLogger.error(f'IntegrityError {exc}. Data: {len(dto_list)} items')
+
+            raise SqlAlchemyError()
+
+    async def merge_many(self, dto_list: List[FullDto]) -> List[FullDto]:
+        """
+        Обновление или создание списка объектов в БД через merge каждого объекта.
+        Используется для DTO со вложенными объектами, которые пишутся в связанные таблицы.
+
+        :param dto_list: Список данных для обновления или создания объектов.
+        :return: Список обновленных или созданных объектов.
+        """
+        AppLogger.debug(f'Merge many objects: {dto_list}')
 
         models = [self.convert_schema_to_orm_model(schema=dto) for dto in dto_list]
         try:
             for i in range(len(models)):
                 models[i] = await self.merge(model=models[i])
             await self.commit()
-            return [self._full_dto_type.model_validate(obj=model) for model in models]
+            return [self._full_dto_mapper.map(model) for model in models]
         except IntegrityError as exc:
             AppLogger.error(f'IntegrityError {exc}. Data: {dto_list}')
 
@@ -276,9 +457,9 @@ class BaseDbRepository(BaseRepositoryInterface, Generic[ModelType, ShortDto, Ful
         """
         AppLogger.debug(f'Select one object full DTO: {object_id}')
 
-        model = await self._async_db_session.get(self._model_type, object_id)
+        model = await self._async_db_session.get(self._model_type, object_id, options=self._loading_profile.full)
         if model:
-            return self._full_dto_type.model_validate(obj=model)
+            return self._full_dto_mapper.map(model)
 
         return None
 
@@ -292,36 +473,172 @@ class BaseDbRepository(BaseRepositoryInterface, Generic[ModelType, ShortDto, Ful
         AppLogger.debug(f'Select one object full DTO: {object_id}')
 
         model = await self.execute_select_one_statement(
-            select_statement=self._full_select_statement.where(self._model_type.id == object_id)
+            select_statement=self._statement_templates.full_select_by_id,
+            params={StatementTemplates.OBJECT_ID_PARAM: object_id}
         )
         if model:
-            return self._full_dto_type.model_validate(obj=model)
+            return self._full_dto_mapper.map(model)
 
         return None
 
-    async def select_all_full(self) -> List[FullDto]:
+    async def load_many(self, objects_ids: Sequence[int]) -> List[Optional[FullDto]]:
+        """
+        Выборка полных DTO объектов по списку ID одним запросом SELECT ... WHERE id IN (...).
+        Уже загруженные в рамках запроса объекты повторно не запрашиваются, повторяющиеся ID запрашиваются один раз.
+
+        :param objects_ids: Список ID объектов.
+        :return: Список полных DTO в порядке переданных ID, None для ненайденных объектов.
+        """
+        AppLogger.debug(f'Load many objects {self._model_type}: {objects_ids}')
+
+        missing_ids = list(dict.fromkeys(
+            object_id for object_id in objects_ids if object_id not in self._loaded_full_dtos
+        ))
+        if missing_ids:
+            models_list = await self.execute_select_many_statement(
+                select_statement=self._statement_templates.full_select_by_ids,
+                params={StatementTemplates.OBJECTS_IDS_PARAM: missing_ids}
+            )
+            for object_id in missing_ids:
+                self._loaded_full_dtos[object_id] = None
+            for model in models_list:
+                self._loaded_full_dtos[model.id] = self._full_dto_mapper.map(model)
+
+        return [self._loaded_full_dtos[object_id] for object_id in objects_ids]
+
+    async def load_one(self, object_id: int) -> Optional[FullDto]:
+        """
+        Выборка одного полного DTO объекта с запоминанием в рамках запроса.
+
+        :param object_id: ID объекта.
+        :return: Полное DTO объекта или None.
+        """
+        dtos_list = await self.load_many(objects_ids=[object_id])
+
+        return dtos_list[0]
+
+    def build_keyset_statement(
+            self,
+            select_statement: Select,  # type: ignore[type-arg]
+            after_id: Optional[int] = None,
+            limit: Optional[int] = None
+    ) -> Select:  # type: ignore[type-arg]
+        """
+        Добавление к SELECT keyset-пагинации по id: выборка объектов с id больше after_id, не более limit штук.
+        Если параметры не переданы, выражение возвращается без изменений.
+
+        :param select_statement: Выражение SELECT.
+        :param after_id: ID последнего объекта предыдущей страницы.
+        :param limit: Максимальное кол-во объектов на странице.
+        :return: Выражение SELECT.
+        """
+        if after_id is None and limit is None:
+            return select_statement
+
+        select_statement = select_statement.order_by(self._model_type.id)
+        if after_id is not None:
+            select_statement = select_statement.where(self._model_type.id > after_id)
+        if limit is not None:
+            select_statement = select_statement.limit(limit)
+
+        return select_statement
+
+    async def stream_select_statement(
+            self,
+            select_statement: Select,  # type: ignore[type-arg]
+            chunk_size: int
+    ) -> AsyncGenerator[List[MixinAutoIdModel], None]:
+        """
+        Потоковая выборка объектов из БД порциями по chunk_size через серверный курсор.
+        В памяти одновременно находится только одна порция объектов. Связи в выражении должны загружаться через
+        selectinload, joinedload коллекций с yield_per несовместим.
+        Генератор потребляется уже после закрытия сессии зависимостью, поэтому по окончании сам закрывает сессию.
+
+        :param select_statement: Выражение SELECT.
+        :param chunk_size: Кол-во объектов в одной порции.
+        :return: Асинхронный генератор списков объектов ORM.
+        """
+        if AppLogger.is_debug_enabled():
+            AppLogger.debug(f'Stream select statement: {select_statement}')
+
+        try:
+            result = await self._async_db_session.stream_scalars(
+                select_statement.order_by(self._model_type.id).execution_options(yield_per=chunk_size)
+            )
+            async for models_list in result.partitions():
+                yield list(models_list)
+        finally:
+            await self._async_db_session.close()
+
+    async def select_all_full(self, after_id: Optional[int] = None, limit: Optional[int] = None) -> List[FullDto]:
         """
         Выборка всех полных DTO объектов из БД.
 
+        :param after_id: ID последнего объекта предыдущей страницы.
+        :param limit: Максимальное кол-во объектов на странице.
         :return: Список полных DTO объектов.
         """
         AppLogger.debug(f'Select all objects {self._model_type}')
 
-        models_list = await self.execute_select_many_statement(select_statement=self._full_select_statement)
+        models_list = await self.execute_select_many_statement(
+            select_statement=self.build_keyset_statement(
+                select_statement=self._full_select_statement,
+                after_id=after_id,
+                limit=limit
+            )
+        )
 
-        return [self._full_dto_type.model_validate(obj=model) for model in models_list]
+        return [self._full_dto_mapper.map(model) for model in models_list]
 
-    async def select_all_short(self) -> List[ShortDto]:
+    async def select_all_short(self, after_id: Optional[int] = None, limit: Optional[int] = None) -> List[ShortDto]:
         """
         Выборка всех кратких DTO объектов из БД.
 
+        :param after_id: ID последнего объекта предыдущей страницы.
+        :param limit: Максимальное кол-во объектов на странице.
         :return: Список кратких DTO объектов.
         """
         AppLogger.debug(f'Select all objects {self._model_type}')
 
-        models_list = await self.execute_select_many_statement(select_statement=self._short_select_statement)
+        models_list = await self.execute_select_many_statement(
+            select_statement=self.build_keyset_statement(
+                select_statement=self._short_select_statement,
+                after_id=after_id,
+                limit=limit
+            )
+        )
+
+        return [self._short_dto_mapper.map(model) for model in models_list]
+
+    async def stream_all_full(self, chunk_size: int) -> AsyncGenerator[List[FullDto], None]:
+        """
+        Потоковая выборка всех полных DTO объектов из БД порциями.
+
+        :param chunk_size: Кол-во объектов в одной порции.
+        :return: Асинхронный генератор списков полных DTO объектов.
+        """
+        AppLogger.debug(f'Stream all objects {self._model_type}')
 
-        return [self._short_dto_type.model_validate(obj=model) for model in models_list]
+        async for models_list in self.stream_select_statement(
+                select_statement=self._full_select_statement,
+                chunk_size=chunk_size
+        ):
+            yield [self._full_dto_mapper.map(model) for model in models_list]
+
+    async def stream_all_short(self, chunk_size: int) -> AsyncGenerator[List[ShortDto], None]:
+        """
+        Потоковая выборка всех кратких DTO объектов из БД порциями.
+
+        :param chunk_size: Кол-во объектов в одной порции.
+        :return: Асинхронный генератор списков кратких DTO объектов.
+        """
+        AppLogger.debug(f'Stream all objects {self._model_type}')
+
+        async for models_list in self.stream_select_statement(
+                select_statement=self._short_select_statement,
+                chunk_size=chunk_size
+        ):
+            yield [self._short_dto_mapper.map(model) for model in models_list]
 
     async def delete(self, object_id: int) -> bool:
         """
@@ -331,13 +648,12 @@ class BaseDbRepository(BaseRepositoryInterface, Generic[ModelType, ShortDto, Ful
         :return: Статус удаления.
         """
         AppLogger.debug(f'Delete object: {object_id}')
+        self.clear_loaded_objects()
 
-        statement = delete(
-            self._model_type
-        ).where(
-            self._model_type.id == object_id
+        result = await self._async_db_session.execute(
+            self._statement_templates.delete_by_id,
+            {StatementTemplates.OBJECT_ID_PARAM: object_id}
         )
-        result = await self._async_db_session.execute(statement)
         await self.commit()
         return result.rowcount == 1
 
@@ -349,14 +665,11 @@ class BaseDbRepository(BaseRepositoryInterface, Generic[ModelType, ShortDto, Ful
         :return: Статус удаления.
         """
         AppLogger.debug(f'Delete objects: {objects_ids_list}')
+        self.clear_loaded_objects()
 
-        statement = delete(
-            self._model_type
-        ).where(
-            self._model_type.id.in_(
-                objects_ids_list
-            )
+        result = await self._async_db_session.execute(
+            self._statement_templates.delete_many_by_ids,
+            {StatementTemplates.OBJECTS_IDS_PARAM: objects_ids_list}
         )
-        result = await self._async_db_session.execute(statement)
         await self.commit()
         return result.rowcount == len(objects_ids_list)
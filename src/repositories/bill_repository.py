@@ -1,13 +1,21 @@
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Set
+
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models import Bill
 from src.schemas.dtos import BillDto
 from .base_db_repository import BaseDbRepository
+from .debt_summary_repository import DebtSummaryRepository
 
 
 class BillRepository(BaseDbRepository[Bill, BillDto, BillDto]):
     """
     Репозиторий с типовыми дефолтными круд-методами из базового репозитория для работы с таблицей Bill.
+    При изменении счетов перед фиксацией транзакции пересчитывается сводка задолженности затронутых квартир.
     """
     def __init__(self, async_db_session: AsyncSession):
         super().__init__(
@@ -16,3 +24,55 @@ class BillRepository(BaseDbRepository[Bill, BillDto, BillDto]):
             short_dto_type=BillDto,
             full_dto_type=BillDto
         )
+        self._debt_summary_repository = DebtSummaryRepository(async_db_session=async_db_session)
+        self._changed_apartments_ids: Set[int] = set()
+
+    async def add_changed_apartments_by_bills_ids(self, bills_ids: Iterable[Optional[int]]) -> None:
+        """
+        Запоминание квартир, к которым счета относятся до изменения (счет может быть перенесен на другую квартиру).
+
+        :param bills_ids: ID счетов.
+        :return: None.
+        """
+        existing_bills_ids = [bill_id for bill_id in bills_ids if bill_id]
+        if not existing_bills_ids:
+            return
+
+        result = await self._async_db_session.scalars(
+            select(Bill.id_apartment).where(Bill.id.in_(existing_bills_ids))
+        )
+        self._changed_apartments_ids.update(result.all())
+
+    async def commit(self) -> None:
+        """
+        Пересчет сводки задолженности затронутых квартир и фиксация изменений в БД.
+
+        :return: None.
+        """
+        if self._changed_apartments_ids:
+            await self._debt_summary_repository.refresh(apartments_ids=self._changed_apartments_ids)
+            self._changed_apartments_ids = set()
+
+        await super().commit()
+
+    async def upsert(self, dto: BillDto) -> BillDto:
+        await self.add_changed_apartments_by_bills_ids([dto.id])
+        self._changed_apartments_ids.add(dto.id_apartment)
+
+        return await super().upsert(dto=dto)
+
+    async def upsert_many(self, dto_list: List[BillDto]) -> List[BillDto]:
+        await self.add_changed_apartments_by_bills_ids([dto.id for dto in dto_list])
+        self._changed_apartments_ids.update(dto.id_apartment for dto in dto_list)
+
+        return await super().upsert_many(dto_list=dto_list)
+
+    async def delete(self, object_id: int) -> bool:
+        await self.add_changed_apartments_by_bills_ids([object_id])
+
+        return await super().delete(object_id=object_id)
+
+    async def delete_many(self, objects_ids_list: List[int]) -> bool:
+        await self.add_changed_apartments_by_bills_ids(objects_ids_list)
+
+        return await super().delete_many(objects_ids_list=objects_ids_list)
@@ -1,6 +1,6 @@
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import raiseload
+from sqlalchemy.orm import selectinload
 
 from src.models import Apartment
 from src.models import Building
@@ -8,6 +8,17 @@ from src.schemas.dtos import ApartmentFullDto
 from src.schemas.dtos import BuildingDto
 from src.schemas.dtos import BuildingFullDto
 from .base_db_repository import BaseDbRepository
+from .loading_profile import LoadingProfile
+
+BUILDING_LOADING_PROFILE = LoadingProfile(
+    short=(
+        raiseload('*'),
+    ),
+    full=(
+        selectinload(Building.apartments).selectinload(Apartment.apartment_info),
+        raiseload('*'),
+    )
+)
 
 
 class BuildingRepository(BaseDbRepository[Building, BuildingDto, BuildingFullDto]):
@@ -25,7 +36,5 @@ class BuildingRepository(BaseDbRepository[Building, BuildingDto, BuildingFullDto
                 BuildingFullDto: Building,
                 ApartmentFullDto: Apartment,
             },
-            full_select_statement=select(Building).options(
-                joinedload(Building.apartments).joinedload(Apartment.apartment_info)
-            )
+            loading_profile=BUILDING_LOADING_PROFILE
         )
@@ -0,0 +1,73 @@
+from typing import Collection
+from typing import Optional
+
+from sqlalchemy import and_
+from sqlalchemy import func
+from sqlalchemy import select
+from sqlalchemy import Table
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.logger import AppLogger
+from src.models import Apartment
+from src.models import ApartmentDebtSummary
+from src.models import Bill
+
+
+class DebtSummaryRepository:
+    """
+    Репозиторий сводки задолженности по квартирам (таблица apartment_debt_summary).
+    Сводка пересчитывается только для квартир, счета которых изменились, и читается вместо суммирования счетов.
+    Сводка по собственнику - сумма сводок его квартир по индексу apartment.id_owner.
+    """
+    def __init__(self, async_db_session: AsyncSession):
+        self.async_db_session = async_db_session
+
+    async def refresh(self, apartments_ids: Optional[Collection[int]] = None) -> None:
+        """
+        Пересчет сводки по неоплаченным счетам квартир одним INSERT ... SELECT ... ON CONFLICT DO UPDATE.
+        Выполняется в текущей транзакции, поэтому сводка фиксируется вместе с изменением счетов.
+        Перед пересчетом строки квартир блокируются (FOR NO KEY UPDATE, по возрастанию id - без взаимных блокировок):
+        параллельная транзакция пересчитывает сводку тех же квартир только после фиксации текущей и уже видит ее счета.
+        Самый ранний период определяется сравнением строк bill_period: период хранится в формате BILL_PERIOD_FORMAT
+        (год, затем месяц с ведущим нулем) - прежние значения приведены миграцией 5d1c9a3e7b42, новые приводит
+        BillWriteDto, поэтому сравнение строк совпадает со сравнением дат.
+
+        :param apartments_ids: ID квартир, если не переданы, то пересчет по всем квартирам.
+        :return: None.
+        """
+        AppLogger.debug(f'Refresh apartment debt summary: {apartments_ids}')
+
+        lock_statement = select(Apartment.id).order_by(Apartment.id).with_for_update(key_share=True)
+        summary_statement = select(
+            Apartment.id,
+            func.coalesce(func.sum(Bill.bill_size), 0),
+            func.count(Bill.id),
+            func.min(Bill.bill_period)
+        ).outerjoin(
+            Bill, and_(Bill.id_apartment == Apartment.id, ~Bill.is_paid)
+        ).group_by(
+            Apartment.id
+        )
+        if apartments_ids is not None:
+            if not apartments_ids:
+                return
+            summary_statement = summary_statement.where(Apartment.id.in_(apartments_ids))
+            lock_statement = lock_statement.where(Apartment.id.in_(apartments_ids))
+
+        await self.async_db_session.execute(lock_statement)
+
+        table: Table = ApartmentDebtSummary.__table__  # type: ignore[assignment]
+        insert_statement = pg_insert(table).from_select(
+            ['id_apartment', 'unpaid_total', 'unpaid_count', 'oldest_unpaid_period'],
+            summary_statement
+        )
+        statement = insert_statement.on_conflict_do_update(
+            index_elements=[table.c.id_apartment],
+            set_={
+                'unpaid_total': insert_statement.excluded.unpaid_total,
+                'unpaid_count': insert_statement.excluded.unpaid_count,
+                'oldest_unpaid_period': insert_statement.excluded.oldest_unpaid_period,
+            }
+        )
+        await self.async_db_session.execute(statement)
@@ -0,0 +1,40 @@
+from typing import Sequence
+from typing import Tuple
+
+from sqlalchemy.orm.interfaces import ORMOption
+
+
+class LoadingProfile:
+    """
+    Набор стратегий загрузки связей модели для разных форм выборки.
+    В моделях связи по умолчанию не подгружаются, поэтому каждая выборка явно указывает, какие связи ей нужны.
+    Профиль стоит завершать raiseload('*'), чтобы случайное обращение к незагруженной связи падало сразу,
+    а не выполняло скрытый запрос.
+    """
+
+    def __init__(
+            self,
+            short: Sequence[ORMOption] = (),
+            full: Sequence[ORMOption] = (),
+            debt: Sequence[ORMOption] = ()
+    ):
+        """
+        :param short: Опции загрузки для краткой формы выборки.
+        :param full: Опции загрузки для полной формы выборки.
+        :param debt: Опции загрузки для выборок с данными о задолженности.
+        """
+        self._short = tuple(short)
+        self._full = tuple(full)
+        self._debt = tuple(debt)
+
+    @property
+    def short(self) -> Tuple[ORMOption, ...]:
+        return self._short
+
+    @property
+    def full(self) -> Tuple[ORMOption, ...]:
+        return self._full
+
+    @property
+    def debt(self) -> Tuple[ORMOption, ...]:
+        return self._debt
@@ -1,6 +1,6 @@
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import raiseload
+from sqlalchemy.orm import selectinload
 
 from src.models import Apartment
 from src.models import ApartmentInfo
@@ -10,6 +10,17 @@ from src.schemas.dtos import ApartmentInfoDto
 from src.schemas.dtos import OwnerDto
 from src.schemas.dtos import OwnerFullDto
 from .base_db_repository import BaseDbRepository
+from .loading_profile import LoadingProfile
+
+OWNER_LOADING_PROFILE = LoadingProfile(
+    short=(
+        raiseload('*'),
+    ),
+    full=(
+        selectinload(Owner.apartments),
+        raiseload('*'),
+    )
+)
 
 
 class OwnerRepository(BaseDbRepository[Owner, OwnerDto, OwnerFullDto]):
@@ -29,5 +40,5 @@ class OwnerRepository(BaseDbRepository[Owner, OwnerDto, OwnerFullDto]):
                 ApartmentInfoDto: ApartmentInfo
 
             },
-            full_select_statement=select(Owner).options(joinedload(Owner.apartments))
+            loading_profile=OWNER_LOADING_PROFILE
         )
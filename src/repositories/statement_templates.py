@@ -0,0 +1,104 @@
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+from typing import Type
+
+from sqlalchemy import Delete
+from sqlalchemy import Select
+from sqlalchemy import bindparam
+from sqlalchemy import delete
+from sqlalchemy import select
+
+from src.models import MixinAutoIdModel
+from .loading_profile import LoadingProfile
+
+
+class StatementTemplates:
+    """
+    Заранее собранные выражения типовых запросов репозитория.
+    Значения подставляются через именованные параметры (bindparam), поэтому одно и то же выражение переиспользуется
+    для любых id: не тратится время на сборку выражения, а его ключ кеша компиляции SQLAlchemy вычисляется один раз
+    и запоминается на самом выражении.
+    Шаблоны для пары (модель, профиль загрузки) хранятся на уровне класса и общие для всех экземпляров репозиториев,
+    которые создаются на каждый запрос.
+    """
+
+    # имена параметров шаблонов
+    OBJECT_ID_PARAM = 'object_id'
+    OBJECTS_IDS_PARAM = 'objects_ids'
+
+    _templates: Dict[Tuple[Type[MixinAutoIdModel], LoadingProfile], 'StatementTemplates'] = dict()
+
+    def __init__(
+            self,
+            model_type: Type[MixinAutoIdModel],
+            loading_profile: LoadingProfile,
+            short_select_statement: Optional[Select] = None,  # type: ignore[type-arg]
+            full_select_statement: Optional[Select] = None  # type: ignore[type-arg]
+    ):
+        """
+        :param model_type: Класс модели ORM.
+        :param loading_profile: Профиль стратегий загрузки связей модели.
+        :param short_select_statement: Краткая форма SELECT, если не передана - строится по профилю загрузки.
+        :param full_select_statement: Полная форма SELECT, если не передана - строится по профилю загрузки.
+        """
+        if short_select_statement is None:
+            short_select_statement = select(model_type).options(*loading_profile.short)
+        self._short_select = short_select_statement
+
+        if full_select_statement is None:
+            full_select_statement = select(model_type).options(*loading_profile.full)
+        self._full_select = full_select_statement
+
+        self._full_select_by_id = full_select_statement.where(model_type.id == bindparam(self.OBJECT_ID_PARAM))
+        self._full_select_by_ids = full_select_statement.where(
+            model_type.id.in_(bindparam(self.OBJECTS_IDS_PARAM, expanding=True))
+        )
+        # удаленные объекты находятся по id из RETURNING и убираются из сессии
+        self._delete_by_id = delete(model_type).where(
+            model_type.id == bindparam(self.OBJECT_ID_PARAM)
+        ).execution_options(synchronize_session='fetch')
+        self._delete_many_by_ids = delete(model_type).where(
+            model_type.id.in_(bindparam(self.OBJECTS_IDS_PARAM, expanding=True))
+        ).execution_options(synchronize_session='fetch')
+
+    @classmethod
+    def get(cls, model_type: Type[MixinAutoIdModel], loading_profile: LoadingProfile) -> 'StatementTemplates':
+        """
+        Получение шаблонов для модели и профиля загрузки. Шаблоны собираются при первом обращении.
+        Профили загрузки - константы модулей репозиториев, поэтому сравниваются по ссылке.
+
+        :param model_type: Класс модели ORM.
+        :param loading_profile: Профиль стратегий загрузки связей модели.
+        :return: Шаблоны выражений.
+        """
+        key = (model_type, loading_profile)
+        templates = cls._templates.get(key)
+        if templates is None:
+            templates = cls._templates[key] = cls(model_type=model_type, loading_profile=loading_profile)
+
+        return templates
+
+    @property
+    def short_select(self) -> Select:  # type: ignore[type-arg]
+        return self._short_select
+
+    @property
+    def full_select(self) -> Select:  # type: ignore[type-arg]
+        return self._full_select
+
+    @property
+    def full_select_by_id(self) -> Select:  # type: ignore[type-arg]
+        return self._full_select_by_id
+
+    @property
+    def full_select_by_ids(self) -> Select:  # type: ignore[type-arg]
+        return self._full_select_by_ids
+
+    @property
+    def delete_by_id(self) -> Delete:
+        return self._delete_by_id
+
+    @property
+    def delete_many_by_ids(self) -> Delete:
+        return self._delete_many_by_ids
@@ -3,3 +3,4 @@ from .assistant_router import assistant_router
 from .bill_router import bill_router
 from .building_router import building_router
 from .owner_router import owner_router
+from .service_router import service_router
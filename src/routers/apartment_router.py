@@ -4,8 +4,10 @@ from fastapi import Depends
 from fastapi_cache.decorator import cache
 from starlette import status
 
+from src.cache import single_flight
 from src.controllers import ApartmentController
 from src.dependencies.controller_dependencies import get_apartment_controller
+from src.enums import CacheNamespaceEnum
 from src.schemas.dtos import ApartmentDto
 from src.schemas.dtos import ApartmentFullDto
 from src.schemas.responses import ApartmentFullResponse
@@ -21,7 +23,8 @@ class ApartmentRouter(BaseRouter):
             description='Методы для работы с данными о квартирах',
             controller_dependency=Depends(get_apartment_controller),
             short_schema_type=ApartmentDto,
-            external_schema_type=ApartmentFullDto
+            external_schema_type=ApartmentFullDto,
+            cache_namespace=CacheNamespaceEnum.APARTMENTS
         )
 
     def add_custom_routes(self):
@@ -38,7 +41,8 @@ class ApartmentRouter(BaseRouter):
             response_model=List[ApartmentFullResponse],
             status_code=status.HTTP_200_OK
         )
-        @cache(expire=self.cache_lifetime)
+        @cache(expire=self.cache_lifetime, namespace=self.cache_namespace)
+        @single_flight(namespace=self.cache_namespace)
         async def get_apartments_with_debt(
                 building_id: Optional[int] = None,
                 controller: ApartmentController = controller_dependency  # type: ignore
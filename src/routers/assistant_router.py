@@ -1,14 +1,22 @@
 from typing import Optional, List
 
 from fastapi import Depends
+from fastapi.responses import StreamingResponse
 from fastapi_cache.decorator import cache
 from starlette import status
 
+from settings import app_settings
+from src.cache import single_flight
 from src.controllers import ApartmentController
 from src.controllers import AssistantController
 from src.dependencies.controller_dependencies import get_apartment_controller
 from src.dependencies.controller_dependencies import get_assistant_controller
+from src.enums import CacheNamespaceEnum
+from src.enums import DebtorLettersFormatEnum
+from src.schemas.responses import DebtAnalyticsResponse
 from src.schemas.responses import DebtorMessageResponse, DebtorInfoResponse
+from src.utils.common import iterate_ndjson_chunks
+from src.utils.common import iterate_zip_chunks
 from .unique_router import UniqueRouter
 
 assistant_router = UniqueRouter(
@@ -26,7 +34,8 @@ assistant_router = UniqueRouter(
             response_model=DebtorMessageResponse,
             status_code=status.HTTP_200_OK
         )
-@cache(expire=60)
+@cache(expire=60, namespace=CacheNamespaceEnum.ASSISTANT.value)
+@single_flight(namespace=CacheNamespaceEnum.ASSISTANT.value)
 async def get_message_body_for_debtor(
         apartment_number: int,
         building_id: int,
@@ -49,7 +58,8 @@ async def get_message_body_for_debtor(
             response_model=List[DebtorMessageResponse],
             status_code=status.HTTP_200_OK
         )
-@cache(expire=60)
+@cache(expire=60, namespace=CacheNamespaceEnum.ASSISTANT.value)
+@single_flight(namespace=CacheNamespaceEnum.ASSISTANT.value)
 async def get_message_body_for_all_debtors(
         building_project_name: Optional[str] = None,
         ap_controller: ApartmentController = Depends(get_apartment_controller),  # type: ignore
@@ -63,22 +73,73 @@ async def get_message_body_for_all_debtors(
     return [main_controller.map_data_to_debtor_message(dto) for dto in full_data_apart_dto]
 
 
+@assistant_router.api_router.get(
+            path='/get_message_body_for_debtors/stream',
+            summary='Потоковая выгрузка текстов сообщений для отправки должникам',
+            response_class=StreamingResponse,
+            status_code=status.HTTP_200_OK
+        )
+async def stream_message_body_for_all_debtors(
+        building_project_name: Optional[str] = None,
+        letters_format: DebtorLettersFormatEnum = DebtorLettersFormatEnum.NDJSON,
+        ap_controller: ApartmentController = Depends(get_apartment_controller),  # type: ignore
+        main_controller: AssistantController = Depends(get_assistant_controller)
+) -> StreamingResponse:
+    """
+    Массовое формирование уведомлений о долге по определенному ЖК либо по всем ЖК, если building_project_name не
+    передан. Квартиры выбираются из БД порциями, уведомления отдаются по мере формирования: в формате NDJSON
+    (по одному JSON объекту на строку) либо zip архивом текстовых файлов, названных по id дома и лицевому счету.
+    """
+    apartments_chunks = ap_controller.stream_apartments_full_data_with_debt_by_project_name(
+        chunk_size=app_settings.STREAM_CHUNK_SIZE,
+        building_project_name=building_project_name
+    )
+    if letters_format == DebtorLettersFormatEnum.ZIP:
+        return StreamingResponse(
+            content=iterate_zip_chunks(main_controller.stream_debtor_letter_files(apartments_chunks)),
+            media_type='application/zip',
+            headers={'Content-Disposition': 'attachment; filename="debtor_letters.zip"'}
+        )
+
+    return StreamingResponse(
+        content=iterate_ndjson_chunks(main_controller.stream_debtor_messages(apartments_chunks)),
+        media_type='application/x-ndjson'
+    )
+
+
 @assistant_router.api_router.get(
             path='/get_all_debtors_with_debt_analyse',
             summary='Получение списка должников с квартирами и данными о долге',
             response_model=List[DebtorInfoResponse],
             status_code=status.HTTP_200_OK
         )
-@cache(expire=60)
+@cache(expire=60, namespace=CacheNamespaceEnum.ASSISTANT.value)
+@single_flight(namespace=CacheNamespaceEnum.ASSISTANT.value)
 async def get_all_debtors_with_debt_analyse(
         building_project_name: Optional[str] = None,
-        ap_controller: ApartmentController = Depends(get_apartment_controller),  # type: ignore
         main_controller: AssistantController = Depends(get_assistant_controller)
 ) -> List[DebtorInfoResponse]:  # type: ignore[valid-type]
     """
     Поиск возможен по определенному ЖК либо по всем в целом.
     """
-    full_data_apart_dto = await ap_controller.get_apartments_full_data_with_debt_by_project_name(building_project_name)
-    dtos = main_controller.map_debtors_info_response(dtos=full_data_apart_dto, sort_flag=True)
-    await main_controller.send_tg_message_common_debt(dtos)
+    dtos = await main_controller.get_debtors_info(building_project_name)
+    main_controller.send_tg_message_common_debt(dtos, building_project_name)
     return dtos
+
+
+@assistant_router.api_router.get(
+            path='/debt_analytics',
+            summary='Аналитика задолженности по ЖК, домам, этажам, периодам и возрасту долга',
+            response_model=DebtAnalyticsResponse,
+            status_code=status.HTTP_200_OK
+        )
+@cache(expire=60, namespace=CacheNamespaceEnum.ASSISTANT.value)
+@single_flight(namespace=CacheNamespaceEnum.ASSISTANT.value)
+async def get_debt_analytics(
+        building_project_name: Optional[str] = None,
+        main_controller: AssistantController = Depends(get_assistant_controller)
+) -> DebtAnalyticsResponse:
+    """
+    Аналитика возможна по определенному ЖК либо по всем в целом.
+    """
+    return await main_controller.get_debt_analytics(building_project_name)
@@ -7,7 +7,9 @@ from typing import Type
 from fastapi import APIRouter
 from fastapi import params
 
+from src.enums import CacheNamespaceEnum
 from src.schemas.dtos import BaseSchema
+from src.utils.orjson_response import ORJSONResponse
 
 
 class BaseAbsRouter(ABC):
@@ -24,8 +26,10 @@ class BaseAbsRouter(ABC):
             short_schema_type: Type[BaseSchema],
             external_schema_type: Type[BaseSchema],
             cache_lifetime: int = 1,
+            cache_namespace: Optional[CacheNamespaceEnum] = None,
             has_authentication: bool = True,
-            dependencies: Optional[List[params.Depends]] = None
+            dependencies: Optional[List[params.Depends]] = None,
+            write_schema_type: Optional[Type[BaseSchema]] = None
     ):
         self._name = name
         self._description = description
@@ -36,13 +40,17 @@ class BaseAbsRouter(ABC):
         self._api_router = APIRouter(
             prefix=router_prefix,
             dependencies=dependencies,
+            default_response_class=ORJSONResponse,
         )
         self._controller_dependency = controller_dependency
         self._short_schema_type = short_schema_type
         self._external_schema_type = external_schema_type
+        # схема тела запросов создания/обновления, если отличается от схемы ответа
+        self._write_schema_type = write_schema_type or external_schema_type
         self._short_list_response_type = List[short_schema_type]  # type: ignore[valid-type]
         self._external_list_response_type = List[external_schema_type]  # type: ignore[valid-type]
         self._cache_lifetime = cache_lifetime
+        self._cache_namespace = cache_namespace
 
         # Добавление путей в роутер
         self.add_custom_routes()  # в кастомных могут быть пересечения с get /{id}, такой порядок их исключает
@@ -82,6 +90,10 @@ class BaseAbsRouter(ABC):
     def external_schema_type(self) -> Type[BaseSchema]:
         return self._external_schema_type
 
+    @property
+    def write_schema_type(self) -> Type[BaseSchema]:
+        return self._write_schema_type
+
     @property
     def short_list_response_type(
             self
@@ -98,6 +110,13 @@ class BaseAbsRouter(ABC):
     def cache_lifetime(self) -> int:
         return self._cache_lifetime
 
+    @property
+    def cache_namespace(self) -> str:
+        """
+        Пространство имен ключей кеша ответов роутера, по нему сбрасывается кеш при записи через контроллер.
+        """
+        return self._cache_namespace.value if self._cache_namespace else ''
+
     @abstractmethod
     def add_routes(self) -> None:
         """
@@ -4,15 +4,22 @@ from typing import Optional
 from typing import Type
 
 from fastapi import Path
+from fastapi import Query
 from fastapi import Request
 from fastapi import params
 from fastapi import status
+from fastapi.responses import StreamingResponse
 from fastapi_cache.decorator import cache
 
+from settings import app_settings
+from src.cache import single_flight
 from src.controllers import BaseController
 from src.enums import BaseMessageEnum
+from src.enums import CacheNamespaceEnum
 from src.logger import AppLogger
 from src.schemas.dtos import BaseSchema
+from src.utils.common import iterate_ndjson_chunks
+from src.utils.orjson_response import ORJSONResponse
 from .base_abs_router import BaseAbsRouter
 
 
@@ -29,9 +36,11 @@ class BaseRouter(BaseAbsRouter):
             controller_dependency: params.Depends,
             short_schema_type: Type[BaseSchema],
             external_schema_type: Type[BaseSchema],
-            cache_lifetime: int = 60,
+            cache_lifetime: int = app_settings.CACHE_ENTITY_EXPIRE,
+            cache_namespace: Optional[CacheNamespaceEnum] = None,
             has_authentication: bool = True,
-            dependencies: Optional[List[params.Depends]] = None
+            dependencies: Optional[List[params.Depends]] = None,
+            write_schema_type: Optional[Type[BaseSchema]] = None
     ):
         super().__init__(
             router_prefix=router_prefix,
@@ -41,19 +50,25 @@ class BaseRouter(BaseAbsRouter):
             short_schema_type=short_schema_type,
             external_schema_type=external_schema_type,
             cache_lifetime=cache_lifetime,
+            cache_namespace=cache_namespace,
             has_authentication=has_authentication,
-            dependencies=dependencies
+            dependencies=dependencies,
+            write_schema_type=write_schema_type
         )
 
     def add_routes(self):
         AppLogger.debug(f'Add routes for admin router: {self.name}')
 
         external_schema_type = self.external_schema_type
+        write_schema_type = self.write_schema_type
         short_list_response_type = self.short_list_response_type
         external_list_response_type = self.external_list_response_type
         controller_dependency = self.controller_dependency
 
         object_id_path = Path(alias='id', title='Идентификатор объекта', ge=1, examples=[1])
+        after_id_query = Query(default=None, title='ID последнего объекта предыдущей страницы', ge=0, examples=[0])
+        limit_query = Query(default=None, title='Максимальное кол-во объектов на странице', ge=1, examples=[100])
+        objects_ids_query = Query(title='Идентификаторы объектов', min_length=1, examples=[[1, 2]])
 
         @self.api_router.put(
             path='',
@@ -62,15 +77,16 @@ class BaseRouter(BaseAbsRouter):
             status_code=status.HTTP_200_OK
         )
         async def upsert(
-                external_dto: external_schema_type,  # type: ignore[valid-type]
+                external_dto: write_schema_type,  # type: ignore[valid-type]
                 controller: BaseController = controller_dependency  # type: ignore
-        ) -> external_schema_type:  # type: ignore[valid-type]
+        ) -> ORJSONResponse:
             """
             Создание/обновление объекта в БД.
             """
 
-            return await controller.upsert(  # type: ignore[no-any-return]
-                external_schema=external_dto
+            return ORJSONResponse.from_model(
+                content=await controller.upsert(external_schema=external_dto),
+                content_type=external_schema_type
             )
 
         @self.api_router.put(
@@ -80,14 +96,17 @@ class BaseRouter(BaseAbsRouter):
             status_code=status.HTTP_200_OK
         )
         async def upsert_many(
-                external_dto_list: List[external_schema_type],  # type: ignore[valid-type]
+                external_dto_list: List[write_schema_type],  # type: ignore[valid-type]
                 controller: BaseController = controller_dependency  # type: ignore
-        ) -> external_list_response_type:  # type: ignore[valid-type]
+        ) -> ORJSONResponse:
             """
             Создание/обновление списка объектов в БД.
             """
 
-            return await controller.upsert_many(external_schemas_list=external_dto_list)
+            return ORJSONResponse.from_model(
+                content=await controller.upsert_many(external_schemas_list=external_dto_list),
+                content_type=short_list_response_type
+            )
 
         @self.api_router.get(
             path='/all_full',
@@ -95,16 +114,23 @@ class BaseRouter(BaseAbsRouter):
             response_model=self.external_list_response_type,
             status_code=status.HTTP_200_OK
         )
-        @cache(expire=self.cache_lifetime)
+        @cache(expire=self.cache_lifetime, namespace=self.cache_namespace)
+        @single_flight(namespace=self.cache_namespace)
         async def get_all_full(
                 _: Request,  # Необходимо из-за специфики работы fastapi_cache
+                after_id: Optional[int] = after_id_query,
+                limit: Optional[int] = limit_query,
                 controller: BaseController = controller_dependency  # type: ignore
-        ) -> external_list_response_type:  # type: ignore[valid-type]
+        ) -> ORJSONResponse:
             """
             Выборка полных DTO объектов из БД.
+            Для постраничной выборки передаются after_id (id последнего объекта предыдущей страницы) и limit.
             """
 
-            return await controller.get_all_full()
+            return ORJSONResponse.from_model(
+                content=await controller.get_all_full(after_id=after_id, limit=limit),
+                content_type=external_list_response_type
+            )
 
         @self.api_router.get(
             path='/all_short',
@@ -112,16 +138,81 @@ class BaseRouter(BaseAbsRouter):
             response_model=self.short_list_response_type,
             status_code=status.HTTP_200_OK
         )
-        @cache(expire=self.cache_lifetime)
+        @cache(expire=self.cache_lifetime, namespace=self.cache_namespace)
+        @single_flight(namespace=self.cache_namespace)
         async def get_all_short(
                 _: Request,  # Необходимо из-за специфики работы fastapi_cache
+                after_id: Optional[int] = after_id_query,
+                limit: Optional[int] = limit_query,
                 controller: BaseController = controller_dependency  # type: ignore
-        ) -> short_list_response_type:  # type: ignore[valid-type]
+        ) -> ORJSONResponse:
             """
             Выборка кратких DTO объектов из БД.
+            Для постраничной выборки передаются after_id (id последнего объекта предыдущей страницы) и limit.
             """
 
-            return await controller.get_all_short()
+            return ORJSONResponse.from_model(
+                content=await controller.get_all_short(after_id=after_id, limit=limit),
+                content_type=short_list_response_type
+            )
+
+        @self.api_router.get(
+            path='/all_full/stream',
+            summary='Потоковая выгрузка полных объектов в формате NDJSON',
+            response_class=StreamingResponse,
+            status_code=status.HTTP_200_OK
+        )
+        async def stream_all_full(
+                controller: BaseController = controller_dependency  # type: ignore
+        ) -> StreamingResponse:
+            """
+            Выгрузка всех полных DTO объектов из БД порциями, по одному JSON объекту на строку.
+            """
+
+            return StreamingResponse(
+                content=iterate_ndjson_chunks(controller.stream_all_full(chunk_size=app_settings.STREAM_CHUNK_SIZE)),
+                media_type='application/x-ndjson'
+            )
+
+        @self.api_router.get(
+            path='/all_short/stream',
+            summary='Потоковая выгрузка кратких объектов в формате NDJSON',
+            response_class=StreamingResponse,
+            status_code=status.HTTP_200_OK
+        )
+        async def stream_all_short(
+                controller: BaseController = controller_dependency  # type: ignore
+        ) -> StreamingResponse:
+            """
+            Выгрузка всех кратких DTO объектов из БД порциями, по одному JSON объекту на строку.
+            """
+
+            return StreamingResponse(
+                content=iterate_ndjson_chunks(controller.stream_all_short(chunk_size=app_settings.STREAM_CHUNK_SIZE)),
+                media_type='application/x-ndjson'
+            )
+
+        @self.api_router.get(
+            path='/many',
+            summary='Получение списка объектов по ID',
+            response_model=self.external_list_response_type,
+            status_code=status.HTTP_200_OK
+        )
+        @cache(expire=self.cache_lifetime, namespace=self.cache_namespace)
+        @single_flight(namespace=self.cache_namespace)
+        async def get_many_by_ids(
+                _: Request,  # Необходимо из-за специфики работы fastapi_cache
+                objects_ids: List[int] = objects_ids_query,
+                controller: BaseController = controller_dependency  # type: ignore
+        ) -> ORJSONResponse:
+            """
+            Выборка DTO объектов из БД по списку ID одним запросом. Ненайденные объекты пропускаются.
+            """
+
+            return ORJSONResponse.from_model(
+                content=await controller.get_many_by_ids(objects_ids=objects_ids),
+                content_type=external_list_response_type
+            )
 
         @self.api_router.get(
             path='/{id}',
@@ -145,18 +236,20 @@ class BaseRouter(BaseAbsRouter):
                 },
             }
         )
-        @cache(expire=self.cache_lifetime)
+        @cache(expire=self.cache_lifetime, namespace=self.cache_namespace)
+        @single_flight(namespace=self.cache_namespace)
         async def get_one_by_id(
                 _: Request,  # Необходимо из-за специфики работы fastapi_cache
                 object_id: int = object_id_path,
                 controller: BaseController = controller_dependency  # type: ignore
-        ) -> external_schema_type:  # type: ignore[valid-type]
+        ) -> ORJSONResponse:
             """
             Выборка одного DTO объекта из БД через метод сессии.
             """
 
-            return await controller.get_one_by_id(  # type: ignore[no-any-return]
-                object_id=object_id
+            return ORJSONResponse.from_model(
+                content=await controller.get_one_by_id(object_id=object_id),
+                content_type=external_schema_type
             )
 
         @self.api_router.delete(
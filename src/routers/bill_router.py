@@ -1,7 +1,9 @@
 from fastapi import Depends
 
 from src.dependencies.controller_dependencies import get_bill_controller
+from src.enums import CacheNamespaceEnum
 from src.schemas.dtos import BillDto
+from src.schemas.dtos import BillWriteDto
 from .base_router import BaseRouter
 
 bill_router = BaseRouter(
@@ -11,5 +13,7 @@ bill_router = BaseRouter(
     controller_dependency=Depends(get_bill_controller),
     short_schema_type=BillDto,
     external_schema_type=BillDto,
+    write_schema_type=BillWriteDto,
+    cache_namespace=CacheNamespaceEnum.BILL,
     has_authentication=True
 )
@@ -1,6 +1,7 @@
 from fastapi import Depends
 
 from src.dependencies.controller_dependencies import get_building_controller
+from src.enums import CacheNamespaceEnum
 from src.schemas.dtos import BuildingDto
 from .base_router import BaseRouter
 
@@ -11,5 +12,6 @@ building_router = BaseRouter(
     controller_dependency=Depends(get_building_controller),
     short_schema_type=BuildingDto,
     external_schema_type=BuildingDto,
+    cache_namespace=CacheNamespaceEnum.BUILDING,
     has_authentication=True
 )
@@ -1,6 +1,7 @@
 from fastapi import Depends
 
 from src.dependencies.controller_dependencies import get_owner_controller
+from src.enums import CacheNamespaceEnum
 from src.schemas.dtos import OwnerDto
 from src.schemas.dtos import OwnerFullDto
 from .base_router import BaseRouter
@@ -12,5 +13,6 @@ owner_router = BaseRouter(
     controller_dependency=Depends(get_owner_controller),
     short_schema_type=OwnerDto,
     external_schema_type=OwnerFullDto,
+    cache_namespace=CacheNamespaceEnum.OWNER,
     has_authentication=True
 )
@@ -0,0 +1,59 @@
+from fastapi import status
+
+from src.dependencies.common import engine
+from src.dependencies.metered_pool import MeteredAsyncAdaptedQueuePool
+from src.dependencies.statement_cache_metrics import statement_cache_metrics
+from src.middleware.auth.depends import password_hashing_service
+from src.schemas.responses import DbPoolStatsResponse
+from src.schemas.responses import PasswordHashingStatsResponse
+from src.schemas.responses import StatementCacheStatsResponse
+from .unique_router import UniqueRouter
+
+service_router = UniqueRouter(
+    router_prefix='/service',
+    name='Service',
+    description='Служебные методы для мониторинга приложения',
+    has_authentication=True,
+    dependencies=[]
+)
+
+
+@service_router.api_router.get(
+    path='/db_pool_stats',
+    summary='Получение метрик пула соединений с БД',
+    response_model=DbPoolStatsResponse,
+    status_code=status.HTTP_200_OK
+)
+async def get_db_pool_stats() -> DbPoolStatsResponse:
+    """
+    Занятые, свободные и дополнительные соединения пула, среднее и максимальное время ожидания соединения,
+    кол-во таймаутов ожидания.
+    """
+    return MeteredAsyncAdaptedQueuePool.metrics.get_stats(pool=engine.pool)  # type: ignore[arg-type]
+
+
+@service_router.api_router.get(
+    path='/statement_cache_stats',
+    summary='Получение метрик кеша скомпилированных SQL выражений',
+    response_model=StatementCacheStatsResponse,
+    status_code=status.HTTP_200_OK
+)
+async def get_statement_cache_stats() -> StatementCacheStatsResponse:
+    """
+    Заполненность кеша скомпилированных SQL выражений SQLAlchemy, кол-во попаданий и промахов, доля попаданий.
+    """
+    return statement_cache_metrics.get_stats(sync_engine=engine.sync_engine)
+
+
+@service_router.api_router.get(
+    path='/password_hashing_stats',
+    summary='Получение метрик пула хеширования паролей',
+    response_model=PasswordHashingStatsResponse,
+    status_code=status.HTTP_200_OK
+)
+async def get_password_hashing_stats() -> PasswordHashingStatsResponse:
+    """
+    Размер пула bcrypt и очереди, кол-во выполняемых, ожидающих, завершенных и отклоненных по таймауту проверок,
+    среднее время ожидания места в пуле и среднее время хеширования.
+    """
+    return password_hashing_service.get_stats()
@@ -4,6 +4,8 @@ from typing import Optional
 from fastapi import APIRouter
 from fastapi.params import Depends
 
+from src.utils.orjson_response import ORJSONResponse
+
 
 class UniqueRouter:
     """
@@ -35,6 +37,7 @@ class UniqueRouter:
         self._api_router = APIRouter(
             prefix=router_prefix,
             dependencies=dependencies,
+            default_response_class=ORJSONResponse,
         )
 
     @property
@@ -5,6 +5,7 @@ from .apartment_shema import ApartmentSchema
 from .base_schema import BaseSchema
 from .bill_dto import BillDto
 from .bill_schema import BillSchema
+from .bill_write_dto import BillWriteDto
 from .building_dto import BuildingDto
 from .building_full_dto import BuildingFullDto
 from .owner_dto import OwnerDto
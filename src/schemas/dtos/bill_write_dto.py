@@ -0,0 +1,37 @@
+from datetime import datetime
+
+from pydantic import field_validator
+
+from settings import app_settings
+from src.enums import BaseMessageEnum
+from src.exceptions.base_response_with_data import BaseResponseErrorWithData
+from .bill_dto import BillDto
+from .error_schema import ErrorSchema
+
+
+class BillWriteDto(BillDto):
+    """
+    Счет в запросе на создание/обновление. Период приводится к BILL_PERIOD_FORMAT.
+    """
+
+    @field_validator('bill_period', mode='before')
+    @classmethod
+    def get_bill_period_validation(cls, data: str) -> str:
+        """
+        Приведение периода к формату BILL_PERIOD_FORMAT (2024-01): по строкам этого формата БД находит самый ранний
+        период обычным сравнением строк.
+        """
+        try:
+            return datetime.strptime(str(data).strip(), app_settings.BILL_PERIOD_FORMAT).strftime(
+                app_settings.BILL_PERIOD_FORMAT
+            )
+        except ValueError:
+            raise BaseResponseErrorWithData(
+                message=BaseMessageEnum.VALIDATION_ERROR_MESSAGE,
+                code=422,
+                data=ErrorSchema(
+                    wrong_data_key='bill_period',
+                    data=data,
+                    reason=f'Период начисления должен быть в формате {app_settings.BILL_PERIOD_FORMAT}'
+                )
+            )
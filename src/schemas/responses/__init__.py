@@ -1,3 +1,9 @@
 from .apartment_full_response import ApartmentFullResponse
+from .db_pool_stats_response import DbPoolStatsResponse
+from .debt_analytics_response import DebtAnalyticsResponse
+from .debt_group_schema import DebtGroupSchema
+from .debt_percentile_schema import DebtPercentileSchema
 from .debtor_info_response import DebtorInfoResponse
 from .debtor_message_response import DebtorMessageResponse
+from .password_hashing_stats_response import PasswordHashingStatsResponse
+from .statement_cache_stats_response import StatementCacheStatsResponse
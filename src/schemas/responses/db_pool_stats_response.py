@@ -0,0 +1,16 @@
+from src.schemas.dtos import BaseSchema
+
+
+class DbPoolStatsResponse(BaseSchema):
+    """
+    Метрики пула соединений с БД.
+    """
+    pool_size: int
+    max_overflow: int
+    checked_out: int
+    checked_in: int
+    overflow: int
+    acquired: int
+    timeouts: int
+    avg_wait_ms: float
+    max_wait_ms: float
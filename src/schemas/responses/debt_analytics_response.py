@@ -0,0 +1,24 @@
+from typing import List
+
+from pydantic import Field
+
+from src.schemas.dtos import BaseSchema
+from .debt_group_schema import DebtGroupSchema
+from .debt_percentile_schema import DebtPercentileSchema
+
+
+class DebtAnalyticsResponse(BaseSchema):
+    """
+    Аналитика задолженности по неоплаченным счетам.
+    """
+    total_debt: float = Field(description='Общая сумма задолженности')
+    bills_count: int = Field(description='Кол-во неоплаченных счетов')
+    apartments_count: int = Field(description='Кол-во квартир с задолженностью')
+    apartment_debt_percentiles: List[DebtPercentileSchema] = Field(
+        description='Перцентили задолженности по квартирам'
+    )
+    by_project: List[DebtGroupSchema] = Field(description='Задолженность по ЖК, по убыванию')
+    by_building: List[DebtGroupSchema] = Field(description='Задолженность по домам, по убыванию')
+    by_floor: List[DebtGroupSchema] = Field(description='Задолженность по этажам')
+    by_period: List[DebtGroupSchema] = Field(description='Задолженность по периодам начисления')
+    by_age_bucket: List[DebtGroupSchema] = Field(description='Задолженность по возрасту долга в месяцах')
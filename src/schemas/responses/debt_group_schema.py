@@ -0,0 +1,13 @@
+from pydantic import Field
+
+from src.schemas.dtos import BaseSchema
+
+
+class DebtGroupSchema(BaseSchema):
+    """
+    Задолженность по одной группе разреза аналитики.
+    """
+    key: str = Field(description='Значение группы: ЖК, адрес дома, этаж, период или возраст долга')
+    debt: float = Field(description='Сумма задолженности')
+    bills_count: int = Field(description='Кол-во неоплаченных счетов')
+    apartments_count: int = Field(description='Кол-во квартир с задолженностью')
@@ -0,0 +1,11 @@
+from pydantic import Field
+
+from src.schemas.dtos import BaseSchema
+
+
+class DebtPercentileSchema(BaseSchema):
+    """
+    Перцентиль задолженности по квартирам.
+    """
+    percentile: float = Field(description='Перцентиль, %')
+    debt: float = Field(description='Задолженность квартиры на уровне перцентиля')
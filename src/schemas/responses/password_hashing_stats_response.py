@@ -0,0 +1,15 @@
+from src.schemas.dtos import BaseSchema
+
+
+class PasswordHashingStatsResponse(BaseSchema):
+    """
+    Метрики пула хеширования паролей.
+    """
+    max_workers: int
+    max_pending: int
+    in_flight: int
+    waiting: int
+    completed: int
+    rejected: int
+    avg_queue_wait_ms: float
+    avg_hashing_ms: float
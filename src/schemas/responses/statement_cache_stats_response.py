@@ -0,0 +1,13 @@
+from src.schemas.dtos import BaseSchema
+
+
+class StatementCacheStatsResponse(BaseSchema):
+    """
+    Метрики кеша скомпилированных SQL выражений SQLAlchemy.
+    """
+    cache_size: int
+    cache_capacity: int
+    hits: int
+    misses: int
+    not_cached: int
+    hit_rate: float
@@ -1 +1,7 @@
+from .depends import close_telegram_bot
 from .depends import get_telegram_bot
+from .depends import init_telegram_bot
+from .telegram_bot import TelegramBot
+from .telegram_delivery_report_dto import TelegramDeliveryReportDto
+from .telegram_notification_queue import TelegramNotificationQueue
+from .telegram_notification_queue import telegram_notification_queue
@@ -1,8 +1,45 @@
+from typing import Optional
+
+from settings import app_settings
 from .telegram_bot import TelegramBot
 
+_telegram_bot: Optional[TelegramBot] = None
+
+
+async def init_telegram_bot() -> TelegramBot:
+    """
+    Создание экземпляра бота на все время работы приложения. Вызывается при старте приложения.
 
-async def get_telegram_bot(token: str) -> TelegramBot:
+    :return: Экземпляр бота.
+    """
+    global _telegram_bot
+    if _telegram_bot is None:
+        _telegram_bot = TelegramBot(
+            token=app_settings.TG_BOT_TOKEN,
+            global_rate=app_settings.TG_GLOBAL_RATE,
+            per_chat_rate=app_settings.TG_PER_CHAT_RATE,
+            max_concurrency=app_settings.TG_MAX_CONCURRENCY,
+            max_retries=app_settings.TG_MAX_RETRIES,
+        )
+
+    return _telegram_bot
+
+
+async def get_telegram_bot() -> TelegramBot:
     """
     Зависимость для получения экземпляра aiogram бота.
+    Если бот не был создан при старте приложения, он создается при первом обращении.
+    """
+    return await init_telegram_bot()
+
+
+async def close_telegram_bot() -> None:
+    """
+    Закрытие HTTP сессии бота при остановке приложения.
+
+    :return: None.
     """
-    return TelegramBot(token=token)
+    global _telegram_bot
+    if _telegram_bot is not None:
+        await _telegram_bot.close()
+        _telegram_bot = None
@@ -1,21 +1,129 @@
+import asyncio
+from time import perf_counter
 from typing import List
 
 from aiogram import Bot
+from aiogram.exceptions import TelegramNetworkError
+from aiogram.exceptions import TelegramRetryAfter
 
 from src.logger import AppLogger
+from src.utils.ttl_lru_cache import TtlLruCache
+from .telegram_delivery_report_dto import TelegramDeliveryReportDto
+from .token_bucket import TokenBucket
 
 
 class TelegramBot:
     """
     Телеграм бот в объеме функционала, необходимого для только лишь отправки ботами сообщений в чаты.
+    Экземпляр живет все время работы приложения и переиспользует HTTP сессию aiogram.
+    Частота отправки ограничивается общим лимитом бота и лимитом на каждый чат, при ответе Telegram с retry_after
+    отправка всех сообщений приостанавливается на указанное время и повторяется.
     """
-    def __init__(self, token):
+    def __init__(
+            self,
+            token: str,
+            global_rate: float = 25.0,
+            per_chat_rate: float = 1.0,
+            max_concurrency: int = 20,
+            max_retries: int = 3
+    ):
+        """
+        :param token: Токен бота.
+        :param global_rate: Макс. кол-во сообщений в секунду во все чаты.
+        :param per_chat_rate: Макс. кол-во сообщений в секунду в один чат.
+        :param max_concurrency: Макс. кол-во одновременных запросов к Telegram при массовой отправке.
+        :param max_retries: Кол-во повторов отправки одного сообщения после retry_after или сетевой ошибки.
+        """
         self.bot = Bot(token=token)
+        self._global_bucket = TokenBucket(rate=global_rate, capacity=global_rate)
+        self._per_chat_rate = per_chat_rate
+        # лимиты чатов нужны, пока в чат идет отправка, поэтому хранятся ограниченное время
+        self._chat_buckets: TtlLruCache[str, TokenBucket] = TtlLruCache(max_size=100_000, ttl=60)
+        self._max_concurrency = max_concurrency
+        self._max_retries = max_retries
 
-    async def send_message(self, chat_id: str, message: str) -> None:
-        await self.bot.send_message(chat_id=chat_id, text=message)
+    def get_chat_bucket(self, chat_id: str) -> TokenBucket:
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            bucket = TokenBucket(rate=self._per_chat_rate)
+            self._chat_buckets.set(chat_id, bucket)
 
-    async def send_mass_messages(self, chat_ids: List[str], message: str) -> None:
-        for chat_id in chat_ids:
-            await self.bot.send_message(chat_id=chat_id, text=message)
-            AppLogger.info(f"В телегам чат c id: {chat_id} отправлено сообщение:\n'{message}'")
\ No newline at end of file
+        return bucket
+
+    async def send_message(self, chat_id: str, message: str) -> int:
+        """
+        Отправка сообщения в чат с учетом лимитов и повторами.
+
+        :param chat_id: ID чата.
+        :param message: Текст сообщения.
+        :return: Кол-во выполненных повторов.
+        """
+        retries = 0
+        while True:
+            await self.get_chat_bucket(chat_id).acquire()
+            await self._global_bucket.acquire()
+            try:
+                await self.bot.send_message(chat_id=chat_id, text=message)
+
+                return retries
+            except TelegramRetryAfter as exc:
+                if retries >= self._max_retries:
+                    raise
+
+                AppLogger.warning(f'Telegram flood limit, retry after {exc.retry_after} s, chat id: {chat_id}')
+                self._global_bucket.pause(exc.retry_after)
+            except TelegramNetworkError as exc:
+                if retries >= self._max_retries:
+                    raise
+
+                AppLogger.warning(f'Telegram network error, retry: {exc}, chat id: {chat_id}')
+                await asyncio.sleep(2 ** retries)
+
+            retries += 1
+
+    async def send_mass_messages(self, chat_ids: List[str], message: str) -> TelegramDeliveryReportDto:
+        """
+        Одновременная отправка сообщения в несколько чатов.
+        Ошибка отправки в один чат не прерывает отправку в остальные и попадает в отчет.
+
+        :param chat_ids: Список ID чатов.
+        :param message: Текст сообщения.
+        :return: Отчет о доставке.
+        """
+        started_at = perf_counter()
+        semaphore = asyncio.Semaphore(self._max_concurrency)
+        failed_chat_ids: List[str] = list()
+        retried = 0
+
+        async def send(chat_id: str) -> None:
+            nonlocal retried
+            async with semaphore:
+                try:
+                    chat_retries = await self.send_message(chat_id=chat_id, message=message)
+                    retried += chat_retries
+                    AppLogger.info(f"В телегам чат c id: {chat_id} отправлено сообщение:\n'{message}'")
+                except Exception as exc:
+                    AppLogger.error(f'Telegram send error, chat id: {chat_id}: {exc}')
+                    failed_chat_ids.append(chat_id)
+
+        await asyncio.gather(*(send(chat_id) for chat_id in chat_ids))
+
+        report = TelegramDeliveryReportDto(
+            total=len(chat_ids),
+            delivered=len(chat_ids) - len(failed_chat_ids),
+            failed=len(failed_chat_ids),
+            retried=retried,
+            failed_chat_ids=failed_chat_ids,
+            elapsed_ms=(perf_counter() - started_at) * 1000,
+        )
+        AppLogger.info(f'Telegram mass sending report: {report.model_dump()}')
+
+        return report
+
+    async def close(self) -> None:
+        """
+        Закрытие HTTP сессии бота.
+
+        :return: None.
+        """
+        await self.bot.session.close()
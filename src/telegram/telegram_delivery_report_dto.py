@@ -0,0 +1,15 @@
+from typing import List
+
+from src.schemas.dtos import BaseSchema
+
+
+class TelegramDeliveryReportDto(BaseSchema):
+    """
+    Итоги массовой отправки сообщений в телеграм.
+    """
+    total: int
+    delivered: int
+    failed: int
+    retried: int
+    failed_chat_ids: List[str]
+    elapsed_ms: float
@@ -0,0 +1,106 @@
+import asyncio
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from settings import app_settings
+from src.logger import AppLogger
+from src.utils.ttl_lru_cache import TtlLruCache
+from .depends import get_telegram_bot
+
+
+class TelegramNotificationQueue:
+    """
+    Очередь уведомлений в телеграм, которую разбирают фоновые asyncio воркеры.
+    Эндпойнты только ставят сообщение в очередь и не ждут ответа Telegram.
+    Сообщения с одинаковым ключом дедупликации в пределах окна отправляются один раз.
+    """
+
+    def __init__(self, max_size: int, workers_number: int, dedup_window: float):
+        """
+        :param max_size: Максимальное кол-во сообщений в очереди.
+        :param workers_number: Кол-во воркеров отправки.
+        :param dedup_window: Окно дедупликации в секундах.
+        """
+        self._queue: asyncio.Queue[Tuple[str, str]] = asyncio.Queue(maxsize=max_size)
+        self._workers_number = workers_number
+        self._dedup_keys: TtlLruCache[str, bool] = TtlLruCache(max_size=10_000, ttl=dedup_window)
+        self._workers: List[asyncio.Task[None]] = list()
+
+    def __len__(self) -> int:
+        return self._queue.qsize()
+
+    def enqueue(self, chat_id: str, message: str, dedup_key: Optional[str] = None) -> bool:
+        """
+        Постановка сообщения в очередь без ожидания отправки.
+
+        :param chat_id: ID чата.
+        :param message: Текст сообщения.
+        :param dedup_key: Ключ дедупликации, None - без дедупликации.
+        :return: Поставлено ли сообщение в очередь.
+        """
+        if dedup_key is not None:
+            if self._dedup_keys.get(dedup_key):
+                AppLogger.debug(f'Telegram notification is deduplicated: {dedup_key}')
+                return False
+
+        try:
+            self._queue.put_nowait((chat_id, message))
+        except asyncio.QueueFull:
+            AppLogger.error(f'Telegram notification queue is full, message is dropped, chat id: {chat_id}')
+            return False
+
+        if dedup_key is not None:
+            self._dedup_keys.set(dedup_key, True)
+
+        return True
+
+    async def work(self) -> None:
+        """
+        Цикл воркера: отправка сообщений из очереди до остановки.
+
+        :return: None.
+        """
+        while True:
+            chat_id, message = await self._queue.get()
+            try:
+                bot = await get_telegram_bot()
+                await bot.send_message(chat_id=chat_id, message=message)
+                AppLogger.info(f"В телегам чат c id: {chat_id} отправлено сообщение:\n'{message}'")
+            except Exception as exc:
+                AppLogger.error(f'Telegram notification error, chat id: {chat_id}: {exc}')
+            finally:
+                self._queue.task_done()
+
+    def start(self) -> None:
+        """
+        Запуск воркеров при старте приложения.
+
+        :return: None.
+        """
+        if not self._workers:
+            self._workers = [asyncio.create_task(self.work()) for _ in range(self._workers_number)]
+
+    async def stop(self, timeout: float) -> None:
+        """
+        Остановка воркеров при остановке приложения. Сообщения, оставшиеся в очереди, отправляются в пределах timeout.
+
+        :param timeout: Время ожидания отправки оставшихся сообщений в секундах.
+        :return: None.
+        """
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            AppLogger.warning(f'Telegram notification queue is stopped with {len(self)} unsent messages')
+
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = list()
+
+
+telegram_notification_queue = TelegramNotificationQueue(
+    max_size=app_settings.TG_QUEUE_SIZE,
+    workers_number=app_settings.TG_QUEUE_WORKERS,
+    dedup_window=app_settings.TG_DEDUP_WINDOW,
+)
@@ -0,0 +1,56 @@
+import asyncio
+from time import monotonic
+
+
+class TokenBucket:
+    """
+    Ограничитель частоты отправки по алгоритму token bucket.
+    Токены пополняются со скоростью rate в секунду до capacity, каждая отправка забирает один токен.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        """
+        :param rate: Кол-во токенов, добавляемых в секунду.
+        :param capacity: Максимальное кол-во накопленных токенов (допустимый всплеск).
+        """
+        self._rate = rate
+        self._capacity = capacity
+        self._tokens = capacity
+        self._updated_at = monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def refill(self, now: float) -> None:
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated_at) * self._rate)
+        self._updated_at = now
+
+    async def acquire(self) -> None:
+        """
+        Ожидание и получение одного токена. Ожидающие обслуживаются по очереди.
+
+        :return: None.
+        """
+        async with self._lock:
+            while True:
+                now = monotonic()
+                if self._paused_until > now:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+
+                self.refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) / self._rate)
+
+    def pause(self, seconds: float) -> None:
+        """
+        Приостановка выдачи токенов, например по retry_after от Telegram.
+
+        :param seconds: Длительность паузы в секундах.
+        :return: None.
+        """
+        self._paused_until = max(self._paused_until, monotonic() + seconds)
+        self._tokens = 0
+        self._updated_at = self._paused_until
@@ -0,0 +1,65 @@
+from io import RawIOBase
+from typing import AsyncGenerator
+from typing import AsyncIterable
+from typing import List
+from typing import Sequence
+from typing import Tuple
+from zipfile import ZIP_DEFLATED
+from zipfile import ZipFile
+
+from src.schemas.dtos import BaseSchema
+
+
+async def iterate_ndjson_chunks(
+        dtos_chunks: AsyncIterable[Sequence[BaseSchema]]
+) -> AsyncGenerator[str, None]:
+    """
+    Преобразование порций DTO в строки формата NDJSON (один JSON объект на строку).
+    Поля сериализуются по псевдонимам, как и в обычных ответах с response_model.
+
+    :param dtos_chunks: Асинхронный итератор списков DTO.
+    :return: Асинхронный генератор порций NDJSON.
+    """
+    async for dtos_list in dtos_chunks:
+        yield ''.join(f'{dto.model_dump_json(by_alias=True)}\n' for dto in dtos_list)
+
+
+class ZipChunksBuffer(RawIOBase):
+    """
+    Буфер для записи zip архива без перемотки: записанные байты забираются порциями и отправляются клиенту.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._chunks: List[bytes] = list()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: bytes) -> int:  # type: ignore[override]
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def pop_bytes(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks = list()
+        return data
+
+
+async def iterate_zip_chunks(
+        files_chunks: AsyncIterable[List[Tuple[str, str]]]
+) -> AsyncGenerator[bytes, None]:
+    """
+    Упаковка порций текстовых файлов в zip архив, который отдается клиенту по мере формирования.
+    В памяти находится только текущая порция файлов и ее сжатые данные.
+
+    :param files_chunks: Асинхронный итератор списков пар (имя файла, текст).
+    :return: Асинхронный генератор порций байт архива.
+    """
+    buffer = ZipChunksBuffer()
+    with ZipFile(buffer, mode='w', compression=ZIP_DEFLATED) as zip_file:
+        async for files_list in files_chunks:
+            for file_name, text in files_list:
+                zip_file.writestr(file_name, text)
+            yield buffer.pop_bytes()
+    yield buffer.pop_bytes()
@@ -0,0 +1,49 @@
+from string import Formatter
+from typing import Any
+from typing import List
+
+
+class CompiledTemplate:
+    """
+    Шаблон с позиционными полями {}, разобранный один раз при создании.
+    При подстановке значения склеиваются с заранее выделенными кусками текста одним join, без повторного
+    разбора шаблона, как при каждом вызове str.format. Поддерживаются только пустые поля {}.
+    """
+
+    def __init__(self, template: str):
+        """
+        :param template: Текст шаблона с полями {}.
+        """
+        self._literals: List[str] = list()  # текст перед каждым полем и после последнего поля
+        self._fields_number = 0
+        for literal, field_name, format_spec, conversion in Formatter().parse(template):
+            if field_name or format_spec or conversion:
+                raise ValueError(f'Only empty positional fields are supported in template: {field_name}')
+
+            self._literals.append(literal)
+            if field_name is not None:
+                self._fields_number += 1
+        if len(self._literals) == self._fields_number:
+            self._literals.append('')
+
+    @property
+    def fields_number(self) -> int:
+        return self._fields_number
+
+    def render(self, *values: Any) -> str:
+        """
+        Подстановка значений в поля шаблона по порядку.
+
+        :param values: Значения полей.
+        :return: Текст.
+        """
+        if len(values) != self._fields_number:
+            raise ValueError(f'Template expects {self._fields_number} values, got {len(values)}')
+
+        parts: List[str] = list()
+        for literal, value in zip(self._literals, values):
+            parts.append(literal)
+            parts.append(str(value))
+        parts.append(self._literals[-1])
+
+        return ''.join(parts)
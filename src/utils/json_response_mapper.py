@@ -1,12 +1,12 @@
 from traceback import format_exc
 
 from fastapi import status
-from fastapi.responses import JSONResponse
 from pydantic import ValidationError as PydanticValidationError
 
 from src.logger import AppLogger
 from src.exceptions import BaseResponseError
 from src.exceptions import BaseResponseErrorWithData
+from .orjson_response import ORJSONResponse
 
 
 class JsonResponseMapper:
@@ -15,7 +15,7 @@ class JsonResponseMapper:
     """
 
     @staticmethod
-    async def get_from_base_response_error(exception: BaseResponseError, message: str) -> JSONResponse:
+    async def get_from_base_response_error(exception: BaseResponseError, message: str) -> ORJSONResponse:
         """
         Возвращает JSON ответ с сообщением об ошибке для базового исключения.
 
@@ -25,7 +25,7 @@ class JsonResponseMapper:
         """
         AppLogger.error(f'Mapping http error json response: {exception}')
 
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=exception.code,
             content={
                 'message': message,
@@ -36,7 +36,7 @@ class JsonResponseMapper:
     async def get_from_base_response_error_with_data(
             exception: BaseResponseErrorWithData,
             message: str
-    ) -> JSONResponse:
+    ) -> ORJSONResponse:
         """
         Возвращает JSON ответ с сообщением об ошибке для исключения с данными.
 
@@ -58,10 +58,10 @@ class JsonResponseMapper:
         }
         content.update(exception.data.model_dump())
 
-        return JSONResponse(status_code=exception.code, content=content)
+        return ORJSONResponse(status_code=exception.code, content=content)
 
     @staticmethod
-    async def get_from_pydantic_validation_error(pydantic_validation_error: PydanticValidationError) -> JSONResponse:
+    async def get_from_pydantic_validation_error(pydantic_validation_error: PydanticValidationError) -> ORJSONResponse:
         """
         Возвращает JSON ответ с сообщением об ошибке для Pydantic исключения.
 
@@ -88,13 +88,13 @@ class JsonResponseMapper:
         if len(validation_errors_list) == 1:
             validation_errors_list[0]['message'] = default_description
 
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             content=validation_errors_list
         )
 
     @staticmethod
-    async def get_from_exception(exception: Exception) -> JSONResponse:
+    async def get_from_exception(exception: Exception) -> ORJSONResponse:
         """
         Возвращает JSON ответ с сообщением об ошибке для внештатного исключения.
 
@@ -105,7 +105,7 @@ class JsonResponseMapper:
 
         exception_traceback = format_exc(limit=1).replace('\\n', '')
 
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             content={
                 'message': f'{exception.__class__.__name__}: {exception} {exception_traceback}',
@@ -0,0 +1,63 @@
+from functools import lru_cache
+from typing import Any
+
+from orjson import OPT_NON_STR_KEYS
+from orjson import dumps
+from pydantic import BaseModel
+from pydantic import TypeAdapter
+from starlette.responses import JSONResponse
+
+
+def serialize_default(obj: Any) -> Any:
+    """
+    Сериализация типов, которые orjson не поддерживает сам.
+
+    :param obj: Объект.
+    :return: Представление объекта, пригодное для JSON.
+    """
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode='json', by_alias=True)
+
+    raise TypeError(f'Type is not JSON serializable: {type(obj).__name__}')
+
+
+@lru_cache(maxsize=None)
+def get_type_adapter(content_type: Any) -> TypeAdapter[Any]:
+    """
+    Получение адаптера Pydantic для типа ответа. Схема сериализации строится один раз на тип.
+
+    :param content_type: Тип ответа (схема или List[схема]).
+    :return: Адаптер типа.
+    """
+    return TypeAdapter(content_type)
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON ответ, сериализуемый orjson. Готовые байты JSON отдаются как есть.
+    Ответы со схемами Pydantic собираются через from_model сразу в байты сериализатором Pydantic: FastAPI
+    получает готовый ответ и не выполняет повторную валидацию по response_model и jsonable_encoder.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+
+        return dumps(content, default=serialize_default, option=OPT_NON_STR_KEYS)
+
+    @classmethod
+    def from_model(cls, content: Any, content_type: Any, status_code: int = 200) -> 'ORJSONResponse':
+        """
+        Сборка ответа из DTO с сериализацией по объявленному типу ответа.
+        Как и response_model FastAPI, тип ответа определяет набор полей: лишние поля наследников схемы
+        в ответ не попадают.
+
+        :param content: DTO или список DTO.
+        :param content_type: Тип ответа (схема или List[схема]).
+        :param status_code: HTTP статус ответа.
+        :return: Ответ.
+        """
+        return cls(
+            content=get_type_adapter(content_type).dump_json(content, by_alias=True),
+            status_code=status_code
+        )
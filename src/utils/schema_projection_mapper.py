@@ -0,0 +1,150 @@
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Tuple
+from typing import Type
+
+from pydantic import BaseModel
+
+from .trusted_dto_mapper import TrustedDtoMapper
+
+
+class SchemaProjectionMapper:
+    """
+    Преобразование DTO одной схемы в DTO другой схемы для слоя контроллеров.
+    Способ преобразования выбирается один раз на пару (исходная схема, целевая схема):
+        - схемы совпадают - объект передается как есть;
+        - схемы совместимы - значения полей целевой схемы переносятся из исходного DTO без валидации;
+        - иначе - целевая схема валидирует исходный DTO по атрибутам (from_attributes), без промежуточного словаря.
+    Схемы совместимы, если исходная схема - наследник целевой (значения уже прошли ее валидаторы), либо если все
+    поля целевой схемы есть в исходной с теми же типами и ограничениями, а у целевой схемы нет своих валидаторов.
+    """
+
+    PASS_THROUGH = 'pass_through'
+    PROJECTION = 'projection'
+    VALIDATION = 'validation'
+
+    _mappers: Dict[Tuple[type, type], 'SchemaProjectionMapper'] = dict()
+
+    def __init__(self, source_type: Type[BaseModel], target_type: Type[BaseModel]):
+        """
+        :param source_type: Класс исходной схемы.
+        :param target_type: Класс целевой схемы.
+        """
+        self._source_type = source_type
+        self._target_type = target_type
+        self._fields_names = tuple(target_type.model_fields)
+        self._mode = self.choose_mode(source_type=source_type, target_type=target_type)
+        self._trusted_mapper = TrustedDtoMapper.get(target_type) if self._mode == self.PROJECTION else None
+
+    @classmethod
+    def get(cls, source_type: Type[BaseModel], target_type: Type[BaseModel]) -> 'SchemaProjectionMapper':
+        """
+        Получение маппера для пары схем. Маппер создается при первом обращении.
+
+        :param source_type: Класс исходной схемы.
+        :param target_type: Класс целевой схемы.
+        :return: Маппер.
+        """
+        key = (source_type, target_type)
+        mapper = cls._mappers.get(key)
+        if mapper is None:
+            mapper = cls._mappers[key] = cls(source_type=source_type, target_type=target_type)
+
+        return mapper
+
+    @staticmethod
+    def has_validators(schema_type: Type[BaseModel]) -> bool:
+        """
+        Проверка наличия у схемы валидаторов полей или модели.
+
+        :param schema_type: Класс схемы.
+        :return: Логическое значение.
+        """
+        decorators = schema_type.__pydantic_decorators__
+        return bool(decorators.validators or decorators.field_validators or decorators.model_validators)
+
+    @classmethod
+    def choose_mode(cls, source_type: Type[BaseModel], target_type: Type[BaseModel]) -> str:
+        """
+        Выбор способа преобразования для пары схем.
+
+        :param source_type: Класс исходной схемы.
+        :param target_type: Класс целевой схемы.
+        :return: Способ преобразования.
+        """
+        if source_type is target_type:
+            return cls.PASS_THROUGH
+
+        if issubclass(source_type, target_type):
+            return cls.PROJECTION
+
+        if cls.has_validators(target_type):
+            return cls.VALIDATION
+
+        source_fields = source_type.model_fields
+        for field_name, field_info in target_type.model_fields.items():
+            source_field_info = source_fields.get(field_name)
+            if (
+                    source_field_info is None
+                    or source_field_info.annotation != field_info.annotation
+                    or source_field_info.metadata != field_info.metadata
+            ):
+                return cls.VALIDATION
+
+        return cls.PROJECTION
+
+    @property
+    def source_type(self) -> Type[BaseModel]:
+        return self._source_type
+
+    @property
+    def target_type(self) -> Type[BaseModel]:
+        return self._target_type
+
+    @property
+    def mode(self) -> str:
+        return self._mode
+
+    def map(self, obj: Any) -> Any:
+        """
+        Преобразование DTO исходной схемы в DTO целевой схемы.
+        DTO другого класса (например, наследника исходной схемы) преобразуется маппером своей пары схем.
+
+        :param obj: Исходный DTO.
+        :return: DTO целевой схемы.
+        """
+        if type(obj) is not self._source_type:
+            return self.get(source_type=type(obj), target_type=self._target_type).map(obj)
+
+        if self._mode == self.PASS_THROUGH:
+            return obj
+
+        if self._trusted_mapper is not None:
+            values = obj.__dict__
+            return self._trusted_mapper.build({field_name: values[field_name] for field_name in self._fields_names})
+
+        return self._target_type.model_validate(obj)
+
+    def map_many(self, objs: Iterable[Any]) -> List[Any]:
+        """
+        Преобразование списка DTO исходной схемы в список DTO целевой схемы.
+        Маппер выбирается по классу первого DTO. Если схемы совпадают, переданный список возвращается без копирования.
+
+        :param objs: Исходные DTO.
+        :return: Список DTO целевой схемы.
+        """
+        if not isinstance(objs, list):
+            objs = list(objs)
+        if not objs:
+            return objs
+
+        mapper = self
+        if type(objs[0]) is not self._source_type:
+            mapper = self.get(source_type=type(objs[0]), target_type=self._target_type)
+
+        if mapper.mode == self.PASS_THROUGH and all(type(obj) is mapper.source_type for obj in objs):
+            return objs
+
+        return [mapper.map(obj) for obj in objs]
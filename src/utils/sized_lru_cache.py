@@ -0,0 +1,98 @@
+from collections import OrderedDict
+from time import monotonic
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+
+class SizedLruCache:
+    """
+    Кеш байтовых значений в памяти процесса с ограничением по суммарному размеру.
+    У каждой записи свое время жизни. При переполнении вытесняются записи, к которым дольше всего не обращались.
+    """
+
+    def __init__(self, max_bytes: int):
+        """
+        :param max_bytes: Максимальный суммарный размер значений в байтах.
+        """
+        self._max_bytes = max_bytes
+        self._size = 0
+        self._data: OrderedDict[str, Tuple[float, bytes]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def get_with_ttl(self, key: str) -> Tuple[float, Optional[bytes]]:
+        """
+        Получение значения и оставшегося времени жизни по ключу. Просроченная запись удаляется.
+
+        :param key: Ключ.
+        :return: Оставшееся время жизни в секундах и значение, или (0, None).
+        """
+        item = self._data.get(key)
+        if item is None:
+            return 0, None
+
+        ttl = item[0] - monotonic()
+        if ttl <= 0:
+            self.delete(key)
+            return 0, None
+
+        self._data.move_to_end(key)
+        return ttl, item[1]
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        """
+        Сохранение значения по ключу. Значения больше допустимого размера кеша не сохраняются.
+
+        :param key: Ключ.
+        :param value: Значение.
+        :param ttl: Время жизни записи в секундах.
+        :return: None.
+        """
+        self.delete(key)
+        if ttl <= 0 or len(value) > self._max_bytes:
+            return
+
+        self._data[key] = (monotonic() + ttl, value)
+        self._size += len(value)
+        while self._size > self._max_bytes:
+            _, (_, evicted_value) = self._data.popitem(last=False)
+            self._size -= len(evicted_value)
+
+    def delete(self, key: str) -> None:
+        """
+        Удаление записи по ключу.
+
+        :param key: Ключ.
+        :return: None.
+        """
+        item = self._data.pop(key, None)
+        if item is not None:
+            self._size -= len(item[1])
+
+    def delete_by_prefix(self, prefix: Union[str, Tuple[str, ...]]) -> int:
+        """
+        Удаление всех записей, ключи которых начинаются с префикса. Несколько префиксов проверяются за один проход.
+
+        :param prefix: Префикс ключей или кортеж префиксов.
+        :return: Кол-во удаленных записей.
+        """
+        keys = [key for key in self._data if key.startswith(prefix)]
+        for key in keys:
+            self.delete(key)
+
+        return len(keys)
+
+    def clear(self) -> None:
+        """
+        Удаление всех записей.
+
+        :return: None.
+        """
+        self._data.clear()
+        self._size = 0
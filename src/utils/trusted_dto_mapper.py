@@ -0,0 +1,161 @@
+from types import NoneType
+from typing import Any
+from typing import Dict
+from typing import Generic
+from typing import Iterable
+from typing import List
+from typing import Mapping
+from typing import Optional
+from typing import Tuple
+from typing import Type
+from typing import TypeVar
+from typing import Union
+from typing import get_args
+from typing import get_origin
+
+from pydantic import BaseModel
+
+DtoType = TypeVar('DtoType', bound=BaseModel)
+
+
+class TrustedDtoMapper(Generic[DtoType]):
+    """
+    Сборка DTO из объектов ORM и строк БД без валидации Pydantic.
+    Данные из своей БД уже прошли валидацию при записи, поэтому при чтении повторные проверки, нормализация
+    валидаторами mode='before' и поиск по псевдонимам не нужны: DTO собирается так же, как в model_construct,
+    но без его обхода полей с поиском значений по псевдонимам и значений по умолчанию.
+    Список полей и мапперы вложенных DTO вычисляются один раз на тип DTO.
+    Для данных извне (запросы клиентов) по-прежнему используется model_validate.
+    """
+
+    _mappers: Dict[type, 'TrustedDtoMapper[Any]'] = dict()
+
+    def __init__(self, dto_type: Type[DtoType]):
+        """
+        :param dto_type: Класс DTO.
+        """
+        self._dto_type = dto_type
+        # поле, маппер вложенного DTO (None для простых значений), признак списка вложенных DTO
+        self._fields: List[Tuple[str, Optional[TrustedDtoMapper[Any]], bool]] = list()
+        self._fields_set = frozenset(dto_type.model_fields)
+        # model_post_init есть только у DTO с приватными атрибутами или своей пост-инициализацией
+        self._has_post_init = dto_type.__pydantic_post_init__ is not None
+
+    @classmethod
+    def get(cls, dto_type: Type[DtoType]) -> 'TrustedDtoMapper[DtoType]':
+        """
+        Получение маппера для класса DTO. Маппер регистрируется до разбора полей, чтобы поддержать
+        ссылающиеся друг на друга DTO.
+
+        :param dto_type: Класс DTO.
+        :return: Маппер.
+        """
+        mapper = cls._mappers.get(dto_type)
+        if mapper is None:
+            mapper = cls._mappers[dto_type] = cls(dto_type=dto_type)
+            mapper.compile()
+
+        return mapper
+
+    @staticmethod
+    def unwrap_annotation(annotation: Any) -> Tuple[Any, bool]:
+        """
+        Снятие Optional и определение, является ли поле списком.
+
+        :param annotation: Аннотация поля.
+        :return: Тип значения (элемента списка) и признак списка.
+        """
+        if get_origin(annotation) is Union:
+            args = [arg for arg in get_args(annotation) if arg is not NoneType]
+            if len(args) == 1:
+                annotation = args[0]
+
+        if get_origin(annotation) in (list, List):
+            return get_args(annotation)[0], True
+
+        return annotation, False
+
+    def compile(self) -> None:
+        """
+        Разбор полей DTO.
+
+        :return: None.
+        """
+        for field_name, field_info in self._dto_type.model_fields.items():
+            value_type, is_list = self.unwrap_annotation(field_info.annotation)
+            nested_mapper: Optional[TrustedDtoMapper[Any]] = None
+            if isinstance(value_type, type) and issubclass(value_type, BaseModel):
+                nested_mapper = TrustedDtoMapper.get(value_type)
+            self._fields.append((field_name, nested_mapper, is_list))
+
+    def build(self, values: Dict[str, Any]) -> DtoType:
+        """
+        Создание DTO из значений полей, вложенные значения преобразуются мапперами вложенных DTO.
+
+        :param values: Значения полей.
+        :return: DTO.
+        """
+        for field_name, nested_mapper, is_list in self._fields:
+            if nested_mapper is None:
+                continue
+            value = values[field_name]
+            if value is None:
+                continue
+            if is_list:
+                values[field_name] = [nested_mapper.map(item) for item in value]
+            else:
+                values[field_name] = nested_mapper.map(value)
+
+        if self._has_post_init:
+            return self._dto_type.model_construct(_fields_set=set(self._fields_set), **values)
+
+        dto = self._dto_type.__new__(self._dto_type)
+        object.__setattr__(dto, '__dict__', values)
+        object.__setattr__(dto, '__pydantic_fields_set__', set(self._fields_set))
+        object.__setattr__(dto, '__pydantic_extra__', None)
+        object.__setattr__(dto, '__pydantic_private__', None)
+
+        return dto
+
+    def map(self, obj: Any) -> DtoType:
+        """
+        Преобразование объекта ORM (или уже готового DTO) в DTO.
+
+        :param obj: Объект ORM.
+        :return: DTO.
+        """
+        if isinstance(obj, self._dto_type):
+            return obj
+
+        return self.build({field_name: getattr(obj, field_name) for field_name, _, _ in self._fields})
+
+    def map_mapping(self, row: Mapping[str, Any]) -> DtoType:
+        """
+        Преобразование строки результата запроса (словаря колонок) в DTO.
+        Поля, которых нет среди колонок строки (например, списки связанных объектов), получают значения по умолчанию.
+
+        :param row: Строка результата запроса.
+        :return: DTO.
+        """
+        return self.build({
+            field_name: row[field_name] if field_name in row else self.get_default(field_name)
+            for field_name, _, _ in self._fields
+        })
+
+    def get_default(self, field_name: str) -> Any:
+        """
+        Значение поля DTO по умолчанию.
+
+        :param field_name: Название поля.
+        :return: Значение по умолчанию.
+        """
+        return self._dto_type.model_fields[field_name].get_default(call_default_factory=True)
+
+    def map_many(self, objs: Iterable[Any]) -> List[DtoType]:
+        """
+        Преобразование списка объектов ORM в список DTO.
+
+        :param objs: Объекты ORM.
+        :return: Список DTO.
+        """
+        return [self.map(obj) for obj in objs]
@@ -0,0 +1,78 @@
+from collections import OrderedDict
+from time import monotonic
+from typing import Generic
+from typing import Hashable
+from typing import Optional
+from typing import Tuple
+from typing import TypeVar
+
+KeyType = TypeVar('KeyType', bound=Hashable)
+ValueType = TypeVar('ValueType')
+
+
+class TtlLruCache(Generic[KeyType, ValueType]):
+    """
+    Кеш в памяти процесса с ограничением по времени жизни записи и по кол-ву записей.
+    При переполнении вытесняется запись, к которой дольше всего не обращались.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        """
+        :param max_size: Максимальное кол-во записей.
+        :param ttl: Время жизни записи в секундах.
+        """
+        self._max_size = max_size
+        self._ttl = ttl
+        self._data: OrderedDict[KeyType, Tuple[float, ValueType]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: KeyType) -> Optional[ValueType]:
+        """
+        Получение значения по ключу. Просроченная запись удаляется.
+
+        :param key: Ключ.
+        :return: Значение или None.
+        """
+        item = self._data.get(key)
+        if item is None:
+            return None
+
+        expires_at, value = item
+        if expires_at < monotonic():
+            del self._data[key]
+            return None
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: KeyType, value: ValueType) -> None:
+        """
+        Сохранение значения по ключу.
+
+        :param key: Ключ.
+        :param value: Значение.
+        :return: None.
+        """
+        self._data[key] = (monotonic() + self._ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self._max_size:
+            self._data.popitem(last=False)
+
+    def delete(self, key: KeyType) -> None:
+        """
+        Удаление записи по ключу.
+
+        :param key: Ключ.
+        :return: None.
+        """
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        Удаление всех записей.
+
+        :return: None.
+        """
+        self._data.clear()
@@ -0,0 +1,194 @@
+"""
+Проверка планов запросов по задолженности и выборок по внешним ключам на PostgreSQL.
+
+Тесты запускаются, если в переменной окружения TEST_SQL_DSN задана строка подключения (postgresql+asyncpg://...)
+к БД с примененными миграциями (alembic upgrade head), и пропускаются иначе. SQL_SCHEMA должна указывать на схему
+миграций. Данные создаются внутри транзакции, которая откатывается в конце теста.
+
+Выражения, которые выполняют репозитории, перехватываются и повторно выполняются через EXPLAIN с
+enable_seqscan = off: так план не зависит от объема данных в БД, и Seq Scan в нем остается, только если подходящего
+индекса нет.
+"""
+import asyncio
+import json
+import os
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Set
+from typing import Tuple
+
+import pytest
+
+TEST_SQL_DSN = os.environ.get('TEST_SQL_DSN', '')
+if not TEST_SQL_DSN:
+    pytest.skip('TEST_SQL_DSN не задан', allow_module_level=True)
+
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy import text  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession  # noqa: E402
+from sqlalchemy.ext.asyncio import create_async_engine  # noqa: E402
+
+from src.models import Apartment  # noqa: E402
+from src.models import ApartmentInfo  # noqa: E402
+from src.models import Bill  # noqa: E402
+from src.models import Building  # noqa: E402
+from src.models import Owner  # noqa: E402
+from src.repositories import ApartmentRepository  # noqa: E402
+from src.repositories import BuildingRepository  # noqa: E402
+from src.repositories import OwnerRepository  # noqa: E402
+from src.repositories.debt_summary_repository import DebtSummaryRepository  # noqa: E402
+
+BILL_UNPAID_INDEX = 'ix_payment_management_bill_unpaid_id_apartment'
+APARTMENT_BUILDING_NUMBER_INDEX = 'ix_payment_management_apartment_id_building_apartment_number'
+APARTMENT_OWNER_INDEX = 'ix_payment_management_apartment_id_owner'
+APARTMENT_INFO_INDEX = 'ix_payment_management_apartment_info_id_apartment'
+BUILDING_PROJECT_NAME_INDEX = 'ix_payment_management_building_project_name'
+
+PROJECT_NAME = 'test_debt_query_plans'
+
+Scenario = Callable[[AsyncSession, Dict[str, int]], Awaitable[Any]]
+
+
+class QueryPlans:
+    """
+    Узлы планов всех выражений сценария: индексы и таблицы, которые читаются последовательно.
+    """
+
+    def __init__(self) -> None:
+        self.indexes: Set[str] = set()
+        self.seq_scan_tables: Set[str] = set()
+
+    def add_plan_node(self, node: Dict[str, Any]) -> None:
+        if 'Index Name' in node:
+            self.indexes.add(node['Index Name'])
+        if node['Node Type'] == 'Seq Scan':
+            self.seq_scan_tables.add(node['Relation Name'])
+        for child_node in node.get('Plans', []):
+            self.add_plan_node(child_node)
+
+
+async def seed(session: AsyncSession) -> Dict[str, int]:
+    """
+    Создание квартиры-должника с владельцем, домом, доп. информацией и сводкой задолженности.
+
+    :param session: Сессия в откатываемой транзакции.
+    :return: ID созданных объектов.
+    """
+    owner = Owner(fullname='Иванов Иван', passport_series='0000', passport_values='000000', phone='70000000000')
+    building = Building(address=PROJECT_NAME, floors_number=1, lift_number=0, project_name=PROJECT_NAME)
+    session.add_all([owner, building])
+    await session.flush()
+
+    apartment = Apartment(
+        id_building=building.id, id_owner=owner.id, utility_account=PROJECT_NAME, apartment_number=1, floor=1
+    )
+    session.add(apartment)
+    await session.flush()
+
+    session.add_all([
+        ApartmentInfo(id_apartment=apartment.id, room_number=1, common_square=30.0),
+        Bill(id_apartment=apartment.id, bill_period='2024-01', bill_size=100.0, is_paid=False),
+    ])
+    await session.flush()
+    await DebtSummaryRepository(async_db_session=session).refresh(apartments_ids=[apartment.id])
+
+    return dict(owner=owner.id, building=building.id, apartment=apartment.id)
+
+
+async def explain_scenario(scenario: Scenario) -> QueryPlans:
+    """
+    Выполнение сценария и EXPLAIN всех выполненных им выражений.
+
+    :param scenario: Асинхронная функция от сессии и ID созданных объектов.
+    :return: Узлы планов.
+    """
+    engine = create_async_engine(TEST_SQL_DSN)
+    executed_statements: List[Tuple[str, Any]] = list()
+
+    def before_cursor_execute(*args: Any) -> None:
+        _, _, statement, parameters, _, _ = args
+        executed_statements.append((statement, parameters))
+
+    query_plans = QueryPlans()
+    try:
+        async with engine.connect() as connection:
+            transaction = await connection.begin()
+            await connection.execute(text('SET LOCAL enable_seqscan = off'))
+            session = AsyncSession(bind=connection, join_transaction_mode='create_savepoint')
+            objects_ids = await seed(session)
+
+            event.listen(engine.sync_engine, 'before_cursor_execute', before_cursor_execute)
+            try:
+                await scenario(session, objects_ids)
+            finally:
+                event.remove(engine.sync_engine, 'before_cursor_execute', before_cursor_execute)
+
+            for statement, parameters in executed_statements:
+                result = await connection.exec_driver_sql(f'EXPLAIN (FORMAT JSON) {statement}', parameters)
+                plan = result.scalar_one()
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                query_plans.add_plan_node(plan[0]['Plan'])
+
+            await session.close()
+            await transaction.rollback()
+    finally:
+        await engine.dispose()
+
+    assert executed_statements, 'Сценарий не выполнил ни одного запроса'
+
+    return query_plans
+
+
+def test_debtor_by_apartment_number_uses_indexes() -> None:
+    async def scenario(session: AsyncSession, objects_ids: Dict[str, int]) -> None:
+        dto = await ApartmentRepository(async_db_session=session).get_apartments_full_data_with_debt_by_apart_id(
+            apartment_number=1,
+            building_id=objects_ids['building']
+        )
+        assert dto is not None
+
+    query_plans = asyncio.run(explain_scenario(scenario))
+
+    assert {APARTMENT_BUILDING_NUMBER_INDEX, BILL_UNPAID_INDEX, APARTMENT_INFO_INDEX} <= query_plans.indexes
+    assert 'bill' not in query_plans.seq_scan_tables
+
+
+def test_debtors_by_project_name_use_indexes() -> None:
+    async def scenario(session: AsyncSession, objects_ids: Dict[str, int]) -> None:
+        dtos = await ApartmentRepository(async_db_session=session).get_apartments_full_data_with_debt_by_project_name(
+            building_project_name=PROJECT_NAME
+        )
+        assert len(dtos) == 1
+
+    query_plans = asyncio.run(explain_scenario(scenario))
+
+    assert {BUILDING_PROJECT_NAME_INDEX, BILL_UNPAID_INDEX, APARTMENT_INFO_INDEX} <= query_plans.indexes
+    assert 'bill' not in query_plans.seq_scan_tables
+
+
+def test_debt_summary_refresh_uses_indexes() -> None:
+    async def scenario(session: AsyncSession, objects_ids: Dict[str, int]) -> None:
+        await DebtSummaryRepository(async_db_session=session).refresh(apartments_ids=[objects_ids['apartment']])
+
+    query_plans = asyncio.run(explain_scenario(scenario))
+
+    assert BILL_UNPAID_INDEX in query_plans.indexes
+    assert 'bill' not in query_plans.seq_scan_tables
+
+
+def test_foreign_key_lookups_use_indexes() -> None:
+    async def scenario(session: AsyncSession, objects_ids: Dict[str, int]) -> None:
+        owners = await OwnerRepository(async_db_session=session).load_many(objects_ids=[objects_ids['owner']])
+        buildings = await BuildingRepository(async_db_session=session).load_many(
+            objects_ids=[objects_ids['building']]
+        )
+        assert owners[0] is not None and buildings[0] is not None
+
+    query_plans = asyncio.run(explain_scenario(scenario))
+
+    assert {APARTMENT_OWNER_INDEX, APARTMENT_BUILDING_NUMBER_INDEX, APARTMENT_INFO_INDEX} <= query_plans.indexes
+    assert not query_plans.seq_scan_tables